@@ -0,0 +1,169 @@
+"""
+Adaptive ("quickening") evaluation of binary operations.
+Every BinOp evaluated by the AdaptiveEvaluator gets a BinOpSite that records the
+operand types it sees. After WARMUP evaluations with the same pair of types among
+int, float and str, the site is specialised: it holds the one Python function that
+computes its operator for those types (e.g. int + int), and later evaluations only
+check that the operand types still match before calling it.
+
+When a guard fails the site is de-optimised back to the generic path and starts
+warming up again. A site that de-optimises MAX_DEOPTS times stays generic.
+Literal and variable operands are read directly rather than through `eval`.
+"""
+
+import operator
+
+from Interpreter.ast_nodes import Number, Variable, BinOp, walk
+from Interpreter.evaluator import Evaluator, add, divide
+from Interpreter.profiler import ProfilingEvaluator
+
+WARMUP = 8
+MAX_DEOPTS = 4
+
+# Site states
+WARMING = 0
+SPECIALISED = 1
+GENERIC = 2
+
+
+# The generic path: the same results (and errors) as Evaluator.eval_BinOp, for any types.
+OPERATIONS = {
+    "+": add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": divide,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# Maps (operator, left type, right type) -> the specialised operation: every operator
+# on int and float operands, and concatenation and comparisons on strings.
+SPECIALISATIONS = {}
+for _left in (int, float):
+    for _right in (int, float):
+        for _op, _operation in OPERATIONS.items():
+            SPECIALISATIONS[(_op, _left, _right)] = _operation
+        SPECIALISATIONS[("+", _left, _right)] = operator.add  # Numbers need no string check.
+for _op in ("+", "==", "!=", ">", "<", ">=", "<="):
+    SPECIALISATIONS[(_op, str, str)] = OPERATIONS[_op]
+
+
+class BinOpSite:
+    """Type feedback and the specialised operation of one BinOp node."""
+
+    __slots__ = (
+        "state",
+        "left_type",
+        "right_type",
+        "operation",
+        "streak",
+        "hits",
+        "misses",
+        "deopts",
+    )
+
+    def __init__(self):
+        """Create a site that has not seen any operands yet."""
+        self.state = WARMING
+        self.left_type = None
+        self.right_type = None
+        self.operation = None
+        self.streak = 0  # Consecutive evaluations with the same operand types.
+        self.hits = 0  # Evaluations on the specialised path.
+        self.misses = 0  # Evaluations on the generic path.
+        self.deopts = 0
+
+    def __repr__(self):
+        """Represent the site in a readable format."""
+        state = ("warming", "specialised", "generic")[self.state]
+        types = f"{getattr(self.left_type, '__name__', None)}, {getattr(self.right_type, '__name__', None)}"
+        return f"BinOpSite({state}, ({types}), hits={self.hits}, misses={self.misses}, deopts={self.deopts})"
+
+    def observe(self, op: str, left_type: type, right_type: type):
+        """Record the operand types of a generic evaluation and specialise when they are stable."""
+        self.misses += 1
+        if self.state == GENERIC:
+            return
+        if left_type is self.left_type and right_type is self.right_type:
+            self.streak += 1
+        else:
+            self.left_type, self.right_type, self.streak = left_type, right_type, 1
+        if self.streak >= WARMUP:
+            operation = SPECIALISATIONS.get((op, left_type, right_type))
+            if operation is None:
+                self.state = GENERIC  # e.g. bool operands or an unsupported operator.
+            else:
+                self.operation = operation
+                self.state = SPECIALISED
+
+    def deoptimise(self):
+        """Drop the specialisation after its guard failed."""
+        self.deopts += 1
+        self.operation = None
+        self.streak = 0
+        self.state = GENERIC if self.deopts >= MAX_DEOPTS else WARMING
+
+
+class AdaptiveEvaluator(Evaluator):
+    """Tree-walking evaluator whose BinOp nodes specialise on the operand types they see."""
+
+    def eval_operand(self, node):
+        """Evaluate an operand, reading literals and variables without the generic dispatch."""
+        node_type = type(node)
+        if node_type is Number:
+            return node.value
+        if node_type is Variable:
+            return self.eval_Variable(node)
+        return self.eval(node)
+
+    def eval_BinOp(self, node: BinOp):
+        """Evaluate a BinOp node through its specialised operation when the guard holds."""
+        site = node.site
+        if site is None:
+            site = node.site = BinOpSite()
+        left_val = self.eval_operand(node.left)
+        right_val = self.eval_operand(node.right)
+        if site.state == SPECIALISED:
+            if type(left_val) is site.left_type and type(right_val) is site.right_type:
+                site.hits += 1
+                return site.operation(left_val, right_val)
+            site.deoptimise()
+        return self.generic_binop(node, site, left_val, right_val)
+
+    def generic_binop(self, node: BinOp, site: BinOpSite, left_val, right_val):
+        """Compute a BinOp on the generic path and feed its operand types to the site."""
+        site.observe(node.op, type(left_val), type(right_val))
+        operation = OPERATIONS.get(node.op)
+        if operation is None:
+            raise ValueError(f"Unknown operator '{node.op}'")
+        return operation(left_val, right_val)
+
+
+class ProfilingAdaptiveEvaluator(ProfilingEvaluator, AdaptiveEvaluator):
+    """Adaptive evaluator that also records calls and statement counts in a Profiler."""
+
+
+def specialisation_stats(nodes) -> dict:
+    """Summarise the BinOp sites below `nodes`."""
+    sites = specialised = hits = misses = deopts = 0
+    for node in walk(nodes):
+        if isinstance(node, BinOp) and node.site is not None:
+            site = node.site
+            sites += 1
+            specialised += site.state == SPECIALISED
+            hits += site.hits
+            misses += site.misses
+            deopts += site.deopts
+    evaluations = hits + misses
+    return {
+        "sites": sites,
+        "specialised_sites": specialised,
+        "specialised_evaluations": hits,
+        "generic_evaluations": misses,
+        "deopts": deopts,
+        "specialisation_rate": hits / evaluations if evaluations else 0.0,
+    }
@@ -0,0 +1,214 @@
+"""
+Numeric arrays for GB.
+`@[1, 2, 3]` evaluates to a GBArray: a sequence of numbers stored in a stdlib
+`array`, as 64-bit integers when every element is an int and as doubles otherwise.
+
+Binary operators work element-wise, between two arrays of the same length or
+between an array and a number:
+
+    +  -  *        int arrays stay int arrays; any float makes a float array
+    /              always a float array; a zero divisor raises "Division by zero"
+    == != > < >= <=   an int array of 1s and 0s
+
+Each operation runs as one `map` over the `operator` function and one array
+construction, both in C, so no GB or Python-level loop runs per element. An array
+has no truth value (`if (a == b)` is an error); `sum`, `min` and `max` reduce it.
+The builtins in ARRAY_FUNCTIONS are registered as native functions by the REPL.
+"""
+
+import operator
+from array import array
+from itertools import repeat
+
+NUMBER_TYPES = (int, float, bool)
+ARITHMETIC = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def _typecode(value) -> str:
+    """Return the array typecode a number is stored with."""
+    return "d" if type(value) is float else "q"
+
+
+def _build(typecode: str, values) -> "GBArray":
+    """Build a GBArray, reporting integers that do not fit in 64 bits in GB terms."""
+    try:
+        return GBArray(array(typecode, values))
+    except OverflowError:
+        raise OverflowError("Array element out of range") from None
+
+
+def _operator_method(op: str, reflected: bool = False):
+    """Build the special method that applies a GB operator element-wise."""
+
+    def method(self, other):
+        return self.elementwise(op, other, reflected)
+
+    method.__doc__ = f"Apply `{op}` element-wise{' (array on the right)' if reflected else ''}."
+    return method
+
+
+class GBArray:
+    """A GB array value: a typed sequence of numbers."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: array):
+        """Wrap an `array` with typecode "q" (integers) or "d" (floats)."""
+        self.data = data
+
+    @classmethod
+    def from_values(cls, values) -> "GBArray":
+        """Build an array from GB values, which must all be numbers."""
+        values = list(values)
+        typecode = "q"
+        for value in values:
+            if type(value) not in NUMBER_TYPES:
+                raise TypeError("Array elements must be numbers")
+            if type(value) is float:
+                typecode = "d"
+        return _build(typecode, values)
+
+    def __len__(self):
+        """Return the number of elements."""
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """Return one element; GB indexes must be integers within the array."""
+        if type(index) is not int:
+            raise TypeError("Array indices must be integers")
+        try:
+            return self.data[index]
+        except IndexError:
+            raise IndexError("Array index out of range") from None
+
+    def __setitem__(self, index, value):
+        """Set one element; storing a float in an integer array makes it a float array."""
+        if type(index) is not int:
+            raise TypeError("Array indices must be integers")
+        if type(value) not in NUMBER_TYPES:
+            raise TypeError("Array elements must be numbers")
+        if type(value) is float and self.data.typecode == "q":
+            self.data = array("d", self.data)
+        try:
+            self.data[index] = value
+        except IndexError:
+            raise IndexError("Array index out of range") from None
+        except OverflowError:
+            raise OverflowError("Array element out of range") from None
+
+    def tolist(self) -> list:
+        """Return the elements as a Python list."""
+        return self.data.tolist()
+
+    def __repr__(self):
+        """Represent the array as a GB array literal."""
+        return "@[" + ", ".join(map(repr, self.data)) + "]"
+
+    def __bool__(self):
+        """Arrays have no truth value: reduce them with sum(), min() or max() first."""
+        raise TypeError("The truth value of an array is ambiguous; use sum(), min() or max()")
+
+    # ----- Element-wise operators -----
+
+    def elementwise(self, op: str, other, reflected: bool = False):
+        """
+        Apply a GB operator between this array and `other` (an array of the same
+        length, or a number). When `reflected`, `other` is the left operand.
+        """
+        if type(other) is GBArray:
+            if len(other.data) != len(self.data):
+                raise ValueError(f"Array lengths differ ({len(self.data)} and {len(other.data)})")
+            other_values, other_typecode = other.data, other.data.typecode
+        elif type(other) in NUMBER_TYPES:
+            other_values, other_typecode = repeat(other, len(self.data)), _typecode(other)
+        else:
+            return NotImplemented
+        left, right = (other_values, self.data) if reflected else (self.data, other_values)
+
+        if op == "/":
+            divisor = self if reflected else other
+            if (0 in divisor.data) if type(divisor) is GBArray else divisor == 0:
+                raise ZeroDivisionError("Division by zero")
+            return _build("d", map(operator.truediv, left, right))
+        if op in COMPARISONS:
+            return _build("q", map(COMPARISONS[op], left, right))
+        typecode = "q" if self.data.typecode == other_typecode == "q" else "d"
+        return _build(typecode, map(ARITHMETIC[op], left, right))
+
+    __add__ = _operator_method("+")
+    __radd__ = _operator_method("+", reflected=True)
+    __sub__ = _operator_method("-")
+    __rsub__ = _operator_method("-", reflected=True)
+    __mul__ = _operator_method("*")
+    __rmul__ = _operator_method("*", reflected=True)
+    __truediv__ = _operator_method("/")
+    __rtruediv__ = _operator_method("/", reflected=True)
+    # Python reflects comparisons itself: `1 < a` calls `a > 1`.
+    __eq__ = _operator_method("==")
+    __ne__ = _operator_method("!=")
+    __gt__ = _operator_method(">")
+    __lt__ = _operator_method("<")
+    __ge__ = _operator_method(">=")
+    __le__ = _operator_method("<=")
+    __hash__ = None
+
+
+# ----- Builtins -----
+
+
+def _require_array(name: str, value) -> GBArray:
+    """Check that a builtin was given an array."""
+    if type(value) is not GBArray:
+        raise TypeError(f"{name}() expects an array")
+    return value
+
+
+def native_sum(values):
+    """Return the sum of an array's elements."""
+    return sum(_require_array("sum", values).data)
+
+
+def native_min(values):
+    """Return the smallest element of an array."""
+    data = _require_array("min", values).data
+    if not data:
+        raise ValueError("min() of an empty array")
+    return min(data)
+
+
+def native_max(values):
+    """Return the largest element of an array."""
+    data = _require_array("max", values).data
+    if not data:
+        raise ValueError("max() of an empty array")
+    return max(data)
+
+
+def native_range_array(start, end, step=1):
+    """Return the integer array start, start + step, ... up to but excluding end."""
+    if not (type(start) is int and type(end) is int and type(step) is int):
+        raise TypeError("range_array() bounds must be integers")
+    if step == 0:
+        raise ValueError("range_array() step cannot be zero")
+    return _build("q", range(start, end, step))
+
+
+# Builtins registered in the global environment, by GB name.
+ARRAY_FUNCTIONS = {
+    "sum": native_sum,
+    "min": native_min,
+    "max": native_max,
+    "range_array": native_range_array,
+}
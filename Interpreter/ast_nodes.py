@@ -1,12 +1,17 @@
 """
 Gives the structure of the Abstract Syntax Tree (AST) nodes used in the interpreter.
 This module defines the classes representing different types of nodes in the AST.
+Every node class declares `__slots__`, so nodes carry no per-instance `__dict__`.
 """
 
+import sys
+
 
 class Number:
     """AST node representing a numeric literal"""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         """Store the numeric value in the node."""
         self.value = value
@@ -21,6 +26,8 @@ class Number:
 class String:
     """AST node representing a string literal"""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str):
         """Store the string value in the node."""
         self.value = value
@@ -33,9 +40,13 @@ class String:
 class Variable:
     """AST node representing a variable identifier"""
 
+    __slots__ = ("name", "address", "cache")
+
     def __init__(self, name: str):
         """Store the identifier value in the node."""
         self.name = name  # Store the variable name in the node
+        self.address = None  # Local slot, set by the resolver (see resolver.py)
+        self.cache = None  # Inline cache, set by the evaluator (see inline_cache.py)
 
     # Custom equality method. Without this, Python would only compare memory addresses,
     # causing tests like `Variable('x') == Variable('x')` to fail.
@@ -47,9 +58,12 @@ class Variable:
 class BinOp:
     """AST node representing a binary operation (e.g +, -, *, /, ==, <, >)"""
 
+    __slots__ = ("left", "op", "right", "site")
+
     def __init__(self, left, op: str, right):
         """Store the left operand, operator and right operand in the node."""
         self.left, self.op, self.right = left, op, right
+        self.site = None  # Type feedback, set by the adaptive evaluator (see adaptive.py)
 
     # Custom equality method for tests. It checks the operator and then
     # recursively calls the __eq__ method on the left and right nodes.
@@ -64,15 +78,97 @@ class BinOp:
         )
 
 
+class ArrayLiteral:
+    """AST node representing a numeric array literal, e.g. @[1, 2, 3]"""
+
+    __slots__ = ("elements",)
+
+    def __init__(self, elements: list):
+        """Store the element expressions in the node."""
+        self.elements = elements
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return isinstance(other, ArrayLiteral) and self.elements == other.elements
+
+
+class Index:
+    """AST node representing an indexing expression, e.g. values[i]"""
+
+    __slots__ = ("target", "index")
+
+    def __init__(self, target, index):
+        """Store the indexed expression and the index expression in the node."""
+        self.target = target
+        self.index = index
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return isinstance(other, Index) and self.target == other.target and self.index == other.index
+
+
+class ListLiteral:
+    """AST node representing a list literal, e.g. [1, "two", x]"""
+
+    __slots__ = ("elements",)
+
+    def __init__(self, elements: list):
+        """Store the element expressions in the node."""
+        self.elements = elements
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return isinstance(other, ListLiteral) and self.elements == other.elements
+
+
+class DictLiteral:
+    """AST node representing a dictionary literal, e.g. {"a": 1, "b": 2}"""
+
+    __slots__ = ("keys", "values")
+
+    def __init__(self, keys: list, values: list):
+        """Store the key expressions and the matching value expressions in the node."""
+        self.keys = keys
+        self.values = values
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return isinstance(other, DictLiteral) and self.keys == other.keys and self.values == other.values
+
+
+class IndexAssign:
+    """AST node representing an assignment to an element, e.g. values[i] = x;"""
+
+    __slots__ = ("target", "index", "value")
+
+    def __init__(self, target, index, value):
+        """Store the container expression, the index expression and the value in the node."""
+        self.target = target
+        self.index = index
+        self.value = value
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return (
+            isinstance(other, IndexAssign)
+            and self.target == other.target
+            and self.index == other.index
+            and self.value == other.value
+        )
+
+
 class Assign:
     """AST node representing an assignment operation"""
 
+    __slots__ = ("name", "value", "address")
+
     def __init__(
         self, name: Variable, value: Number | BinOp
     ):  # 'name' is the variable node, 'value' is the subtree for the value
         """Store the variable name and value in the node."""
         self.name = name
         self.value = value
+        self.address = None
 
     def __eq__(self, other):
         """Equality check for testing"""
@@ -86,11 +182,14 @@ class Assign:
 class IfStmt:
     """Represents an if statement."""
 
-    def __init__(self, condition, then_block, else_block=None):
-        """Store the if-statement condition, then and else block in the node."""
+    __slots__ = ("condition", "then_block", "else_block", "line")
+
+    def __init__(self, condition, then_block, else_block=None, line: int = 0):
+        """Store the if-statement condition, then and else block and source line in the node."""
         self.condition = condition
         self.then_block = then_block
         self.else_block = else_block
+        self.line = line
 
     def __eq__(self, other):
         """Equality check for testing"""
@@ -105,10 +204,13 @@ class IfStmt:
 class WhileStmt:
     """Represents a while loop statement"""
 
-    def __init__(self, condition, body):
-        """Store the loop condition and body in the node."""
+    __slots__ = ("condition", "body", "line")
+
+    def __init__(self, condition, body, line: int = 0):
+        """Store the loop condition, body and source line in the node."""
         self.condition = condition
         self.body = body
+        self.line = line
 
     def __eq__(self, other):
         """Equality check for testing"""
@@ -119,14 +221,50 @@ class WhileStmt:
         )
 
 
+class ForStmt:
+    """
+    Represents a counted loop: `for (var in start, end[, step]) { body }`.
+    The variable takes the values of range(start, end, step), so `end` is excluded.
+    """
+
+    __slots__ = ("var", "start", "end", "step", "body", "line")
+
+    def __init__(self, var: Variable, start, end, body, step=None, line: int = 0):
+        """Store the loop variable, the bounds, the optional step, the body and the source line in the node."""
+        self.var = var
+        self.start = start
+        self.end = end
+        self.step = step
+        self.body = body
+        self.line = line
+
+    def __eq__(self, other):
+        """Equality check for testing"""
+        return (
+            isinstance(other, ForStmt)
+            and self.var == other.var
+            and self.start == other.start
+            and self.end == other.end
+            and self.step == other.step
+            and self.body == other.body
+        )
+
+
 class FunctionDef:
     """Represents a function definition in the AST"""
 
-    def __init__(self, name, params, body):
-        """Storoe the function name, params, body in the node."""
+    __slots__ = ("name", "params", "body", "line", "closure", "bytecode", "python_function", "layout")
+
+    def __init__(self, name, params, body, line: int = 0):
+        """Storoe the function name, params, body and source line in the node."""
         self.name = name
         self.params = params
         self.body = body
+        self.line = line
+        self.closure = None  # Compiled body, set by the closure compiler (see closure_compiler.py)
+        self.bytecode = None  # CodeObject, set by the virtual machine (see vm.py)
+        self.python_function = None  # Transpiled body, set by the transpiler (see transpiler.py)
+        self.layout = None  # FrameLayout, set by the frame evaluator (see resolver.py)
 
     def __eq__(self, other):
         """Equality check for testing"""
@@ -141,10 +279,14 @@ class FunctionDef:
 class FunctionCall:
     """Represents a function call in the AST"""
 
+    __slots__ = ("name", "args", "address", "cache")
+
     def __init__(self, name, args):
         """Store the function name and arguments in the node."""
         self.name = name
         self.args = args
+        self.address = None
+        self.cache = None
 
     def __eq__(self, other):
         """Equality check for testing"""
@@ -153,3 +295,44 @@ class FunctionCall:
             and self.name == other.name
             and self.args == other.args
         )
+
+
+class MethodNames(dict):
+    """
+    Maps a node type to the name of the method that handles it: with the prefix
+    "eval_", Number -> "eval_Number". Each name is built once and interned. A name
+    built afresh for every lookup misses CPython's method cache, and the cache
+    keeps a reference to every such string it stores.
+    """
+
+    def __init__(self, prefix: str):
+        """Start an empty mapping for method names that begin with `prefix`."""
+        super().__init__()
+        self.prefix = prefix
+
+    def __missing__(self, node_type):
+        """Build, intern and remember the method name of a node type."""
+        name = self[node_type] = sys.intern(self.prefix + node_type.__name__)
+        return name
+
+
+# Fields that hold state attached by the backends at run time, not child nodes.
+RUNTIME_FIELDS = ("address", "cache", "site", "closure", "bytecode", "python_function", "layout")
+
+
+def walk(nodes):
+    """Yield every node below `nodes` (a node or a block), each node once."""
+    seen = set()
+    pending = [nodes]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(reversed(node))
+            continue
+        if id(node) in seen or not hasattr(type(node), "__slots__"):
+            continue
+        seen.add(id(node))
+        yield node
+        for field in reversed(type(node).__slots__):
+            if field not in RUNTIME_FIELDS:
+                pending.append(getattr(node, field))
@@ -0,0 +1,364 @@
+"""
+Compiles the Abstract Syntax Tree (AST) into a compact linear bytecode.
+A CodeObject holds a list of (opcode, argument) instructions, a constants pool and
+a names pool. Control flow (if/while) becomes jumps, calls become CALL_FUNCTION, and
+a for loop keeps a Python range iterator on the stack that FOR_ITER advances.
+"""
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    Assign,
+    IndexAssign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+    MethodNames,
+)
+
+# Define opcodes
+LOAD_CONST = 0
+LOAD_NAME = 1
+STORE_NAME = 2
+POP_TOP = 3
+BINARY_ADD = 4
+BINARY_SUB = 5
+BINARY_MUL = 6
+BINARY_DIV = 7
+COMPARE_EQ = 8
+COMPARE_NE = 9
+COMPARE_GT = 10
+COMPARE_LT = 11
+COMPARE_GE = 12
+COMPARE_LE = 13
+JUMP = 14
+JUMP_IF_FALSE = 15
+CALL_FUNCTION = 16
+DEFINE_FUNCTION = 17
+RETURN_VALUE = 18
+EVAL_NODE = 19
+GET_RANGE = 20
+FOR_ITER = 21
+STORE_LOOP_VALUE = 22
+BUILD_ARRAY = 23
+BINARY_SUBSCR = 24
+BUILD_LIST = 25
+BUILD_DICT = 26
+STORE_SUBSCR = 27
+
+OPNAMES = {
+    LOAD_CONST: "LOAD_CONST",
+    LOAD_NAME: "LOAD_NAME",
+    STORE_NAME: "STORE_NAME",
+    POP_TOP: "POP_TOP",
+    BINARY_ADD: "BINARY_ADD",
+    BINARY_SUB: "BINARY_SUB",
+    BINARY_MUL: "BINARY_MUL",
+    BINARY_DIV: "BINARY_DIV",
+    COMPARE_EQ: "COMPARE_EQ",
+    COMPARE_NE: "COMPARE_NE",
+    COMPARE_GT: "COMPARE_GT",
+    COMPARE_LT: "COMPARE_LT",
+    COMPARE_GE: "COMPARE_GE",
+    COMPARE_LE: "COMPARE_LE",
+    JUMP: "JUMP",
+    JUMP_IF_FALSE: "JUMP_IF_FALSE",
+    CALL_FUNCTION: "CALL_FUNCTION",
+    DEFINE_FUNCTION: "DEFINE_FUNCTION",
+    RETURN_VALUE: "RETURN_VALUE",
+    EVAL_NODE: "EVAL_NODE",
+    GET_RANGE: "GET_RANGE",
+    FOR_ITER: "FOR_ITER",
+    STORE_LOOP_VALUE: "STORE_LOOP_VALUE",
+    BUILD_ARRAY: "BUILD_ARRAY",
+    BINARY_SUBSCR: "BINARY_SUBSCR",
+    BUILD_LIST: "BUILD_LIST",
+    BUILD_DICT: "BUILD_DICT",
+    STORE_SUBSCR: "STORE_SUBSCR",
+}
+
+BINARY_OPCODES = {
+    "+": BINARY_ADD,
+    "-": BINARY_SUB,
+    "*": BINARY_MUL,
+    "/": BINARY_DIV,
+    "==": COMPARE_EQ,
+    "!=": COMPARE_NE,
+    ">": COMPARE_GT,
+    "<": COMPARE_LT,
+    ">=": COMPARE_GE,
+    "<=": COMPARE_LE,
+}
+
+# Opcodes whose argument indexes the constants pool or the names pool.
+# CALL_FUNCTION's constant is a (call-site name, argument count) pair.
+CONST_OPCODES = (LOAD_CONST, DEFINE_FUNCTION, EVAL_NODE, CALL_FUNCTION)
+NAME_OPCODES = (LOAD_NAME, STORE_NAME)
+JUMP_OPCODES = (JUMP, JUMP_IF_FALSE, FOR_ITER)
+
+_COMPILE_METHODS = MethodNames("compile_")
+
+
+class CodeObject:
+    """A compiled program or function body."""
+
+    def __init__(self, name: str):
+        """Initialize an empty code object."""
+        self.name = name
+        self.instructions: list[tuple[int, int]] = []
+        self.consts: list = []
+        self.names: list[str] = []
+        self._const_index: dict = {}
+        self._name_index: dict = {}
+
+    def add_const(self, value) -> int:
+        """Return the index of a constant, adding it to the pool if needed."""
+        # Literals are deduplicated; anything else (AST nodes, call sites) is not.
+        if value is not None and not isinstance(value, (int, float, str)):
+            self.consts.append(value)
+            return len(self.consts) - 1
+        key = (type(value), value)
+        if key not in self._const_index:
+            self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return self._const_index[key]
+
+    def add_name(self, name: str) -> int:
+        """Return the index of a name, adding it to the pool if needed."""
+        if name not in self._name_index:
+            self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return self._name_index[name]
+
+    def emit(self, opcode: int, arg: int = 0) -> int:
+        """Append an instruction and return its position."""
+        self.instructions.append((opcode, arg))
+        return len(self.instructions) - 1
+
+    def patch(self, position: int, target: int):
+        """Point the jump at `position` to `target`."""
+        opcode, _ = self.instructions[position]
+        self.instructions[position] = (opcode, target)
+
+    def __repr__(self):
+        """Represent the code object in a readable format."""
+        return f"<code {self.name}: {len(self.instructions)} instructions>"
+
+
+class Compiler:
+    """Compiles AST nodes into a CodeObject."""
+
+    def compile_program(self, statements: list) -> CodeObject:
+        """Compile top-level statements; the code returns the last statement value."""
+        return self._compile_code("<program>", statements)
+
+    def compile_function(self, func: FunctionDef) -> CodeObject:
+        """Compile the body of a function definition."""
+        return self._compile_code(func.name, func.body)
+
+    def _compile_code(self, name: str, body: list) -> CodeObject:
+        """Compile a block into a fresh code object ending in RETURN_VALUE."""
+        code = CodeObject(name)
+        self.compile_list(code, body, True)
+        code.emit(RETURN_VALUE)
+        return code
+
+    def compile(self, code: CodeObject, node, want_value: bool):
+        """
+        Compile the AST node based on its type.
+        When `want_value` is True the emitted code leaves exactly one value on the
+        stack (the value the tree walker would return), otherwise it leaves none.
+        """
+        compiler_method = getattr(self, _COMPILE_METHODS[type(node)], self.generic_compile)
+        compiler_method(code, node, want_value)
+
+    def generic_compile(self, code: CodeObject, node, want_value: bool):
+        """Fallback for nodes without bytecode: the VM hands them to the tree walker."""
+        code.emit(EVAL_NODE, code.add_const(node))
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_Number(self, code: CodeObject, node: Number, want_value: bool):
+        """Compile a Number node."""
+        if want_value:
+            code.emit(LOAD_CONST, code.add_const(node.value))
+
+    def compile_String(self, code: CodeObject, node: String, want_value: bool):
+        """Compile a String node."""
+        if want_value:
+            code.emit(LOAD_CONST, code.add_const(node.value))
+
+    def compile_Variable(self, code: CodeObject, node: Variable, want_value: bool):
+        """Compile a Variable node. The load is kept so undefined names still fail."""
+        code.emit(LOAD_NAME, code.add_name(node.name))
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_Assign(self, code: CodeObject, node: Assign, want_value: bool):
+        """Compile an Assign node."""
+        self.compile(code, node.value, True)
+        code.emit(STORE_NAME, code.add_name(node.name.name))
+        if want_value:
+            code.emit(LOAD_CONST, code.add_const(None))
+
+    def compile_BinOp(self, code: CodeObject, node: BinOp, want_value: bool):
+        """Compile a BinOp node."""
+        if node.op not in BINARY_OPCODES:
+            self.generic_compile(code, node, want_value)
+            return
+        self.compile(code, node.left, True)
+        self.compile(code, node.right, True)
+        code.emit(BINARY_OPCODES[node.op])
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_ArrayLiteral(self, code: CodeObject, node: ArrayLiteral, want_value: bool):
+        """Compile an ArrayLiteral node: BUILD_ARRAY takes its argument's worth of elements."""
+        for element in node.elements:
+            self.compile(code, element, True)
+        code.emit(BUILD_ARRAY, len(node.elements))
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_Index(self, code: CodeObject, node: Index, want_value: bool):
+        """Compile an Index node."""
+        self.compile(code, node.target, True)
+        self.compile(code, node.index, True)
+        code.emit(BINARY_SUBSCR)
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_ListLiteral(self, code: CodeObject, node: ListLiteral, want_value: bool):
+        """Compile a ListLiteral node: BUILD_LIST takes its argument's worth of elements."""
+        for element in node.elements:
+            self.compile(code, element, True)
+        code.emit(BUILD_LIST, len(node.elements))
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_DictLiteral(self, code: CodeObject, node: DictLiteral, want_value: bool):
+        """Compile a DictLiteral node: BUILD_DICT takes its argument's worth of key/value pairs."""
+        for key, value in zip(node.keys, node.values):
+            self.compile(code, key, True)
+            self.compile(code, value, True)
+        code.emit(BUILD_DICT, len(node.keys))
+        if not want_value:
+            code.emit(POP_TOP)
+
+    def compile_IndexAssign(self, code: CodeObject, node: IndexAssign, want_value: bool):
+        """Compile an IndexAssign node: STORE_SUBSCR pops the container, the index and the value."""
+        self.compile(code, node.target, True)
+        self.compile(code, node.index, True)
+        self.compile(code, node.value, True)
+        code.emit(STORE_SUBSCR)
+        if want_value:
+            code.emit(LOAD_CONST, code.add_const(None))
+
+    def compile_list(self, code: CodeObject, node: list, want_value: bool):
+        """Compile a block: its value is the value of its last statement."""
+        if not node:
+            if want_value:
+                code.emit(LOAD_CONST, code.add_const(None))
+            return
+        for stmt in node[:-1]:
+            self.compile(code, stmt, False)
+        self.compile(code, node[-1], want_value)
+
+    def compile_IfStmt(self, code: CodeObject, node: IfStmt, want_value: bool):
+        """Compile an IfStmt node into conditional jumps."""
+        self.compile(code, node.condition, True)
+        jump_to_else = code.emit(JUMP_IF_FALSE)
+        self.compile(code, node.then_block, want_value)
+        if not node.else_block and not want_value:
+            code.patch(jump_to_else, len(code.instructions))
+            return
+        jump_to_end = code.emit(JUMP)
+        code.patch(jump_to_else, len(code.instructions))
+        self.compile(code, node.else_block or [], want_value)
+        code.patch(jump_to_end, len(code.instructions))
+
+    def compile_WhileStmt(self, code: CodeObject, node: WhileStmt, want_value: bool):
+        """Compile a WhileStmt node into a backward jump."""
+        if want_value:
+            # The loop's value (its last body value) is kept on the stack.
+            code.emit(LOAD_CONST, code.add_const(None))
+        loop_start = len(code.instructions)
+        self.compile(code, node.condition, True)
+        jump_to_end = code.emit(JUMP_IF_FALSE)
+        if want_value:
+            code.emit(POP_TOP)
+        self.compile(code, node.body, want_value)
+        code.emit(JUMP, loop_start)
+        code.patch(jump_to_end, len(code.instructions))
+
+    def compile_ForStmt(self, code: CodeObject, node: ForStmt, want_value: bool):
+        """
+        Compile a ForStmt node. GET_RANGE replaces the bounds with an iterator, and
+        FOR_ITER pushes its next value or, once it is exhausted, pops it and jumps out.
+        """
+        if want_value:
+            # The loop's value sits below the iterator; STORE_LOOP_VALUE replaces it.
+            code.emit(LOAD_CONST, code.add_const(None))
+        self.compile(code, node.start, True)
+        self.compile(code, node.end, True)
+        if node.step is None:
+            code.emit(LOAD_CONST, code.add_const(1))
+        else:
+            self.compile(code, node.step, True)
+        code.emit(GET_RANGE)
+        loop_start = code.emit(FOR_ITER)
+        code.emit(STORE_NAME, code.add_name(node.var.name))
+        self.compile(code, node.body, want_value)
+        if want_value:
+            code.emit(STORE_LOOP_VALUE)
+        code.emit(JUMP, loop_start)
+        code.patch(loop_start, len(code.instructions))
+
+    def compile_FunctionDef(self, code: CodeObject, node: FunctionDef, want_value: bool):
+        """Compile a FunctionDef node. Its body is compiled by the VM on first call."""
+        code.emit(DEFINE_FUNCTION, code.add_const(node))
+        if want_value:
+            code.emit(LOAD_CONST, code.add_const(None))
+
+    def compile_FunctionCall(self, code: CodeObject, node: FunctionCall, want_value: bool):
+        """Compile a FunctionCall node: the callee is loaded before its arguments."""
+        code.emit(LOAD_NAME, code.add_name(node.name))
+        for arg in node.args:
+            self.compile(code, arg, True)
+        code.emit(CALL_FUNCTION, code.add_const((node.name, len(node.args))))
+        if not want_value:
+            code.emit(POP_TOP)
+
+
+def disassemble(code: CodeObject) -> str:
+    """Return a human-readable listing of a code object and its functions, for debugging."""
+    lines = [f"Disassembly of {code.name}:"]
+    functions = []
+    for position, (opcode, arg) in enumerate(code.instructions):
+        line = f"{position:5d} {OPNAMES[opcode]:<16}"
+        if opcode in CONST_OPCODES:
+            const = code.consts[arg]
+            if isinstance(const, FunctionDef):
+                functions.append(const)
+                shown = f"<function {const.name}>"
+            else:
+                shown = repr(const)
+            line += f"{arg:4d} ({shown})"
+        elif opcode in NAME_OPCODES:
+            line += f"{arg:4d} ({code.names[arg]})"
+        elif opcode in JUMP_OPCODES:
+            line += f"{arg:4d} (to {arg})"
+        lines.append(line.rstrip())
+    # Function bodies are compiled lazily by the VM, so compile them here for display.
+    for func in functions:
+        lines.append("")
+        lines.append(disassemble(Compiler().compile_function(func)))
+    return "\n".join(lines)
@@ -0,0 +1,192 @@
+"""
+Caches of parsed (and optimised) programs.
+Two tiers sit in front of the lexer, parser and optimiser:
+
+* an in-memory cache keyed by the SHA-256 of the source and the optimisation level,
+  with a bounded number of entries and an LRU or FIFO eviction policy;
+* an on-disk `__gbcache__` directory next to a script, holding one `.gbc` file per
+  script and optimisation level, like CPython's `__pycache__`.
+
+A `.gbc` file is a fixed header followed by the pickled statements:
+
+    magic (4 bytes) | interpreter fingerprint (32) | source hash (32) | opt level (1)
+
+The fingerprint is a hash of the Python version and of the modules that produce the
+AST, so editing the lexer, parser, node classes or optimiser invalidates old files.
+A file whose header does not match is ignored and rewritten. Files are read through
+`mmap`, and the header is checked before anything is unpickled.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+from collections import OrderedDict
+
+from Interpreter import ast_nodes, lexer, optimizer, parser
+from Interpreter.optimizer import optimize
+from Interpreter.parser import parse
+
+CACHE_DIRECTORY = "__gbcache__"
+CACHE_SUFFIX = ".gbc"
+MAGIC = b"GBC\x01"
+DEFAULT_CACHE_SIZE = 256
+EVICTION_POLICIES = ("lru", "fifo")
+
+
+def _interpreter_fingerprint() -> bytes:
+    """Hash the Python version and the source of every module that shapes the AST."""
+    digest = hashlib.sha256(repr(sys.version_info[:2]).encode())
+    for module in (lexer, parser, ast_nodes, optimizer):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+FINGERPRINT = _interpreter_fingerprint()
+HEADER_SIZE = len(MAGIC) + 32 + 32 + 1
+
+
+def source_hash(source: str) -> bytes:
+    """Return the SHA-256 digest of a program's source."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).digest()
+
+
+class CacheStats:
+    """Hit and miss counters of a ProgramCache."""
+
+    __slots__ = ("memory_hits", "disk_hits", "misses", "evictions", "disk_writes")
+
+    def __init__(self):
+        """Start every counter at zero."""
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_writes = 0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        """Represent the counters in a readable format."""
+        return "CacheStats(" + ", ".join(f"{k}={v}" for k, v in self.as_dict().items()) + ")"
+
+
+class ProgramCache:
+    """Returns the optimised statements of a source, parsing only on a miss."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        policy: str = "lru",
+        directory: str | None = None,
+    ):
+        """
+        Create a cache holding at most `maxsize` programs in memory. When `directory`
+        is given, programs with a filename are also stored there as .gbc files.
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'")
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.directory = directory
+        self.entries: OrderedDict = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self):
+        """Return the number of programs held in memory."""
+        return len(self.entries)
+
+    def clear(self):
+        """Drop every in-memory entry (the .gbc files are kept)."""
+        self.entries.clear()
+
+    def program(self, source: str, opt_level: int, filename: str | None = None) -> list:
+        """Return the statements of `source` optimised at `opt_level`."""
+        digest = source_hash(source)
+        key = (digest, opt_level)
+        statements = self.entries.get(key)
+        if statements is not None:
+            self.stats.memory_hits += 1
+            if self.policy == "lru":
+                self.entries.move_to_end(key)
+            return statements
+
+        path = self.path_for(filename, opt_level) if filename else None
+        statements = self.load(path, digest, opt_level) if path else None
+        if statements is not None:
+            self.stats.disk_hits += 1
+        else:
+            self.stats.misses += 1
+            statements = optimize(parse(source), opt_level)
+            if path:
+                self.store(path, digest, opt_level, statements)
+        self.remember(key, statements)
+        return statements
+
+    def remember(self, key, statements: list):
+        """Add an entry to the in-memory tier, evicting the oldest one if it is full."""
+        if self.maxsize == 0:
+            return
+        self.entries[key] = statements
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    # ----- Disk tier -----
+
+    def path_for(self, filename: str, opt_level: int) -> str | None:
+        """Return the .gbc path of a script, or None when there is no cache directory."""
+        if self.directory is None:
+            return None
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        return os.path.join(self.directory, f"{stem}.O{opt_level}{CACHE_SUFFIX}")
+
+    def load(self, path: str, digest: bytes, opt_level: int) -> list | None:
+        """Read a .gbc file; return None if it is missing, stale or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if data[:HEADER_SIZE] != self.header(digest, opt_level):
+                        return None
+                    with memoryview(data) as view, view[HEADER_SIZE:] as payload:
+                        return pickle.loads(payload)
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError):
+            # A missing or empty file, or one written by another interpreter build.
+            return None
+
+    def store(self, path: str, digest: bytes, opt_level: int, statements: list):
+        """Write a .gbc file atomically; a program that cannot be written is only kept in memory."""
+        try:
+            payload = pickle.dumps(statements, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return  # Extremely deep trees are not worth caching.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(self.header(digest, opt_level))
+                f.write(payload)
+            os.replace(temp_path, path)
+            self.stats.disk_writes += 1
+        except OSError:
+            # e.g. a read-only directory: running the script matters more than caching it.
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def header(digest: bytes, opt_level: int) -> bytes:
+        """Build the header that a valid .gbc file for this source must start with."""
+        return MAGIC + FINGERPRINT + digest + bytes((opt_level,))
+
+
+def cache_directory_for(filename: str) -> str:
+    """Return the `__gbcache__` directory that sits next to a script."""
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIRECTORY)
@@ -0,0 +1,366 @@
+"""
+Closure-compiling backend for the interpreter.
+Instead of dispatching on the node type every time a node is visited, the AST is
+compiled once into a tree of pre-bound Python closures. Every closure takes the
+current Environment and returns the value of its node, so running a program only
+costs closure calls.
+"""
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    Assign,
+    IndexAssign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+    MethodNames,
+)
+from Interpreter.arrays import GBArray
+from Interpreter.containers import get_item, set_item
+from Interpreter.ropes import concat
+from Interpreter.evaluator import (
+    Environment,
+    Evaluator,
+    NativeFunction,
+    counted_range,
+    divide,
+)
+
+
+def _compile_add(left, right):
+    def add(env):
+        left_val = left(env)
+        if type(left_val) is str:
+            return concat(left_val, right(env))
+        return left_val + right(env)
+
+    return add
+
+
+def _compile_sub(left, right):
+    def sub(env):
+        return left(env) - right(env)
+
+    return sub
+
+
+def _compile_mul(left, right):
+    def mul(env):
+        return left(env) * right(env)
+
+    return mul
+
+
+def _compile_div(left, right):
+    def div(env):
+        return divide(left(env), right(env))
+
+    return div
+
+
+def _compile_eq(left, right):
+    def eq(env):
+        return left(env) == right(env)
+
+    return eq
+
+
+def _compile_ne(left, right):
+    def ne(env):
+        return left(env) != right(env)
+
+    return ne
+
+
+def _compile_gt(left, right):
+    def gt(env):
+        return left(env) > right(env)
+
+    return gt
+
+
+def _compile_lt(left, right):
+    def lt(env):
+        return left(env) < right(env)
+
+    return lt
+
+
+def _compile_ge(left, right):
+    def ge(env):
+        return left(env) >= right(env)
+
+    return ge
+
+
+def _compile_le(left, right):
+    def le(env):
+        return left(env) <= right(env)
+
+    return le
+
+
+# One closure factory per operator, so no operator comparison happens at run time.
+BINOP_COMPILERS = {
+    "+": _compile_add,
+    "-": _compile_sub,
+    "*": _compile_mul,
+    "/": _compile_div,
+    "==": _compile_eq,
+    "!=": _compile_ne,
+    ">": _compile_gt,
+    "<": _compile_lt,
+    ">=": _compile_ge,
+    "<=": _compile_le,
+}
+
+_COMPILE_METHODS = MethodNames("compile_")
+
+
+class ClosureCompiler:
+    """Compiles AST nodes into closures of the form `closure(env) -> value`."""
+
+    def compile(self, node):
+        """Compile the AST node based on its type."""
+        compiler_method = getattr(self, _COMPILE_METHODS[type(node)], self.generic_compile)
+        return compiler_method(node)
+
+    def compile_program(self, statements: list):
+        """Compile a list of top-level statements into a single closure."""
+        return self.compile_list(statements)
+
+    def generic_compile(self, node):
+        """Fallback for nodes without a specialised closure: defer to the tree walker."""
+
+        def fallback(env):
+            return Evaluator(env).eval(node)
+
+        return fallback
+
+    def compile_Number(self, node: Number):
+        """Compile a Number node."""
+        value = node.value
+
+        def number(env):
+            return value
+
+        return number
+
+    def compile_String(self, node: String):
+        """Compile a String node."""
+        value = node.value
+
+        def string(env):
+            return value
+
+        return string
+
+    def compile_Variable(self, node: Variable):
+        """Compile a Variable node."""
+        name = node.name
+
+        def variable(env):
+            return env[name]
+
+        return variable
+
+    def compile_Assign(self, node: Assign):
+        """Compile an Assign node."""
+        name = node.name.name
+        value = self.compile(node.value)
+
+        def assign(env):
+            env[name] = value(env)
+            return None
+
+        return assign
+
+    def compile_BinOp(self, node: BinOp):
+        """Compile a BinOp node into the closure specialised for its operator."""
+        op = node.op
+        if op not in BINOP_COMPILERS:
+
+            def unknown_operator(env):
+                raise ValueError(f"Unknown operator '{op}'")
+
+            return unknown_operator
+        return BINOP_COMPILERS[op](self.compile(node.left), self.compile(node.right))
+
+    def compile_ArrayLiteral(self, node: ArrayLiteral):
+        """Compile an ArrayLiteral node."""
+        elements = tuple(self.compile(element) for element in node.elements)
+        from_values = GBArray.from_values
+
+        def array_literal(env):
+            return from_values([element(env) for element in elements])
+
+        return array_literal
+
+    def compile_Index(self, node: Index):
+        """Compile an Index node."""
+        target = self.compile(node.target)
+        index = self.compile(node.index)
+
+        def index_value(env):
+            container = target(env)
+            return get_item(container, index(env))
+
+        return index_value
+
+    def compile_ListLiteral(self, node: ListLiteral):
+        """Compile a ListLiteral node."""
+        elements = tuple(self.compile(element) for element in node.elements)
+
+        def list_literal(env):
+            return [element(env) for element in elements]
+
+        return list_literal
+
+    def compile_DictLiteral(self, node: DictLiteral):
+        """Compile a DictLiteral node."""
+        pairs = tuple(zip(map(self.compile, node.keys), map(self.compile, node.values)))
+
+        def dict_literal(env):
+            result = {}
+            for key, value in pairs:
+                set_item(result, key(env), value(env))
+            return result
+
+        return dict_literal
+
+    def compile_IndexAssign(self, node: IndexAssign):
+        """Compile an IndexAssign node."""
+        target = self.compile(node.target)
+        index = self.compile(node.index)
+        value = self.compile(node.value)
+
+        def index_assign(env):
+            container = target(env)
+            set_item(container, index(env), value(env))
+            return None
+
+        return index_assign
+
+    def compile_list(self, node: list):
+        """Compile a block: its value is the value of its last statement."""
+        stmts = tuple(self.compile(stmt) for stmt in node)
+        if not stmts:
+            return lambda env: None
+        if len(stmts) == 1:
+            return stmts[0]
+
+        def block(env):
+            result = None
+            for stmt in stmts:
+                result = stmt(env)
+            return result
+
+        return block
+
+    def compile_IfStmt(self, node: IfStmt):
+        """Compile an IfStmt node."""
+        condition = self.compile(node.condition)
+        then_block = self.compile(node.then_block)
+        if not node.else_block:
+
+            def if_then(env):
+                if condition(env):
+                    return then_block(env)
+                return None
+
+            return if_then
+
+        else_block = self.compile(node.else_block)
+
+        def if_then_else(env):
+            if condition(env):
+                return then_block(env)
+            return else_block(env)
+
+        return if_then_else
+
+    def compile_WhileStmt(self, node: WhileStmt):
+        """Compile a WhileStmt node."""
+        condition = self.compile(node.condition)
+        body = self.compile(node.body)
+
+        def while_loop(env):
+            result = None
+            while condition(env):
+                result = body(env)
+            return result
+
+        return while_loop
+
+    def compile_ForStmt(self, node: ForStmt):
+        """Compile a ForStmt node into a loop over a native range."""
+        start = self.compile(node.start)
+        end = self.compile(node.end)
+        step = None if node.step is None else self.compile(node.step)
+        name = node.var.name
+        body = self.compile(node.body)
+
+        def for_loop(env):
+            numbers = counted_range(start(env), end(env), 1 if step is None else step(env))
+            result = None
+            for value in numbers:
+                env[name] = value
+                result = body(env)
+            return result
+
+        return for_loop
+
+    def compile_FunctionDef(self, node: FunctionDef):
+        """Compile a FunctionDef node. The body is compiled lazily on first call."""
+        name = node.name
+
+        def function_def(env):
+            env[name] = node
+            return None
+
+        return function_def
+
+    def compile_body(self, func: FunctionDef):
+        """Return the compiled body of a FunctionDef, compiling it on first use."""
+        # Kept on the node, so it is freed with the function rather than piling up in the compiler.
+        body = func.closure
+        if body is None:
+            body = func.closure = self.compile(func.body)
+        return body
+
+    def compile_FunctionCall(self, node: FunctionCall):
+        """Compile a FunctionCall node."""
+        name = node.name
+        args = tuple(self.compile(arg) for arg in node.args)
+        compile_body = self.compile_body
+
+        def call(env):
+            func = env[name]
+            arg_values = [arg(env) for arg in args]
+
+            if isinstance(func, FunctionDef):
+                if len(arg_values) != len(func.params):
+                    raise TypeError(
+                        f"Function '{name}' expects {len(func.params)} arguments, but got {len(arg_values)}"
+                    )
+                local_env = Environment(outer=env)
+                for param, val in zip(func.params, arg_values):
+                    local_env[param] = val
+                return compile_body(func)(local_env)
+
+            elif isinstance(func, NativeFunction):
+                return func.py_callable(*arg_values)
+
+            else:
+                raise TypeError(f"'{name}' is not a function")
+
+        return call
@@ -0,0 +1,149 @@
+"""
+Lists and dictionaries for GB, and indexing of every container value.
+`[1, 2, 3]` evaluates to a Python list and `{"a": 1, "b": 2}` to a Python dict, so
+indexing, appending and key lookups take O(1) (amortised) time. Like every GB
+value, a container is shared, not copied, by assignments and calls: a function
+that sets an element of its argument changes the caller's container.
+
+`get_item` and `set_item` implement `x[i]` and `x[i] = v` for lists, dicts and
+numeric arrays; every backend calls them. The builtins in CONTAINER_FUNCTIONS are
+registered as native functions by the REPL.
+"""
+
+from Interpreter.arrays import GBArray
+from Interpreter.ropes import flatten
+
+# Values that can be dictionary keys: immutable, and hashed consistently with GB equality.
+KEY_TYPES = (int, float, str, bool)
+_MISSING = object()
+
+
+def _check_list_index(index):
+    """Check that a list index is an integer."""
+    if type(index) is not int:
+        raise TypeError("List indices must be integers")
+
+
+def _check_key(key):
+    """Check that a value can be a dictionary key."""
+    if type(key) not in KEY_TYPES:
+        raise TypeError("Dictionary keys must be numbers or strings")
+
+
+def get_item(container, index):
+    """Return `container[index]` for the GB values that can be indexed."""
+    container_type = type(container)
+    if container_type is list:
+        _check_list_index(index)
+        try:
+            return container[index]
+        except IndexError:
+            raise IndexError("List index out of range") from None
+    if container_type is dict:
+        index = flatten(index)
+        _check_key(index)
+        try:
+            return container[index]
+        except KeyError:
+            raise LookupError(f"Key {index!r} not found") from None
+    if container_type is GBArray:
+        return container[index]
+    raise TypeError(f"'{container_type.__name__}' value cannot be indexed")
+
+
+def set_item(container, index, value):
+    """Set `container[index]` to `value` for the GB values that can be modified."""
+    container_type = type(container)
+    if container_type is list:
+        _check_list_index(index)
+        try:
+            container[index] = value
+        except IndexError:
+            raise IndexError("List index out of range") from None
+    elif container_type is dict:
+        index = flatten(index)
+        _check_key(index)
+        container[index] = value
+    elif container_type is GBArray:
+        container[index] = value
+    else:
+        raise TypeError(f"'{container_type.__name__}' value does not support item assignment")
+
+
+def build_dict(items) -> dict:
+    """Build a dictionary from a flat sequence of keys and values: key, value, key, value, ..."""
+    result = {}
+    for position in range(0, len(items), 2):
+        set_item(result, items[position], items[position + 1])
+    return result
+
+
+# ----- Builtins -----
+
+
+def native_len(value):
+    """Return the number of elements of a container or characters of a string."""
+    if type(value) in (list, dict, GBArray, str):
+        return len(value)
+    raise TypeError("len() expects a list, a dictionary, an array or a string")
+
+
+def native_get(container, index, default=None):
+    """Return `container[index]`, or `default` when the index or key is missing."""
+    try:
+        return get_item(container, index)
+    except (IndexError, LookupError):
+        return default
+
+
+def native_set(container, index, value):
+    """Set `container[index]` to `value`, like `container[index] = value;`."""
+    set_item(container, index, value)
+    return None
+
+
+def native_push(values, value):
+    """Append a value to the end of a list."""
+    if type(values) is not list:
+        raise TypeError("push() expects a list")
+    values.append(value)
+    return None
+
+
+def native_pop(container, index=_MISSING):
+    """Remove and return the last element of a list, or the value of a dictionary key."""
+    if type(container) is list:
+        if index is _MISSING:
+            index = -1
+        _check_list_index(index)
+        try:
+            return container.pop(index)
+        except IndexError:
+            raise IndexError("pop() from an empty list" if not container else "List index out of range") from None
+    if type(container) is dict:
+        if index is _MISSING:
+            raise TypeError("pop() of a dictionary expects a key")
+        _check_key(index)
+        try:
+            return container.pop(index)
+        except KeyError:
+            raise LookupError(f"Key {index!r} not found") from None
+    raise TypeError("pop() expects a list or a dictionary")
+
+
+def native_keys(mapping):
+    """Return the keys of a dictionary as a new list, in insertion order."""
+    if type(mapping) is not dict:
+        raise TypeError("keys() expects a dictionary")
+    return list(mapping)
+
+
+# Builtins registered in the global environment, by GB name.
+CONTAINER_FUNCTIONS = {
+    "len": native_len,
+    "get": native_get,
+    "set": native_set,
+    "push": native_push,
+    "pop": native_pop,
+    "keys": native_keys,
+}
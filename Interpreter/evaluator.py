@@ -1,14 +1,70 @@
+import itertools
+
 from Interpreter.ast_nodes import (
     Number,
     Variable,
     String,
     BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
     Assign,
+    IndexAssign,
     IfStmt,
     WhileStmt,
+    ForStmt,
     FunctionDef,
     FunctionCall,
+    MethodNames,
 )
+from Interpreter.arrays import GBArray, NUMBER_TYPES
+from Interpreter.containers import get_item, set_item
+from Interpreter.inline_cache import InlineCache
+from Interpreter.ropes import Rope, concat, flatten
+
+# Every version stamp handed out is unique, so a cache filled under one global
+# environment is never valid under another.
+_version_stamps = itertools.count()
+
+_EVAL_METHODS = MethodNames("eval_")
+
+
+def add(left_val, right_val):
+    """GB addition, which concatenates strings lazily (see ropes.py)."""
+    if type(left_val) is str:
+        return concat(left_val, right_val)
+    return left_val + right_val
+
+
+def divide(left_val, right_val):
+    """GB division, which reports its own error message for a zero divisor."""
+    # Only a number is compared with 0 here: for an array the comparison is element-wise.
+    if type(right_val) in NUMBER_TYPES and right_val == 0:
+        raise ZeroDivisionError("Division by zero")
+    return left_val / right_val
+
+
+def counted_range(start, end, step=1) -> range:
+    """Return the values a for loop counts through, checking its bounds."""
+    if not (isinstance(start, int) and isinstance(end, int) and isinstance(step, int)):
+        raise TypeError("For loop bounds must be integers")
+    if step == 0:
+        raise ValueError("For loop step cannot be zero")
+    return range(start, end, step)
+
+
+def _flattening(py_callable):
+    """Wrap a Python callable so that it receives ropes as plain strings."""
+
+    def call(*args):
+        for arg in args:
+            if type(arg) is Rope:
+                args = [flatten(value) for value in args]
+                break
+        return py_callable(*args)
+
+    return call
 
 
 class NativeFunction:
@@ -17,7 +73,7 @@ class NativeFunction:
     def __init__(self, name, py_callable):
         """Store the function name and the Python callable."""
         self.name = name
-        self.py_callable = py_callable  # The actual Python function to call
+        self.py_callable = _flattening(py_callable)  # The actual Python function to call
 
     def __repr__(self):
         """Represent the native function in a readable format."""
@@ -25,25 +81,52 @@ class NativeFunction:
 
 
 class Environment(dict):
-    """Represents the environment in which the code is executed, storing variables."""
+    """
+    Represents the environment in which the code is executed, storing variables.
+    The global (outermost) environment also carries the version stamp that
+    validates inline caches, the set of names ever bound in a function scope, the
+    names whose function values call sites have cached, and the number of function
+    scopes created under it.
+    """
 
     def __init__(self, initial=None, outer=None):
         """This is the environment where variables are stored."""
-        if initial:
-            self.update(initial)
         self.outer = outer
+        if outer is None:
+            self.root = self
+            self.version = next(_version_stamps)
+            self.shadowed: set[str] = set()
+            self.cached_functions: set[str] = set()
+            self.scopes = 0
+        else:
+            root = self.root = outer.root
+            root.scopes += 1
+        if initial:
+            for name, value in initial.items():
+                self[name] = value
 
     def __getitem__(self, name):
         """Retrieve a variable from the environment, checking outer scopes if necessary."""
-        if name in self:
-            return super().__getitem__(name)
-        if self.outer:
-            return self.outer[name]
+        env = self
+        # Walk the chain of scopes in a loop, so deep call chains cannot overflow the Python stack.
+        while env is not None:
+            if name in env:
+                return dict.__getitem__(env, name)
+            env = env.outer
         raise NameError(f"Undefined variable '{name}'")
 
     def __setitem__(self, name, value):
         """Set a variable in the environment, allowing for nested scopes."""
-        super().__setitem__(name, value)
+        root = self.root
+        if self is root:
+            if name in root.cached_functions:
+                # A cached function is being rebound.
+                root.version = next(_version_stamps)
+        elif name not in root.shadowed:
+            # The name may now hide a global that a cache resolved.
+            root.shadowed.add(name)
+            root.version = next(_version_stamps)
+        dict.__setitem__(self, name, value)
 
 
 class Evaluator:
@@ -55,10 +138,13 @@ class Evaluator:
 
     def eval(self, node):
         """Evaluate the AST node based on its type."""
-        method_name = f"eval_{type(node).__name__}"
-        evaluator_method = getattr(self, method_name, self.generic_eval)
+        evaluator_method = getattr(self, _EVAL_METHODS[type(node)], self.generic_eval)
         return evaluator_method(node)
 
+    def spawn(self, env):
+        """Create the evaluator that runs a function body in `env` (same class as this one)."""
+        return type(self)(env)
+
     def generic_eval(self, node):
         """Fallback method for unknown node types."""
         raise TypeError(f"Unknown AST node type: {type(node)}")
@@ -72,8 +158,20 @@ class Evaluator:
         return node.value
 
     def eval_Variable(self, node: Variable):
-        """Evaluate a Variable node."""
-        return self.env[node.name]
+        """Evaluate a Variable node, reading a cached global straight from the global scope."""
+        cache = node.cache
+        root = self.env.root
+        if cache is not None and cache.version == root.version:
+            cache.hits += 1
+            return dict.__getitem__(root, node.name)
+        value = self.env[node.name]
+        if node.name not in root.shadowed:
+            # Only a global can be the value of a name no function scope binds.
+            if cache is None:
+                cache = node.cache = InlineCache()
+            cache.misses += 1
+            cache.version = root.version
+        return value
 
     def eval_Assign(self, node: Assign):
         """Evaluate an Assign node."""
@@ -86,18 +184,14 @@ class Evaluator:
         left_val = self.eval(node.left)
         right_val = self.eval(node.right)
         op = node.op
-        if op == "+" and isinstance(left_val, str) and isinstance(right_val, str):
-            return left_val + right_val
         if op == "+":
-            return left_val + right_val
+            return add(left_val, right_val)
         if op == "-":
             return left_val - right_val
         if op == "*":
             return left_val * right_val
         if op == "/":
-            if right_val == 0:
-                raise ZeroDivisionError("Division by zero")
-            return left_val / right_val
+            return divide(left_val, right_val)
         if op == "==":
             return left_val == right_val
         if op == "!=":
@@ -112,6 +206,30 @@ class Evaluator:
             return left_val <= right_val
         raise ValueError(f"Unknown operator '{op}'")
 
+    def eval_ArrayLiteral(self, node: ArrayLiteral):
+        """Evaluate an ArrayLiteral node into a GBArray."""
+        return GBArray.from_values([self.eval(element) for element in node.elements])
+
+    def eval_Index(self, node: Index):
+        """Evaluate an Index node."""
+        return get_item(self.eval(node.target), self.eval(node.index))
+
+    def eval_ListLiteral(self, node: ListLiteral):
+        """Evaluate a ListLiteral node into a new list."""
+        return [self.eval(element) for element in node.elements]
+
+    def eval_DictLiteral(self, node: DictLiteral):
+        """Evaluate a DictLiteral node into a new dictionary."""
+        result = {}
+        for key, value in zip(node.keys, node.values):
+            set_item(result, self.eval(key), self.eval(value))
+        return result
+
+    def eval_IndexAssign(self, node: IndexAssign):
+        """Evaluate an IndexAssign node."""
+        set_item(self.eval(node.target), self.eval(node.index), self.eval(node.value))
+        return None
+
     def eval_list(self, node: list):
         """Evaluate a Block node."""
         result = None
@@ -134,30 +252,72 @@ class Evaluator:
             result = self.eval(node.body)
         return result
 
+    def eval_ForStmt(self, node: ForStmt):
+        """Evaluate a ForStmt node by iterating over a native range."""
+        start = self.eval(node.start)
+        end = self.eval(node.end)
+        step = 1 if node.step is None else self.eval(node.step)
+        env, name, body = self.env, node.var.name, node.body
+        result = None
+        for value in counted_range(start, end, step):
+            env[name] = value
+            result = self.eval(body)
+        return result
+
     def eval_FunctionDef(self, node: FunctionDef):
         """Evaluate a Function Definition node."""
         self.env[node.name] = node
         return None
 
+    def resolve_function(self, node: FunctionCall):
+        """Look up the callee of a call site, and cache it when it is a global function."""
+        func = self.env[node.name]
+        root = self.env.root
+        if isinstance(func, CALLABLE_TYPES) and node.name not in root.shadowed:
+            cache = node.cache
+            if cache is None:
+                cache = node.cache = InlineCache()
+            cache.misses += 1
+            cache.version = root.version
+            cache.value = func
+            cache.is_native = isinstance(func, NativeFunction)
+            root.cached_functions.add(node.name)
+        return func
+
     # UPDATED: This method now handles both kinds of functions
     def eval_FunctionCall(self, node: FunctionCall):
         """Evaluate a Function Call node."""
-        func = self.env[node.name]
+        cache = node.cache
+        if cache is not None and cache.version == self.env.root.version:
+            cache.hits += 1
+            func = cache.value
+            if cache.is_native:
+                return func.py_callable(*[self.eval(arg) for arg in node.args])
+        else:
+            func = self.resolve_function(node)
         args = [self.eval(arg) for arg in node.args]
 
         if isinstance(func, FunctionDef):
-            if len(args) != len(func.params):
-                raise TypeError(
-                    f"Function '{node.name}' expects {len(func.params)} arguments, but got {len(args)}"
-                )
-            local_env = Environment(outer=self.env)
-            for name, val in zip(func.params, args):
-                local_env[name] = val
-            evaluator = Evaluator(local_env)
-            return evaluator.eval(func.body)
+            return self.call_function(node, func, args)
 
         elif isinstance(func, NativeFunction):
             return func.py_callable(*args)
 
         else:
             raise TypeError(f"'{node.name}' is not a function")
+
+    def call_function(self, node: FunctionCall, func: FunctionDef, args: list):
+        """Run the body of a GB function in a new scope with its parameters bound to `args`."""
+        if len(args) != len(func.params):
+            raise TypeError(
+                f"Function '{node.name}' expects {len(func.params)} arguments, but got {len(args)}"
+            )
+        local_env = Environment(outer=self.env)
+        for name, val in zip(func.params, args):
+            local_env[name] = val
+        evaluator = self.spawn(local_env)
+        return evaluator.eval(func.body)
+
+
+# Values whose bindings inline caches may hold on to.
+CALLABLE_TYPES = (FunctionDef, NativeFunction)
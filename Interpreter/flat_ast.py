@@ -0,0 +1,424 @@
+"""
+Columnar encoding of the GB AST.
+`encode()` flattens a parsed program into parallel typed arrays: one node kind and
+three integer operands per node, a pool of length-prefixed child lists, and pools
+for names and literal values. The FlatEvaluator walks these arrays directly, so a
+loaded program keeps no node objects alive.
+
+Operands by node kind (A, B, C are the three operand columns):
+
+    NUMBER, STRING    A = constant index
+    VARIABLE          A = name index
+    BINOP             A = left node, B = right node, C = operator index
+    ASSIGN            A = name index, B = value node
+    IF                A = condition node, B = then block, C = else block or NO_NODE
+    WHILE             A = condition node, B = body block
+    FUNCTION_DEF      A = name index, B = list of parameter name indexes, C = body block
+    FUNCTION_CALL     A = name index, B = list of argument nodes
+    BLOCK             A = list of statement nodes
+    OPAQUE            A = index into `opaque`, a node kept as an object
+    FOR               A = name index, B = list of start, end and step nodes (step may
+                      be NO_NODE), C = body block
+
+A "list" operand points into `children`, where `children[p]` is the length and
+`children[p + 1 : p + 1 + length]` are the items.
+"""
+
+import operator
+from array import array
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    Assign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+)
+from Interpreter.evaluator import (
+    Environment,
+    Evaluator,
+    NativeFunction,
+    add,
+    counted_range,
+    divide,
+)
+
+# Node kinds
+NUMBER = 0
+STRING = 1
+VARIABLE = 2
+BINOP = 3
+ASSIGN = 4
+IF = 5
+WHILE = 6
+FUNCTION_DEF = 7
+FUNCTION_CALL = 8
+BLOCK = 9
+OPAQUE = 10
+FOR = 11
+
+NO_NODE = -1
+OPERATORS = ("+", "-", "*", "/", "==", "!=", ">", "<", ">=", "<=")
+
+
+# Python implementations of OPERATORS, in the same order.
+OPERATOR_FUNCTIONS = (
+    add,
+    operator.sub,
+    operator.mul,
+    divide,
+    operator.eq,
+    operator.ne,
+    operator.gt,
+    operator.lt,
+    operator.ge,
+    operator.le,
+)
+
+
+class FlatAST:
+    """A program stored as typed arrays instead of node objects."""
+
+    __slots__ = (
+        "kinds",
+        "a",
+        "b",
+        "c",
+        "children",
+        "names",
+        "constants",
+        "opaque",
+        "root",
+        "functions",
+        "_name_index",
+        "_constant_index",
+    )
+
+    def __init__(self):
+        """Create an empty program."""
+        self.kinds = array("B")
+        self.a = array("i")
+        self.b = array("i")
+        self.c = array("i")
+        self.children = array("i")
+        self.names: list[str] = []
+        self.constants: list = []
+        self.opaque: list = []
+        self.root = NO_NODE
+        # Maps the index of a FUNCTION_DEF node -> its FlatFunction value.
+        self.functions: dict = {}
+        self._name_index: dict[str, int] = {}
+        self._constant_index: dict = {}
+
+    def __len__(self):
+        """Return the number of nodes."""
+        return len(self.kinds)
+
+    def nbytes(self) -> int:
+        """Return the size of the typed arrays in bytes (the pools are not counted)."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.kinds, self.a, self.b, self.c, self.children)
+        )
+
+    def add_node(self, kind: int, a: int = NO_NODE, b: int = NO_NODE, c: int = NO_NODE) -> int:
+        """Append a node and return its index."""
+        self.kinds.append(kind)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        return len(self.kinds) - 1
+
+    def add_list(self, items: list) -> int:
+        """Append a length-prefixed list of integers to `children` and return its position."""
+        position = len(self.children)
+        self.children.append(len(items))
+        self.children.extend(items)
+        return position
+
+    def items(self, position: int) -> array:
+        """Return the integers of the list stored at `position`."""
+        return self.children[position + 1 : position + 1 + self.children[position]]
+
+    def add_name(self, name: str) -> int:
+        """Return the index of a name in the name pool, adding it if needed."""
+        index = self._name_index.get(name)
+        if index is None:
+            index = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def add_constant(self, value) -> int:
+        """Return the index of a literal in the constant pool, adding it if needed."""
+        key = (type(value), value)
+        index = self._constant_index.get(key)
+        if index is None:
+            index = self._constant_index[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+
+def encode(statements: list) -> FlatAST:
+    """Flatten a list of top-level statements into a FlatAST."""
+    flat = FlatAST()
+    flat.root = _encode(flat, statements)
+    return flat
+
+
+def _encode(flat: FlatAST, node) -> int:
+    """Encode a node after its children and return its index."""
+    if isinstance(node, list):
+        return flat.add_node(BLOCK, flat.add_list([_encode(flat, stmt) for stmt in node]))
+    node_type = type(node)
+    if node_type is Number:
+        return flat.add_node(NUMBER, flat.add_constant(node.value))
+    if node_type is String:
+        return flat.add_node(STRING, flat.add_constant(node.value))
+    if node_type is Variable:
+        return flat.add_node(VARIABLE, flat.add_name(node.name))
+    if node_type is BinOp and node.op in OPERATORS:
+        left = _encode(flat, node.left)
+        right = _encode(flat, node.right)
+        return flat.add_node(BINOP, left, right, OPERATORS.index(node.op))
+    if node_type is Assign:
+        value = _encode(flat, node.value)
+        return flat.add_node(ASSIGN, flat.add_name(node.name.name), value)
+    if node_type is IfStmt:
+        condition = _encode(flat, node.condition)
+        then_block = _encode(flat, node.then_block)
+        else_block = NO_NODE if node.else_block is None else _encode(flat, node.else_block)
+        return flat.add_node(IF, condition, then_block, else_block)
+    if node_type is WhileStmt:
+        condition = _encode(flat, node.condition)
+        return flat.add_node(WHILE, condition, _encode(flat, node.body))
+    if node_type is ForStmt:
+        bounds = [_encode(flat, node.start), _encode(flat, node.end)]
+        bounds.append(NO_NODE if node.step is None else _encode(flat, node.step))
+        body = _encode(flat, node.body)
+        return flat.add_node(FOR, flat.add_name(node.var.name), flat.add_list(bounds), body)
+    if node_type is FunctionDef:
+        params = flat.add_list([flat.add_name(param) for param in node.params])
+        body = _encode(flat, node.body)
+        return flat.add_node(FUNCTION_DEF, flat.add_name(node.name), params, body)
+    if node_type is FunctionCall:
+        args = flat.add_list([_encode(flat, arg) for arg in node.args])
+        return flat.add_node(FUNCTION_CALL, flat.add_name(node.name), args)
+    # Any other node is kept as an object and run by the tree walker.
+    flat.opaque.append(node)
+    return flat.add_node(OPAQUE, len(flat.opaque) - 1)
+
+
+def decode(flat: FlatAST, index: int | None = None):
+    """Rebuild the tree of node objects rooted at `index` (the whole program by default)."""
+    if index is None:
+        index = flat.root
+    kind, a, b, c = flat.kinds[index], flat.a[index], flat.b[index], flat.c[index]
+    if kind == BLOCK:
+        return [decode(flat, stmt) for stmt in flat.items(a)]
+    if kind == NUMBER:
+        return Number(flat.constants[a])
+    if kind == STRING:
+        return String(flat.constants[a])
+    if kind == VARIABLE:
+        return Variable(flat.names[a])
+    if kind == BINOP:
+        return BinOp(decode(flat, a), OPERATORS[c], decode(flat, b))
+    if kind == ASSIGN:
+        return Assign(Variable(flat.names[a]), decode(flat, b))
+    if kind == IF:
+        else_block = None if c == NO_NODE else decode(flat, c)
+        return IfStmt(decode(flat, a), decode(flat, b), else_block)
+    if kind == WHILE:
+        return WhileStmt(decode(flat, a), decode(flat, b))
+    if kind == FOR:
+        start, end, step = flat.items(b)
+        step_node = None if step == NO_NODE else decode(flat, step)
+        var = Variable(flat.names[a])
+        return ForStmt(var, decode(flat, start), decode(flat, end), decode(flat, c), step_node)
+    if kind == FUNCTION_DEF:
+        params = [flat.names[param] for param in flat.items(b)]
+        return FunctionDef(flat.names[a], params, decode(flat, c))
+    if kind == FUNCTION_CALL:
+        return FunctionCall(flat.names[a], [decode(flat, arg) for arg in flat.items(b)])
+    return flat.opaque[a]
+
+
+class FlatFunction(FunctionDef):
+    """
+    A function defined by flat code. It is a FunctionDef, so every other backend can
+    call it; its `body` is decoded into node objects only if one of them asks for it.
+    """
+
+    __slots__ = ("flat", "body_index", "_body")
+
+    def __init__(self, name: str, params: list, flat: FlatAST, body_index: int):
+        """Store the function name, params and the location of its body."""
+        self.name = name
+        self.params = params
+        self.flat = flat
+        self.body_index = body_index
+        self._body = None
+        self.closure = None
+        self.bytecode = None
+        self.python_function = None
+        self.layout = None
+
+    @property
+    def body(self):
+        """The body as node objects, decoded on first use."""
+        if self._body is None:
+            self._body = decode(self.flat, self.body_index)
+        return self._body
+
+
+class FlatEvaluator(Evaluator):
+    """Evaluator that walks a FlatAST directly."""
+
+    def __init__(self, env=None):
+        """Initialize the evaluator with an environment and no program loaded."""
+        super().__init__(env)
+        self.flat = None
+        # Handlers indexed by node kind.
+        self.handlers = (
+            self.flat_Number,
+            self.flat_String,
+            self.flat_Variable,
+            self.flat_BinOp,
+            self.flat_Assign,
+            self.flat_IfStmt,
+            self.flat_WhileStmt,
+            self.flat_FunctionDef,
+            self.flat_FunctionCall,
+            self.flat_Block,
+            self.flat_Opaque,
+            self.flat_ForStmt,
+        )
+
+    def load(self, flat: FlatAST):
+        """Make `flat` the program whose arrays the handlers read."""
+        self.flat = flat
+        self.kinds, self.a, self.b, self.c = flat.kinds, flat.a, flat.b, flat.c
+        self.constants, self.names = flat.constants, flat.names
+
+    def run(self, flat: FlatAST):
+        """Evaluate a whole flat program and return the value of its last statement."""
+        self.load(flat)
+        return self.eval_index(flat.root)
+
+    def eval_index(self, index: int):
+        """Evaluate the node at `index` of the loaded program."""
+        return self.handlers[self.kinds[index]](index)
+
+    def flat_Number(self, index: int):
+        """Evaluate a NUMBER node."""
+        return self.constants[self.a[index]]
+
+    def flat_String(self, index: int):
+        """Evaluate a STRING node."""
+        return self.constants[self.a[index]]
+
+    def flat_Variable(self, index: int):
+        """Evaluate a VARIABLE node."""
+        return self.env[self.names[self.a[index]]]
+
+    def flat_BinOp(self, index: int):
+        """Evaluate a BINOP node."""
+        left_val = self.eval_index(self.a[index])
+        right_val = self.eval_index(self.b[index])
+        return OPERATOR_FUNCTIONS[self.c[index]](left_val, right_val)
+
+    def flat_Assign(self, index: int):
+        """Evaluate an ASSIGN node."""
+        self.env[self.names[self.a[index]]] = self.eval_index(self.b[index])
+        return None
+
+    def flat_Block(self, index: int):
+        """Evaluate a BLOCK node."""
+        result = None
+        for stmt in self.flat.items(self.a[index]):
+            result = self.eval_index(stmt)
+        return result
+
+    def flat_IfStmt(self, index: int):
+        """Evaluate an IF node."""
+        if self.eval_index(self.a[index]):
+            return self.eval_index(self.b[index])
+        elif self.c[index] != NO_NODE:
+            return self.eval_index(self.c[index])
+        return None
+
+    def flat_WhileStmt(self, index: int):
+        """Evaluate a WHILE node."""
+        condition, body = self.a[index], self.b[index]
+        result = None
+        while self.eval_index(condition):
+            result = self.eval_index(body)
+        return result
+
+    def flat_ForStmt(self, index: int):
+        """Evaluate a FOR node by iterating over a native range."""
+        start, end, step = self.flat.items(self.b[index])
+        numbers = counted_range(
+            self.eval_index(start),
+            self.eval_index(end),
+            1 if step == NO_NODE else self.eval_index(step),
+        )
+        env, name, body = self.env, self.names[self.a[index]], self.c[index]
+        result = None
+        for value in numbers:
+            env[name] = value
+            result = self.eval_index(body)
+        return result
+
+    def flat_FunctionDef(self, index: int):
+        """Evaluate a FUNCTION_DEF node. The same node always yields the same function."""
+        flat = self.flat
+        func = flat.functions.get(index)
+        if func is None:
+            params = [flat.names[param] for param in flat.items(self.b[index])]
+            func = FlatFunction(flat.names[self.a[index]], params, flat, self.c[index])
+            flat.functions[index] = func
+        self.env[func.name] = func
+        return None
+
+    def flat_FunctionCall(self, index: int):
+        """Evaluate a FUNCTION_CALL node."""
+        name = self.names[self.a[index]]
+        func = self.env[name]
+        args = [self.eval_index(arg) for arg in self.flat.items(self.b[index])]
+
+        if isinstance(func, FunctionDef):
+            if len(args) != len(func.params):
+                raise TypeError(
+                    f"Function '{name}' expects {len(func.params)} arguments, but got {len(args)}"
+                )
+            local_env = Environment(outer=self.env)
+            for param, val in zip(func.params, args):
+                local_env[param] = val
+            if not isinstance(func, FlatFunction):
+                return Evaluator(local_env).eval(func.body)
+            caller_env, caller_flat = self.env, self.flat
+            self.env = local_env
+            if func.flat is not caller_flat:
+                self.load(func.flat)
+            try:
+                return self.eval_index(func.body_index)
+            finally:
+                self.env = caller_env
+                if func.flat is not caller_flat:
+                    self.load(caller_flat)
+
+        elif isinstance(func, NativeFunction):
+            return func.py_callable(*args)
+
+        else:
+            raise TypeError(f"'{name}' is not a function")
+
+    def flat_Opaque(self, index: int):
+        """Evaluate a node the encoding keeps as an object with the tree walker."""
+        return Evaluator(self.env).eval(self.flat.opaque[self.a[index]])
@@ -0,0 +1,49 @@
+"""
+Inline caches for name lookups in the tree-walking evaluator.
+A Variable or FunctionCall node whose name resolves in the global environment gets
+an InlineCache. The cache is valid while the version stamp of the global
+environment is unchanged. The stamp changes when a function value is rebound or
+when a name is bound in a function scope for the first time, since that binding
+could shadow the global.
+
+A valid cache lets a Variable read the global dict directly, without walking the
+chain of calling scopes, and lets a FunctionCall reuse the function itself.
+"""
+
+from Interpreter.ast_nodes import Variable, FunctionCall, walk
+
+
+class InlineCache:
+    """The cached resolution of one lookup site, with its hit and miss counters."""
+
+    __slots__ = ("version", "value", "is_native", "hits", "misses")
+
+    def __init__(self):
+        """Create an empty (invalid) cache."""
+        self.version = -1
+        self.value = None
+        self.is_native = False
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        """Represent the cache in a readable format."""
+        return f"InlineCache(hits={self.hits}, misses={self.misses})"
+
+
+def inline_cache_stats(nodes) -> dict:
+    """Sum the inline cache counters of every lookup site below `nodes`."""
+    sites = hits = misses = 0
+    for node in walk(nodes):
+        if isinstance(node, (Variable, FunctionCall)) and node.cache is not None:
+            cache = node.cache
+            sites += 1
+            hits += cache.hits
+            misses += cache.misses
+    lookups = hits + misses
+    return {
+        "sites": sites,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+    }
@@ -1,23 +1,68 @@
 """This module provides a lexer for a simple programming language."""
 
-# Define token types
-NUMBER = "NUMBER"
-IDENT = "IDENT"
-SYMBOL = "SYMBOL"
-STRING = "STRING"
+import re
+import sys
+from typing import Iterable, Iterator
+
+# Define token types. They are small integers, so the parser compares ints.
+NUMBER = 0
+IDENT = 1
+SYMBOL = 2
+STRING = 3
+
+# Keywords are lexed as IDENT tokens, but each also gets a dedicated kind.
+KW_IF = 4
+KW_ELSE = 5
+KW_WHILE = 6
+KW_DEF = 7
+KW_SUP = 8
+KW_FOR = 9
+
+KEYWORDS = {
+    "if": KW_IF,
+    "else": KW_ELSE,
+    "while": KW_WHILE,
+    "def": KW_DEF,
+    "sup": KW_SUP,
+    "for": KW_FOR,
+}
+
+TOKEN_NAMES = {
+    NUMBER: "NUMBER",
+    IDENT: "IDENT",
+    SYMBOL: "SYMBOL",
+    STRING: "STRING",
+    KW_IF: "KW_IF",
+    KW_ELSE: "KW_ELSE",
+    KW_WHILE: "KW_WHILE",
+    KW_DEF: "KW_DEF",
+    KW_SUP: "KW_SUP",
+    KW_FOR: "KW_FOR",
+}
 
 
 class Token:
-    """Token class represents a single token in the input string."""
+    """
+    Token class represents a single token in the input string.
+    `type` is one of NUMBER, IDENT, SYMBOL or STRING; `kind` is the same except for
+    keywords, which keep type IDENT but get their own kind (e.g. KW_IF). `line` is
+    the 1-based source line the token starts on (0 when unknown).
+    """
 
-    def __init__(self, type_, value):
-        """Initializes a Token object with a type and value."""
+    __slots__ = ("type", "kind", "value", "line")
+
+    def __init__(self, type_, value, kind=None, line=0):
+        """Initializes a Token object with a type, a value and optionally its kind and line."""
         self.type = type_
         self.value = value
+        if kind is None:
+            kind = KEYWORDS.get(value, IDENT) if type_ == IDENT else type_
+        self.kind = kind
+        self.line = line
 
     def __repr__(self):
         """Represent a Token object."""
-        return f"Token({self.type}, {self.value})"
+        return f"Token({TOKEN_NAMES[self.type]}, {self.value})"
 
     def __eq__(self, other):
         """Check if two tokens are equal based on their type and value."""
@@ -28,73 +73,105 @@ class Token:
         )
 
 
-def lex(input_str: str) -> list[Token]:
-    """Splitting sequence of characters into a sequence of tokens"""
+# One master regular expression for the whole language. Every match consumes the
+# whitespace before a token together with the token itself, and the alternatives
+# are tried in order, so two-character symbols come before their one-character
+# prefixes. The group numbers are listed below (SKIP matches are dropped).
+TOKEN_REGEX = re.compile(
+    r"""
+    \s*
+    (?:
+        (?P<SKIP>\#[^\n]*)                      # Line comments
+        |"(?P<STRING>[^"]*)"                    # String literals
+        |(?P<NUMBER>\d+)                        # Integer literals
+        |(?P<IDENT>[^\W\d]\w*)                  # Identifiers and keywords
+        |(?P<SYMBOL>==|!=|<=|>=|[-+*/=!<>;(){},:\[\]@])  # Operators and punctuation
+    )
+    """,
+    re.VERBOSE,
+)
+WHITESPACE_REGEX = re.compile(r"\s*")
+SKIP_GROUP, STRING_GROUP, NUMBER_GROUP, IDENT_GROUP, SYMBOL_GROUP = 1, 2, 3, 4, 5
+
+
+def _scan(text: str, complete: bool, line: int = 1) -> tuple[list[Token], int, int]:
+    """
+    Tokenise `text` from its start (on source line `line`) until no token matches,
+    and return the tokens, the position where scanning stopped and the line of that
+    position. When `complete` is False, a token touching the end of `text` may
+    continue in more input, so it is left unscanned.
+    """
     tokens: list[Token] = []
-    i: int = 0
-    while i < len(input_str):
-        ch = input_str[i]
-
-        if ch.isspace():
-            i += 1
-            continue
-
-        # FIXED: Added support for line comments.
-        # If a '#' is found, we skip all characters until a newline is encountered.
-        if ch == "#":
-            i += 1  # Move past the '#'
-            # Keep advancing until the end of the string or a newline character
-            while i < len(input_str) and input_str[i] != "\n":
-                i += 1
-            continue  # Restart the loop to process the next character
-
-        if ch == '"':
-            i += 1  # Consume the opening quote
-            str_val = ""
-            while i < len(input_str) and input_str[i] != '"':
-                str_val += input_str[i]
-                i += 1
-            if i >= len(input_str):
-                raise ValueError("Unterminated string literal")
-            i += 1  # Consume the closing quote
-            tokens.append(Token(STRING, str_val))
-            continue
-
-        if ch.isdigit():
-            num = ch
-            i += 1
-            while i < len(input_str) and input_str[i].isdigit():
-                num += input_str[i]
-                i += 1
-            tokens.append(Token(NUMBER, int(num)))
-            continue
-
-        if ch.isalpha() or ch == "_":
-            ident = ch
-            i += 1
-            while i < len(input_str) and (
-                input_str[i].isalnum() or input_str[i] == "_"
-            ):
-                ident += input_str[i]
-                i += 1
-            tokens.append(Token(IDENT, ident))
-            continue
-
-        if ch in ["+", "-", "*", "/", "=", "!", "<", ">", ";", "(", ")", "{", "}", ","]:
-            next_ch = input_str[i + 1] if i + 1 < len(input_str) else ""
-            two_char_sym = ch + next_ch
-            if two_char_sym in ["==", "!=", "<=", ">="]:
-                tokens.append(Token(SYMBOL, two_char_sym))
-                i += 2
-            else:
-                tokens.append(Token(SYMBOL, ch))
-                i += 1
-        else:
-            raise ValueError(f"Unknown character: {ch}")
-
+    append = tokens.append
+    match_token = TOKEN_REGEX.match
+    count_newlines = text.count
+    intern = sys.intern
+    keyword_kind = KEYWORDS.get
+    end = len(text) if complete else len(text) - 1
+    pos: int = 0
+    counted: int = 0  # Newlines before this position are included in `line`.
+    # Each match slices its token straight out of the source. Matching is anchored
+    # at `pos`, so the first text that starts no valid token ends the loop.
+    match = match_token(text, pos)
+    while match and match.end() <= end:
+        group = match.lastindex
+        start = match.start(group)
+        line += count_newlines("\n", counted, start)
+        counted = start
+        pos = match.end()
+        if group == IDENT_GROUP:
+            # Identifiers are interned, so equal names share one string object.
+            value = intern(match.group(group))
+            append(Token(IDENT, value, keyword_kind(value, IDENT), line))
+        elif group == SYMBOL_GROUP:
+            append(Token(SYMBOL, intern(match.group(group)), SYMBOL, line))
+        elif group == NUMBER_GROUP:
+            append(Token(NUMBER, int(match.group(group)), NUMBER, line))
+        elif group == STRING_GROUP:
+            value = match.group(group)
+            append(Token(STRING, value, STRING, line))
+            line += value.count("\n")
+            counted = pos
+        match = match_token(text, pos)
+    return tokens, pos, line + count_newlines("\n", counted, pos)
+
+
+def lex(input_str: str, line: int = 1) -> list[Token]:
+    """Splitting sequence of characters into a sequence of tokens"""
+    tokens, pos, _ = _scan(input_str, True, line)
+    pos = WHITESPACE_REGEX.match(input_str, pos).end()
+    if pos < len(input_str):
+        if input_str[pos] == '"':
+            raise ValueError("Unterminated string literal")
+        raise ValueError(f"Unknown character: {input_str[pos]}")
     return tokens
 
 
+def iter_lex(source: str | Iterable[str]) -> Iterator[Token]:
+    """
+    Lazily split a string, or an iterable of string chunks such as the blocks of
+    an open file, into tokens. Only the text of the current chunk is held in memory.
+    """
+    if isinstance(source, str):
+        source = (source,)
+    buffer = ""
+    line = 1  # The source line the buffer starts on.
+    for chunk in source:
+        buffer += chunk
+        # A token that touches the end of the buffer may continue in the next chunk
+        # (e.g. "=" followed by "="), so it is kept back until more text arrives.
+        tokens, pos, line = _scan(buffer, False, line)
+        yield from tokens
+        skipped = WHITESPACE_REGEX.match(buffer, pos).end()
+        if skipped < len(buffer) - 1 and TOKEN_REGEX.match(buffer, pos) is None:
+            # Only a string literal can fail to match because it is cut in half.
+            if buffer[skipped] != '"':
+                raise ValueError(f"Unknown character: {buffer[skipped]}")
+        buffer = buffer[pos:]
+    # The rest of the input is complete, so it can be lexed normally.
+    yield from lex(buffer, line)
+
+
 if __name__ == "__main__":
     print(lex("sup x = 3 + 4;"))
     # [Token(IDENT, 'sup'), Token(IDENT, 'x'), Token(SYMBOL, '='), Token(NUMBER, 3), Token(SYMBOL, '+'), Token(NUMBER, 4), Token(SYMBOL, ';')]
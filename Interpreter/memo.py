@@ -0,0 +1,328 @@
+"""
+Automatic memoisation of pure GB functions.
+A function is pure when its result depends only on its arguments and calling it has
+no effect outside its own scope. Under GB's dynamic scoping that means its body:
+
+* reads only its parameters and locals it has definitely assigned (any other name
+  would be looked up in the caller's scope);
+* defines no nested functions;
+* calls only global GB functions that are themselves pure. Native functions such as
+  `print` and `input` are impure, and so is a call through a parameter or local, or
+  through a name some function scope has ever bound (it could resolve to that
+  binding instead of the global).
+
+Assignments inside a function only bind names in the call's own scope, so they are
+allowed as long as the names are not read before being assigned.
+
+The verdicts depend on the global bindings of the callees, so they are recomputed
+whenever the version stamp of the global environment changes. Every table is cleared
+at the same time. Each pure function gets an LRU table of results, bounded by
+`maxsize` entries. All the tables together are bounded by `max_bytes` of estimated
+memory, and the largest table gives up its oldest entries first. Only calls whose
+arguments and result are immutable scalars (numbers and strings) are memoised.
+"""
+
+import sys
+from collections import OrderedDict
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    IndexAssign,
+    Assign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+)
+from Interpreter.evaluator import Environment, Evaluator
+
+DEFAULT_TABLE_SIZE = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Argument and result types that can be kept in a table: immutable, and hashable
+# consistently with GB equality.
+MEMO_TYPES = frozenset((int, float, str, bool, type(None)))
+# Approximate cost of one table entry beyond its key and value: the OrderedDict slot
+# and link, and the key tuple.
+ENTRY_OVERHEAD = 120
+
+
+class PurityAnalyzer:
+    """Decides which global GB functions are pure, for one state of the global environment."""
+
+    def __init__(self, root: Environment):
+        """Analyse functions against the bindings of the global environment `root`."""
+        self.root = root
+        self.version = root.version
+        self.verdicts = {}  # Maps id(FunctionDef) -> (FunctionDef, is pure).
+        self.in_progress = set()
+        # Functions found pure while assuming that a function still being analysed is
+        # pure. They are analysed again if that assumption turns out to be wrong.
+        self.provisional = []
+
+    def is_pure(self, func: FunctionDef) -> bool:
+        """Return True if calls to `func` can be memoised."""
+        entry = self.verdicts.get(id(func))
+        if entry is not None:
+            return entry[1]
+        if id(func) in self.in_progress:
+            # A recursive call: assume the function is pure, and let the rest of its body decide.
+            return True
+        outermost = not self.in_progress
+        self.in_progress.add(id(func))
+        try:
+            pure = self.check_block(func.body, set(func.params)) is not None
+        finally:
+            self.in_progress.discard(id(func))
+        self.verdicts[id(func)] = (func, pure)
+        if not outermost:
+            if pure:
+                self.provisional.append(id(func))
+        else:
+            if not pure:
+                # Every function analysed meanwhile is called from this one, so any
+                # failed assumption made this one impure too.
+                for key in self.provisional:
+                    del self.verdicts[key]
+            self.provisional.clear()
+        return pure
+
+    def check_block(self, block: list, assigned: set) -> set | None:
+        """Check the statements of a block; return the names assigned after it, or None if impure."""
+        for stmt in block:
+            assigned = self.check_statement(stmt, assigned)
+            if assigned is None:
+                return None
+        return assigned
+
+    def check_statement(self, stmt, assigned: set) -> set | None:
+        """Check one statement; return the names assigned after it, or None if impure."""
+        stmt_type = type(stmt)
+        if stmt_type is Assign:
+            if not self.check_expression(stmt.value, assigned):
+                return None
+            return assigned | {stmt.name.name}
+        if stmt_type is IfStmt:
+            if not self.check_expression(stmt.condition, assigned):
+                return None
+            then_assigned = self.check_block(stmt.then_block, assigned)
+            else_assigned = self.check_block(stmt.else_block or [], assigned)
+            if then_assigned is None or else_assigned is None:
+                return None
+            # Only names both branches assign are certain to be bound afterwards.
+            return then_assigned & else_assigned
+        if stmt_type is WhileStmt:
+            if not self.check_expression(stmt.condition, assigned):
+                return None
+            # The body may run zero times, so its assignments do not count afterwards.
+            if self.check_block(stmt.body, assigned) is None:
+                return None
+            return assigned
+        if stmt_type is ForStmt:
+            bounds = [stmt.start, stmt.end] + ([] if stmt.step is None else [stmt.step])
+            if not all(self.check_expression(bound, assigned) for bound in bounds):
+                return None
+            # The body sees the loop variable bound; after zero iterations it is not.
+            if self.check_block(stmt.body, assigned | {stmt.var.name}) is None:
+                return None
+            return assigned
+        if stmt_type is IndexAssign:
+            # Only the function's own values can be reached: a container argument is
+            # shared with the caller, but a call with one is never memoised.
+            parts = (stmt.target, stmt.index, stmt.value)
+            if not all(self.check_expression(part, assigned) for part in parts):
+                return None
+            return assigned
+        if stmt_type is list:
+            return self.check_block(stmt, assigned)
+        if self.check_expression(stmt, assigned):
+            return assigned
+        return None  # A nested FunctionDef, or a node this analysis does not know.
+
+    def check_expression(self, node, assigned: set) -> bool:
+        """Return True if evaluating an expression reads no outside state and has no effects."""
+        node_type = type(node)
+        if node_type is Number or node_type is String:
+            return True
+        if node_type is Variable:
+            return node.name in assigned
+        if node_type is BinOp:
+            return self.check_expression(node.left, assigned) and self.check_expression(
+                node.right, assigned
+            )
+        if node_type is ArrayLiteral or node_type is ListLiteral:
+            return all(self.check_expression(element, assigned) for element in node.elements)
+        if node_type is DictLiteral:
+            return all(self.check_expression(part, assigned) for part in node.keys + node.values)
+        if node_type is Index:
+            return self.check_expression(node.target, assigned) and self.check_expression(
+                node.index, assigned
+            )
+        if node_type is FunctionCall:
+            return self.check_callee(node.name, assigned) and all(
+                self.check_expression(arg, assigned) for arg in node.args
+            )
+        return False
+
+    def check_callee(self, name: str, assigned: set) -> bool:
+        """Return True if a call to `name` resolves to a pure global GB function."""
+        root = self.root
+        if name in assigned or name in root.shadowed or name not in root:
+            return False
+        callee = dict.__getitem__(root, name)
+        if not isinstance(callee, FunctionDef):
+            return False  # A native function or a plain value.
+        # Rebinding the callee must bump the version stamp, which clears the verdicts.
+        root.cached_functions.add(name)
+        return self.is_pure(callee)
+
+
+class MemoTable:
+    """The remembered results of one pure function, in least recently used order."""
+
+    __slots__ = ("func", "entries", "nbytes", "hits", "misses")
+
+    def __init__(self, func: FunctionDef):
+        """Create an empty table for `func`."""
+        self.func = func
+        self.entries: OrderedDict = OrderedDict()  # Maps argument key -> (result, size).
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+class MemoStats:
+    """Counters of a Memoizer."""
+
+    __slots__ = ("hits", "misses", "evictions", "invalidations", "skipped")
+
+    def __init__(self):
+        """Start every counter at zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped = 0  # Calls to pure functions with arguments or a result that cannot be kept.
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        """Represent the counters in a readable format."""
+        return "MemoStats(" + ", ".join(f"{k}={v}" for k, v in self.as_dict().items()) + ")"
+
+
+class Memoizer:
+    """Result tables of the pure functions, with a per-function and a global bound."""
+
+    def __init__(self, maxsize: int = DEFAULT_TABLE_SIZE, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Keep at most `maxsize` results per function, and about `max_bytes` of results
+        across all functions.
+        """
+        if maxsize < 0 or max_bytes < 0:
+            raise ValueError("Memoisation bounds must not be negative")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.tables = {}  # Maps id(FunctionDef) -> MemoTable.
+        self.nbytes = 0
+        self.analyzer = None
+        self.stats = MemoStats()
+
+    def __len__(self):
+        """Return the number of results held across all tables."""
+        return sum(len(table.entries) for table in self.tables.values())
+
+    def clear(self):
+        """Drop every result and every purity verdict."""
+        self.tables.clear()
+        self.nbytes = 0
+        self.analyzer = None
+
+    def table_for(self, func: FunctionDef, root: Environment) -> MemoTable | None:
+        """Return the table of `func`, or None if the function is not pure."""
+        analyzer = self.analyzer
+        if analyzer is None or analyzer.root is not root or analyzer.version != root.version:
+            if self.tables:
+                self.stats.invalidations += 1
+            self.clear()
+            analyzer = self.analyzer = PurityAnalyzer(root)
+        table = self.tables.get(id(func))
+        if table is not None:
+            return table
+        if not analyzer.is_pure(func):
+            return None
+        table = self.tables[id(func)] = MemoTable(func)
+        return table
+
+    def store(self, table: MemoTable, key: tuple, result):
+        """Remember a result, evicting old entries to stay within both bounds."""
+        if self.maxsize == 0:
+            return
+        size = ENTRY_OVERHEAD + sys.getsizeof(result) + sum(map(sys.getsizeof, key))
+        table.entries[key] = (result, size)
+        table.nbytes += size
+        self.nbytes += size
+        while len(table.entries) > self.maxsize:
+            self.evict(table)
+        while self.nbytes > self.max_bytes:
+            self.evict(max(self.tables.values(), key=lambda t: t.nbytes))
+
+    def evict(self, table: MemoTable):
+        """Drop the least recently used entry of a table."""
+        _, (_, size) = table.entries.popitem(last=False)
+        table.nbytes -= size
+        self.nbytes -= size
+        self.stats.evictions += 1
+
+
+class MemoEvaluator(Evaluator):
+    """Tree-walking evaluator that memoises calls to pure GB functions."""
+
+    def __init__(self, env=None, memoizer: Memoizer | None = None):
+        """Initialize the evaluator with an environment and the tables it shares with its callees."""
+        super().__init__(env)
+        self.memoizer = memoizer if memoizer is not None else Memoizer()
+
+    def spawn(self, env):
+        """Create the evaluator for a function body, sharing this evaluator's tables."""
+        return type(self)(env, self.memoizer)
+
+    def call_function(self, node: FunctionCall, func: FunctionDef, args: list):
+        """Return a remembered result when `func` is pure and has been called with `args` before."""
+        memoizer = self.memoizer
+        table = memoizer.table_for(func, self.env.root)
+        if table is None:
+            return super().call_function(node, func, args)
+        for arg in args:
+            if type(arg) not in MEMO_TYPES:
+                memoizer.stats.skipped += 1
+                return super().call_function(node, func, args)
+        # The types are part of the key, so 1, 1.0 and True do not share an entry.
+        key = (*args, *map(type, args))
+        entry = table.entries.get(key)
+        if entry is not None:
+            table.hits += 1
+            memoizer.stats.hits += 1
+            table.entries.move_to_end(key)
+            return entry[0]
+        table.misses += 1
+        memoizer.stats.misses += 1
+        result = super().call_function(node, func, args)
+        if type(result) not in MEMO_TYPES:
+            memoizer.stats.skipped += 1
+            return result
+        # The call may have bound names that changed the version stamp (a first local
+        # binding of a name, say), so the function must still be pure afterwards.
+        table = memoizer.table_for(func, self.env.root)
+        if table is not None:
+            memoizer.store(table, key, result)
+        return result
@@ -0,0 +1,192 @@
+"""
+Memory accounting of a program run with tracemalloc.
+A MemoryTracer traces a run one phase at a time (see REPL.profile_memory): for
+each phase it records the memory the phase left allocated, the number of blocks,
+the peak reached while it ran, and the source lines that allocated the most.
+After the run it records the memory still retained while the REPL is alive (its
+global variables, the last program, the backends' caches), and again once the
+REPL has been dropped: whatever is left then is a leak. At both points it also
+counts the live objects of each interpreter class, so a leaked chain of
+Environments or a FunctionDef kept by a cache shows up by name.
+
+Only allocations made by the interpreter are counted: the tracer's own snapshots
+are filtered out. The program's result is kept by the report, so its few bytes
+count as retained (and leaked) memory.
+"""
+
+import fnmatch
+import gc
+import os
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+TOP_SITES = 5  # Allocation sites listed per phase.
+# Frames kept per allocation, so work done for the tracer deeper in the standard
+# library (Counter arithmetic, compiling the filters' patterns) is recognised as its own.
+TRACE_FRAMES = 16
+# Allocations made by tracemalloc, its filters and this module are the tracer's own.
+_OWN_FILES = (tracemalloc.__file__, fnmatch.__file__, __file__)
+
+
+class PhaseMemory:
+    """The allocations of one phase of a run."""
+
+    __slots__ = ("name", "allocated", "blocks", "peak", "top")
+
+    def __init__(self, name: str, allocated: int, blocks: int, peak: int, top: list):
+        """Store the net bytes and blocks left by the phase, its peak and its top allocation sites."""
+        self.name = name
+        self.allocated = allocated
+        self.blocks = blocks
+        self.peak = peak  # Bytes above the start of the phase.
+        self.top = top  # (site, bytes, blocks) triples, largest first.
+
+    def as_dict(self) -> dict:
+        """Return the numbers as a dictionary."""
+        return {
+            "allocated": self.allocated,
+            "blocks": self.blocks,
+            "peak": self.peak,
+            "top": [list(site) for site in self.top],
+        }
+
+
+class MemoryReport:
+    """The per-phase allocations, peak, retained and leaked memory of one run."""
+
+    def __init__(self, backend: str):
+        """Start an empty report of a run on `backend`."""
+        self.backend = backend
+        self.phases: dict[str, PhaseMemory] = {}
+        self.peak = 0  # Bytes above the start of the run.
+        self.retained = 0  # Bytes still allocated after the run, with the REPL alive.
+        self.retained_top: list = []
+        self.retained_objects: Counter = Counter()  # Class name -> instances created by the run and still alive.
+        self.leaked = 0  # Bytes still allocated after the REPL is dropped.
+        self.leaked_top: list = []
+        self.leaked_objects: Counter = Counter()
+        self.result = None  # The program's result.
+
+    def as_dict(self) -> dict:
+        """Return the report as JSON-compatible data (without the program's result)."""
+        return {
+            "backend": self.backend,
+            "phases": {name: phase.as_dict() for name, phase in self.phases.items()},
+            "peak": self.peak,
+            "retained": self.retained,
+            "retained_top": [list(site) for site in self.retained_top],
+            "retained_objects": dict(self.retained_objects.most_common()),
+            "leaked": self.leaked,
+            "leaked_top": [list(site) for site in self.leaked_top],
+            "leaked_objects": dict(self.leaked_objects.most_common()),
+        }
+
+    def report(self) -> str:
+        """Return the report as text."""
+        lines = [f"{'phase':>9} {'allocated KiB':>14} {'blocks':>10} {'peak KiB':>10}  top allocation site"]
+        for phase in self.phases.values():
+            site = f"{phase.top[0][0]} ({phase.top[0][1] / 1024:,.1f} KiB)" if phase.top else "-"
+            lines.append(
+                f"{phase.name:>9} {phase.allocated / 1024:14,.1f} {phase.blocks:>10,} {phase.peak / 1024:10,.1f}  {site}"
+            )
+        lines.append("")
+        lines.append(f"peak {self.peak / 1024:,.1f} KiB above the start of the run")
+        lines.append(f"retained with the REPL alive: {self.retained / 1024:,.1f} KiB")
+        lines.extend(_describe(self.retained_top, self.retained_objects))
+        lines.append(f"leaked after the REPL is dropped: {self.leaked / 1024:,.1f} KiB")
+        lines.extend(_describe(self.leaked_top, self.leaked_objects))
+        return "\n".join(lines)
+
+
+def _describe(top: list, objects: Counter) -> list[str]:
+    """Return the indented lines listing allocation sites and live objects."""
+    lines = [f"    {site}: {size / 1024:,.1f} KiB in {count:,} blocks" for site, size, count in top]
+    if objects:
+        lines.append("    live objects: " + ", ".join(f"{name} {count:,}" for name, count in objects.most_common()))
+    return lines
+
+
+def live_objects() -> Counter:
+    """Count the live instances of the interpreter's classes (not the tracer's), by class name."""
+    gc.collect()
+    return Counter(
+        type(obj).__name__
+        for obj in gc.get_objects()
+        if type(obj).__module__.startswith("Interpreter.") and type(obj).__module__ != __name__
+    )
+
+
+class MemoryTracer:
+    """Traces the memory of a run phase by phase and fills in a MemoryReport."""
+
+    def __init__(self, backend: str, top: int = TOP_SITES):
+        """Create a tracer for a run on `backend` listing `top` allocation sites per phase."""
+        self.report = MemoryReport(backend)
+        self.top = top
+        self._started = False  # Whether this tracer started tracemalloc (and must stop it).
+        self._baseline = None  # The snapshot taken at the start of the run.
+        self._last = None  # The snapshot taken at the end of the last phase.
+        self._objects = Counter()  # The live objects at the start of the run.
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        """Take a snapshot of the interpreter's allocations."""
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces([tracemalloc.Filter(False, filename, all_frames=True) for filename in _OWN_FILES])
+
+    def sites(self, after: tracemalloc.Snapshot, before: tracemalloc.Snapshot) -> tuple[int, int, list]:
+        """Return the bytes and blocks allocated between two snapshots and the sites that grew most."""
+        diffs = after.compare_to(before, "lineno")
+        size = sum(diff.size_diff for diff in diffs)
+        count = sum(diff.count_diff for diff in diffs)
+        top = [
+            (f"{os.path.basename(diff.traceback[0].filename)}:{diff.traceback[0].lineno}", diff.size_diff, diff.count_diff)
+            for diff in diffs[: self.top]
+            if diff.size_diff > 0
+        ]
+        return size, count, top
+
+    def __enter__(self):
+        """Start tracing (unless tracemalloc is already on) and take the baseline snapshot."""
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(TRACE_FRAMES)
+        self._objects = live_objects()
+        self._baseline = self._last = self.snapshot()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop tracing if this tracer started it."""
+        if self._started:
+            tracemalloc.stop()
+        self._baseline = self._last = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record the allocations of the `with` block as the phase `name`."""
+        before = self._last
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - start
+            self._last = self.snapshot()
+            allocated, blocks, top = self.sites(self._last, before)
+            self.report.phases[name] = PhaseMemory(name, allocated, blocks, peak, top)
+            # The memory left by the earlier phases plus this phase's own peak.
+            so_far = self.sites(before, self._baseline)[0]
+            self.report.peak = max(self.report.peak, so_far + peak)
+
+    def retained(self):
+        """Record the memory still allocated after the run, with the REPL alive."""
+        size, _, top = self.sites(self.snapshot(), self._baseline)
+        self.report.retained, self.report.retained_top = size, top
+        self.report.retained_objects = live_objects() - self._objects
+
+    def leaked(self):
+        """Record the memory still allocated after the REPL has been dropped."""
+        size, _, top = self.sites(self.snapshot(), self._baseline)
+        self.report.leaked, self.report.leaked_top = size, top
+        self.report.leaked_objects = live_objects() - self._objects
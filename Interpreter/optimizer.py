@@ -0,0 +1,259 @@
+"""
+AST optimisation passes and the pass manager that runs them.
+Passes rewrite the parsed program before any backend sees it. They never modify
+the tree they are given: a node is copied only when one of its children changes,
+so untouched subtrees (and the FunctionDef nodes the backends cache) are shared.
+
+Optimisation levels:
+
+    0   no passes
+    1   constant folding and dead-code elimination (including `if`, `while` and
+        `for` statements whose blocks can never run); the program behaves exactly
+        as it does unoptimised, including its runtime errors
+    2   level 1 plus algebraic identities such as `x * 1` and `x + 0`, applied only
+        when `x` is known to be a number before the program runs (a numeric literal,
+        or arithmetic on such operands). A variable or call may hold a string, a
+        list, a dictionary or an array, for which the identity would change the
+        result, hide a TypeError or alias a container, so it is left alone.
+"""
+
+import copy
+
+from Interpreter.ast_nodes import (
+    RUNTIME_FIELDS,
+    Number,
+    String,
+    BinOp,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    MethodNames,
+)
+from Interpreter.evaluator import Evaluator
+from Interpreter.ropes import Rope, flatten
+
+OPT_LEVELS = (0, 1, 2)
+DEFAULT_OPT_LEVEL = 1
+# Folded strings longer than this stay as expressions, so `"x" * 1000000` does not
+# grow the program.
+MAX_FOLDED_STRING = 1024
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/")
+# Node fields that hold a block of statements; other list fields (call arguments,
+# parameter names) are plain sequences.
+BLOCK_FIELDS = ("then_block", "else_block", "body")
+
+_VISIT_METHODS = MethodNames("visit_")
+
+
+def is_constant(node) -> bool:
+    """Return True if a node is a literal."""
+    return type(node) in (Number, String)
+
+
+class NodeTransformer:
+    """
+    Base class of the passes. `visit` dispatches to `visit_<Type>` and falls back to
+    `generic_visit`, which visits the children and copies the node if any changed.
+    """
+
+    name = "transform"
+
+    def run(self, statements: list) -> list:
+        """Run the pass over a list of top-level statements."""
+        return self.visit(statements)
+
+    def visit(self, node):
+        """Visit the AST node based on its type."""
+        visitor_method = getattr(self, _VISIT_METHODS[type(node)], self.generic_visit)
+        return visitor_method(node)
+
+    def visit_list(self, node: list) -> list:
+        """Visit every statement of a block."""
+        return self.visit_items(node)
+
+    def visit_items(self, items: list) -> list:
+        """Visit every element of a list, returning the list itself if none changed."""
+        new_items = [self.visit(item) for item in items]
+        if all(new is old for new, old in zip(new_items, items)):
+            return items
+        return new_items
+
+    def generic_visit(self, node):
+        """Visit the child nodes and return the node, or a copy with the new children."""
+        changes = {}
+        for field in getattr(type(node), "__slots__", ()):
+            if field in RUNTIME_FIELDS:
+                continue
+            value = getattr(node, field, None)
+            if isinstance(value, list) and field not in BLOCK_FIELDS:
+                new_value = self.visit_items(value)
+            elif isinstance(value, list) or hasattr(type(value), "__slots__"):
+                new_value = self.visit(value)
+            else:
+                continue
+            if new_value is not value:
+                changes[field] = new_value
+        if not changes:
+            return node
+        node = copy.copy(node)
+        for field, value in changes.items():
+            setattr(node, field, value)
+        # State the backends attached to the original belongs to its old children.
+        for field in RUNTIME_FIELDS:
+            if hasattr(node, field):
+                setattr(node, field, None)
+        return node
+
+
+class ConstantFolding(NodeTransformer):
+    """Replaces operations on literals with their result."""
+
+    name = "constant-folding"
+
+    def visit_BinOp(self, node: BinOp):
+        """Fold a BinOp whose operands are literals after folding."""
+        node = self.generic_visit(node)
+        if not (is_constant(node.left) and is_constant(node.right)):
+            return node
+        try:
+            # The tree walker computes the value, so folding cannot change semantics.
+            value = Evaluator().eval(node)
+        except Exception:
+            # e.g. "Division by zero": keep the node so the error happens at run time.
+            return node
+        if isinstance(value, (str, Rope)):
+            # A long concatenation evaluates to a rope, which must not end up in a literal.
+            return node if len(value) > MAX_FOLDED_STRING else String(flatten(value))
+        return Number(value)
+
+
+class DeadCodeElimination(NodeTransformer):
+    """Removes branches and loops that can never run, and literal statements that do nothing."""
+
+    name = "dead-code-elimination"
+
+    def visit_IfStmt(self, node: IfStmt):
+        """Replace an if with a constant condition by the branch that runs."""
+        node = self.generic_visit(node)
+        if not is_constant(node.condition):
+            return node
+        if node.condition.value:
+            return node.then_block
+        # A missing else is an empty block: both evaluate to None.
+        return node.else_block or []
+
+    def visit_WhileStmt(self, node: WhileStmt):
+        """Remove a loop whose condition is a false constant."""
+        node = self.generic_visit(node)
+        if is_constant(node.condition) and not node.condition.value:
+            return []
+        return node
+
+    def visit_ForStmt(self, node: ForStmt):
+        """Remove a loop whose constant bounds count through no values."""
+        node = self.generic_visit(node)
+        bounds = [node.start, node.end] + ([] if node.step is None else [node.step])
+        if all(type(bound) is Number and type(bound.value) is int for bound in bounds):
+            step = 1 if node.step is None else node.step.value
+            # A zero step is left for the loop to report at run time.
+            if step != 0 and not range(node.start.value, node.end.value, step):
+                return []
+        return node
+
+    def visit_list(self, node: list) -> list:
+        """
+        Splice nested blocks into their parent (blocks do not open a scope) and drop
+        statements that have no effect. The last statement is kept whenever its value
+        could be the value of the block.
+        """
+        stmts = super().visit_list(node)
+        result = []
+        last = len(stmts) - 1
+        for index, stmt in enumerate(stmts):
+            if isinstance(stmt, list):
+                if stmt or index != last:
+                    result.extend(stmt)
+                else:
+                    result.append(stmt)  # An empty last block keeps the value None.
+            elif is_constant(stmt) and index != last:
+                continue
+            else:
+                result.append(stmt)
+        if len(result) == len(node) and all(new is old for new, old in zip(result, node)):
+            return node
+        return result
+
+
+class AlgebraicSimplification(NodeTransformer):
+    """Applies the identities x * 1, 1 * x, x + 0, 0 + x and x - 0."""
+
+    name = "algebraic-simplification"
+
+    def visit_BinOp(self, node: BinOp):
+        """Simplify a BinOp with a neutral operand."""
+        node = self.generic_visit(node)
+        left, op, right = node.left, node.op, node.right
+        if op == "*":
+            if self.is_literal(right, 1) and self.is_numeric(left):
+                return left
+            if self.is_literal(left, 1) and self.is_numeric(right):
+                return right
+        elif op in ("+", "-"):
+            if self.is_literal(right, 0) and self.is_numeric(left):
+                return left
+            if op == "+" and self.is_literal(left, 0) and self.is_numeric(right):
+                return right
+        return node
+
+    @staticmethod
+    def is_literal(node, value) -> bool:
+        """Return True if a node is the integer literal `value`."""
+        return type(node) is Number and type(node.value) is int and node.value == value
+
+    @classmethod
+    def is_numeric(cls, node) -> bool:
+        """Return True for operands statically known to be numbers: numeric literals and arithmetic on them."""
+        if type(node) is Number:
+            return type(node.value) in (int, float)
+        if type(node) is BinOp and node.op in ARITHMETIC_OPERATORS:
+            return cls.is_numeric(node.left) and cls.is_numeric(node.right)
+        return False
+
+
+class PassManager:
+    """Runs a sequence of passes over a program."""
+
+    def __init__(self, passes=()):
+        """Initialize the manager with a list of passes."""
+        self.passes = list(passes)
+
+    def add(self, optimization_pass):
+        """Append a pass; it runs after the ones already added."""
+        self.passes.append(optimization_pass)
+        return self
+
+    def run(self, statements: list) -> list:
+        """Run every pass in order and return the optimised statements."""
+        for optimization_pass in self.passes:
+            statements = optimization_pass.run(statements)
+        return statements
+
+    @classmethod
+    def for_level(cls, level: int) -> "PassManager":
+        """Build the standard pipeline of an optimisation level."""
+        if level not in OPT_LEVELS:
+            raise ValueError(f"Unknown optimisation level {level}")
+        manager = cls()
+        if level >= 1:
+            manager.add(ConstantFolding())
+        if level >= 2:
+            # Runs after folding so literal operands are already combined.
+            manager.add(AlgebraicSimplification())
+        if level >= 1:
+            manager.add(DeadCodeElimination())
+        return manager
+
+
+def optimize(statements: list, level: int = DEFAULT_OPT_LEVEL) -> list:
+    """Optimise a list of top-level statements at the given level."""
+    return PassManager.for_level(level).run(statements)
@@ -3,49 +3,117 @@ from Interpreter.ast_nodes import (
     Variable,
     String,
     BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
     Assign,
+    IndexAssign,
     IfStmt,
     WhileStmt,
+    ForStmt,
     FunctionDef,
     FunctionCall,
 )
-from Interpreter.lexer import lex, Token, NUMBER, SYMBOL, IDENT, STRING
+from typing import Iterable, Iterator
+from Interpreter.lexer import (
+    lex,
+    iter_lex,
+    Token,
+    NUMBER,
+    SYMBOL,
+    IDENT,
+    STRING,
+    KW_IF,
+    KW_ELSE,
+    KW_WHILE,
+    KW_DEF,
+    KW_SUP,
+    KW_FOR,
+    TOKEN_NAMES,
+)
+
+# Binding power of every binary operator: the higher the power, the tighter the
+# operator binds. Adding an operator only takes a new entry here.
+BINARY_OPERATORS = {
+    "==": 10,
+    "!=": 10,
+    ">": 20,
+    "<": 20,
+    ">=": 20,
+    "<=": 20,
+    "+": 30,
+    "-": 30,
+    "*": 40,
+    "/": 40,
+}
 
 
 class Parser:
     """Parses a sequence of tokens into an Abstract Syntax Tree (AST)."""
 
-    def __init__(self, tokens: list[Token]):
-        """Initializes the parser with a list of tokens."""
-        self.tokens, self.pos = tokens, 0
+    def __init__(self, tokens: list[Token] | Iterable[Token]):
+        """
+        Initializes the parser with a list of tokens, or with any iterable of tokens
+        (e.g. from `iter_lex`), which is then consumed lazily.
+        """
+        if isinstance(tokens, list):
+            self.tokens, self.stream = tokens, None
+        else:
+            self.tokens, self.stream = [], iter(tokens)
+        self.pos = 0
 
-    def peek(self):
-        """Returns the current token without consuming it."""
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+    def peek(self, offset: int = 0):
+        """Returns the token `offset` positions ahead without consuming it."""
+        index = self.pos + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        # Pull tokens from the stream only as far as the lookahead requires.
+        while index >= len(self.tokens) and self.stream is not None:
+            token = next(self.stream, None)
+            if token is None:
+                self.stream = None
+            else:
+                self.tokens.append(token)
+        return self.tokens[index] if index < len(self.tokens) else None
 
     def consume(self, expected_type=None, expected_value=None):
         """Consumes the next token if it matches the expected type and value."""
         token = self.peek()
         if token is None:
             raise SyntaxError(
-                f"Unexpected end of input, expected {expected_type or ''} {expected_value or ''}"
+                f"Unexpected end of input, expected {TOKEN_NAMES.get(expected_type, '')} {expected_value or ''}"
             )
         if expected_value and token.value != expected_value:
             raise SyntaxError(f"Expected '{expected_value}', got '{token.value}'")
         if expected_type and token.type != expected_type:
-            raise SyntaxError(f"Expected type '{expected_type}', got '{token.type}'")
+            raise SyntaxError(
+                f"Expected type '{TOKEN_NAMES[expected_type]}', got '{TOKEN_NAMES[token.type]}'"
+            )
         self.pos += 1
         return token
 
     def parse_factor(self):
         """
-        Parses the highest-precedence expressions:
+        Parses the highest-precedence expressions, followed by any number of
+        indexes (`[expression]`):
         - A numeric literal
         - A string literal (NEW)
+        - An array, list or dictionary literal
         - A variable identifier
         - A parenthesized sub-expression
         - A function call
         """
+        node = self.parse_primary()
+        while self.peek() and self.peek().type == SYMBOL and self.peek().value == "[":
+            self.consume(SYMBOL, "[")
+            index = self.parse_expression()
+            self.consume(SYMBOL, "]")
+            node = Index(node, index)
+        return node
+
+    def parse_primary(self):
+        """Parses a factor without its indexes."""
         token = self.peek()
         if token is None:
             raise SyntaxError("Unexpected end of input, expected a factor.")
@@ -56,10 +124,7 @@ class Parser:
             return String(token.value)
 
         if token.type == IDENT:
-            if (
-                self.pos + 1 < len(self.tokens)
-                and self.tokens[self.pos + 1].value == "("
-            ):
+            if self.peek(1) and self.peek(1).value == "(":
                 return self.parse_function_call()
             self.consume(IDENT)
             return Variable(token.value)
@@ -74,88 +139,87 @@ class Parser:
             self.consume(SYMBOL, ")")
             return node
 
+        if token.type == SYMBOL and token.value == "@":
+            self.consume(SYMBOL, "@")
+            return ArrayLiteral(self.parse_sequence("[", "]"))
+
+        if token.type == SYMBOL and token.value == "[":
+            return ListLiteral(self.parse_sequence("[", "]"))
+
+        # A `{` that starts a statement is a block (see parse_statement); here it is a dictionary.
+        if token.type == SYMBOL and token.value == "{":
+            return self.parse_dict()
+
         raise SyntaxError(f"Unexpected token in expression: {token}")
 
     def parse_function_call(self):
         """Parses a function call expression."""
         name = self.consume(IDENT).value
-        self.consume(SYMBOL, "(")
-        args: list = []
+        return FunctionCall(name, self.parse_sequence("(", ")"))
+
+    def parse_dict(self):
+        """Parses a dictionary literal: `key: value` pairs separated by commas, between braces."""
+        self.consume(SYMBOL, "{")
+        keys: list = []
+        values: list = []
         if not (
-            self.peek() and self.peek().type == SYMBOL and self.peek().value == ")"
+            self.peek() and self.peek().type == SYMBOL and self.peek().value == "}"
         ):
             while True:
-                args.append(self.parse_expression())
+                keys.append(self.parse_expression())
+                self.consume(SYMBOL, ":")
+                values.append(self.parse_expression())
                 if self.peek() and self.peek().value == ",":
                     self.consume(SYMBOL, ",")
                 else:
                     break
-        self.consume(SYMBOL, ")")
-        return FunctionCall(name, args)
-
-    def parse_term(self):
-        """Parses a term, which consists of factors combined by multiplication or division."""
-        node = self.parse_factor()
-        while True:
-            token = self.peek()
-            if token and token.type == SYMBOL and token.value in ("*", "/"):
-                op, _ = token.value, self.consume(SYMBOL)
-                right = self.parse_factor()
-                node = BinOp(left=node, op=op, right=right)
-            else:
-                break
-        return node
+        self.consume(SYMBOL, "}")
+        return DictLiteral(keys, values)
 
-    def parse_additive_expr(self):
-        """Parses an additive expression, which consists of terms combined by addition or subtraction."""
-        node = self.parse_term()
-        while True:
-            token = self.peek()
-            if token and token.type == SYMBOL and token.value in ("+", "-"):
-                op, _ = token.value, self.consume(SYMBOL)
-                right = self.parse_term()
-                node = BinOp(left=node, op=op, right=right)
-            else:
-                break
-        return node
+    def parse_sequence(self, opening: str, closing: str) -> list:
+        """Parses a comma-separated list of expressions between two symbols."""
+        self.consume(SYMBOL, opening)
+        items: list = []
+        if not (
+            self.peek() and self.peek().type == SYMBOL and self.peek().value == closing
+        ):
+            while True:
+                items.append(self.parse_expression())
+                if self.peek() and self.peek().value == ",":
+                    self.consume(SYMBOL, ",")
+                else:
+                    break
+        self.consume(SYMBOL, closing)
+        return items
 
-    def parse_comparison_expr(self):
-        """Parses a comparison expression, which consists of additive expressions combined by comparison operators."""
-        node = self.parse_additive_expr()
+    def parse_expression(self, min_power: int = 0):
+        """
+        Parses a whole expression by precedence climbing (Pratt parsing).
+        Only operators that bind tighter than `min_power` are consumed here, so a
+        literal costs a single call to `parse_factor` whatever the number of levels.
+        """
+        node = self.parse_factor()
         while True:
             token = self.peek()
-            if token and token.type == SYMBOL and token.value in (">", "<", ">=", "<="):
-                op, _ = token.value, self.consume(SYMBOL)
-                right = self.parse_additive_expr()
-                node = BinOp(left=node, op=op, right=right)
-            else:
+            if token is None or token.type != SYMBOL:
                 break
-        return node
-
-    def parse_equality_expr(self):
-        """Parses an equality expression, which consists of comparison expressions combined by equality operators."""
-        node = self.parse_comparison_expr()
-        while True:
-            token = self.peek()
-            if token and token.type == SYMBOL and token.value in ("==", "!="):
-                op, _ = token.value, self.consume(SYMBOL)
-                right = self.parse_comparison_expr()
-                node = BinOp(left=node, op=op, right=right)
-            else:
+            power = BINARY_OPERATORS.get(token.value)
+            if power is None or power <= min_power:
                 break
+            self.consume(SYMBOL)
+            # Parsing the right side at the operator's own power makes it left-associative.
+            right = self.parse_expression(power)
+            node = BinOp(left=node, op=token.value, right=right)
         return node
 
-    def parse_expression(self):
-        """Parses a whole expression."""
-        return self.parse_equality_expr()
-
     def parse_statement(self):
         """Parses a statement, which can be an expression, an assignment, a control flow statement, or a block."""
         token = self.peek()
         if token is None:
             return None
 
-        if token.type == IDENT and token.value == "if":
+        kind = token.kind
+        if kind == KW_IF:
             self.consume(IDENT, "if")
             self.consume(SYMBOL, "(")
             cond = self.parse_expression()
@@ -164,14 +228,13 @@ class Parser:
             else_block = None
             if (
                 self.peek()
-                and self.peek().type == IDENT
-                and self.peek().value == "else"
+                and self.peek().kind == KW_ELSE
             ):
                 self.consume(IDENT, "else")
                 else_block = self.parse_block()
-            return IfStmt(cond, then_block, else_block)
+            return IfStmt(cond, then_block, else_block, token.line)
 
-        if token.type == IDENT and token.value == "sup":
+        if kind == KW_SUP:
             self.consume(IDENT, "sup")
             var_node = Variable(self.consume(IDENT).value)
             self.consume(SYMBOL, "=")
@@ -179,26 +242,38 @@ class Parser:
             self.consume(SYMBOL, ";")
             return Assign(var_node, expr)
 
-        if (
-            token.type == IDENT
-            and self.pos + 1 < len(self.tokens)
-            and self.tokens[self.pos + 1].value == "="
-        ):
+        if token.type == IDENT and self.peek(1) and self.peek(1).value == "=":
             var_node = Variable(self.consume(IDENT).value)
             self.consume(SYMBOL, "=")
             expr_node = self.parse_expression()
             self.consume(SYMBOL, ";")
             return Assign(var_node, expr_node)
 
-        if token.type == IDENT and token.value == "while":
+        if kind == KW_WHILE:
             self.consume(IDENT, "while")
             self.consume(SYMBOL, "(")
             cond = self.parse_expression()
             self.consume(SYMBOL, ")")
             body = self.parse_block()
-            return WhileStmt(cond, body)
+            return WhileStmt(cond, body, token.line)
+
+        if kind == KW_FOR:
+            self.consume(IDENT, "for")
+            self.consume(SYMBOL, "(")
+            var_node = Variable(self.consume(IDENT).value)
+            self.consume(IDENT, "in")
+            start = self.parse_expression()
+            self.consume(SYMBOL, ",")
+            end = self.parse_expression()
+            step = None
+            if self.peek() and self.peek().value == ",":
+                self.consume(SYMBOL, ",")
+                step = self.parse_expression()
+            self.consume(SYMBOL, ")")
+            body = self.parse_block()
+            return ForStmt(var_node, start, end, body, step, token.line)
 
-        if token.type == IDENT and token.value == "def":
+        if kind == KW_DEF:
             self.consume(IDENT, "def")
             name = self.consume(IDENT).value
             self.consume(SYMBOL, "(")
@@ -214,12 +289,18 @@ class Parser:
                         break
             self.consume(SYMBOL, ")")
             body = self.parse_block()
-            return FunctionDef(name, params, body)
+            return FunctionDef(name, params, body, token.line)
 
         if token.type == SYMBOL and token.value == "{":
             return self.parse_block()
 
         expr = self.parse_expression()
+        # An indexed expression followed by `=` assigns to an element: values[i] = x;
+        if isinstance(expr, Index) and self.peek() and self.peek().value == "=":
+            self.consume(SYMBOL, "=")
+            value = self.parse_expression()
+            self.consume(SYMBOL, ";")
+            return IndexAssign(expr.target, expr.index, value)
         self.consume(SYMBOL, ";")
         return expr
 
@@ -238,10 +319,18 @@ class Parser:
 
     def parse_program(self):
         """Parses a complete program, which is a sequence of statements."""
-        statements: list = []
+        return list(self.iter_statements())
+
+    def iter_statements(self) -> Iterator:
+        """Yields the top-level statements one by one, as soon as each is parsed."""
         while self.peek():
-            statements.append(self.parse_statement())
-        return [stmt for stmt in statements if stmt is not None]
+            statement = self.parse_statement()
+            if self.stream is not None:
+                # Forget the tokens of the finished statement so memory stays flat.
+                del self.tokens[: self.pos]
+                self.pos = 0
+            if statement is not None:
+                yield statement
 
 
 # This convenience function is now correct
@@ -250,3 +339,8 @@ def parse(input_str: str):
     tokens = lex(input_str)
     parser = Parser(tokens)
     return parser.parse_program()
+
+
+def iter_parse(source: str | Iterable[str]) -> Iterator:
+    """Lazily parses a string or an iterable of source chunks, one statement at a time."""
+    return Parser(iter_lex(source)).iter_statements()
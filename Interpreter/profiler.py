@@ -0,0 +1,277 @@
+"""
+Deterministic profiling of GB programs.
+The ProfilingEvaluator is a tree-walking evaluator that times every call it makes:
+for each GB function and native function it records the number of calls, the
+inclusive time (the whole call, callees included) and the exclusive time (the call
+minus its callees). It also counts how many times each `if`, `while` and `for`
+statement runs, and how many times its body runs. Functions and statements are
+reported with the source line the lexer gave them.
+
+Profiling is a separate evaluator: the plain Evaluator has no hooks, so programs
+that are not profiled run exactly as fast as before.
+
+A Profiler can be printed as a sorted text report, saved as JSON, or saved in the
+format of the standard `pstats` module (`python -m pstats out.pstats`).
+"""
+
+import json
+import marshal
+import time
+
+from Interpreter.ast_nodes import ForStmt, FunctionCall, FunctionDef, IfStmt, WhileStmt
+from Interpreter.evaluator import Evaluator, NativeFunction, counted_range
+
+SORT_KEYS = ("exclusive", "inclusive", "calls", "name")
+NATIVE_FILENAME = "~"  # Where cProfile puts built-in functions.
+
+
+class FunctionStats:
+    """Call counts and times of one GB or native function."""
+
+    __slots__ = ("name", "kind", "filename", "line", "calls", "inclusive", "exclusive", "callers", "active")
+
+    def __init__(self, name: str, kind: str, filename: str, line: int):
+        """Start the counters of a function of `kind` "gb" or "native" at zero."""
+        self.name = name
+        self.kind = kind
+        self.filename = filename
+        self.line = line
+        self.calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        # Maps the caller's stats (None for top-level code) -> [calls, exclusive, inclusive].
+        self.callers: dict = {}
+        self.active = 0  # Calls of this function in progress, so recursion is timed once.
+
+    @property
+    def key(self) -> tuple:
+        """The (filename, line, name) triple pstats identifies the function by."""
+        if self.kind == "native":
+            return (NATIVE_FILENAME, 0, f"<native function {self.name}>")
+        return (self.filename, self.line, self.name)
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "line": self.line,
+            "calls": self.calls,
+            "inclusive": self.inclusive,
+            "exclusive": self.exclusive,
+        }
+
+
+class NodeStats:
+    """Execution counts of one `if`, `while` or `for` statement."""
+
+    __slots__ = ("kind", "line", "count", "inner")
+
+    def __init__(self, kind: str, line: int):
+        """Start the counters of a statement of `kind` "if", "while" or "for" at zero."""
+        self.kind = kind
+        self.line = line
+        self.count = 0  # Times the statement ran.
+        self.inner = 0  # Loop iterations, or times the then-block of an if ran.
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dictionary."""
+        return {"kind": self.kind, "line": self.line, "count": self.count, "inner": self.inner}
+
+
+class Profiler:
+    """The function and statement counters of one or more profiled runs."""
+
+    def __init__(self, filename: str = "<gb>", clock=time.perf_counter):
+        """Create an empty profile of the program in `filename`, timed with `clock`."""
+        self.filename = filename
+        self.clock = clock
+        # Map id(node) -> (node, stats). The node is kept in the entry so its id
+        # cannot be reused while the entry is alive.
+        self.functions: dict = {}
+        self.nodes: dict = {}
+        self.stack: list = []  # One [stats, time spent in callees] pair per call in progress.
+        # The BinOp specialisation counters of an adaptive run (see adaptive.specialisation_stats).
+        self.specialisation: dict | None = None
+
+    def function_stats(self, func) -> FunctionStats:
+        """Return the counters of a FunctionDef or NativeFunction, creating them on first use."""
+        entry = self.functions.get(id(func))
+        if entry is None:
+            if isinstance(func, NativeFunction):
+                stats = FunctionStats(func.name, "native", NATIVE_FILENAME, 0)
+            else:
+                stats = FunctionStats(func.name, "gb", self.filename, func.line)
+            entry = self.functions[id(func)] = (func, stats)
+        return entry[1]
+
+    def node_stats(self, node, kind: str) -> NodeStats:
+        """Return the counters of a statement, creating them on first use."""
+        entry = self.nodes.get(id(node))
+        if entry is None:
+            entry = self.nodes[id(node)] = (node, NodeStats(kind, node.line))
+        return entry[1]
+
+    def call(self, stats: FunctionStats, function, *args):
+        """Call `function(*args)` and charge the time it takes to `stats`."""
+        stack = self.stack
+        caller = stack[-1][0] if stack else None
+        frame = [stats, 0.0]
+        stack.append(frame)
+        stats.active += 1
+        clock = self.clock
+        start = clock()
+        try:
+            return function(*args)
+        finally:
+            elapsed = clock() - start
+            stack.pop()
+            stats.active -= 1
+            exclusive = elapsed - frame[1]
+            # A recursive call is already inside the outermost call's inclusive time.
+            inclusive = 0.0 if stats.active else elapsed
+            stats.calls += 1
+            stats.exclusive += exclusive
+            stats.inclusive += inclusive
+            edge = stats.callers.get(caller)
+            if edge is None:
+                edge = stats.callers[caller] = [0, 0.0, 0.0]
+            edge[0] += 1
+            edge[1] += exclusive
+            edge[2] += inclusive
+            if stack:
+                stack[-1][1] += elapsed
+
+    # ----- Reports -----
+
+    def function_rows(self, sort: str = "exclusive") -> list[FunctionStats]:
+        """Return the counters of every called function, sorted by `sort` (see SORT_KEYS)."""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}', expected one of {', '.join(SORT_KEYS)}")
+        rows = [stats for _, stats in self.functions.values() if stats.calls]
+        if sort == "name":
+            return sorted(rows, key=lambda stats: (stats.name, stats.line))
+        return sorted(rows, key=lambda stats: getattr(stats, sort), reverse=True)
+
+    def node_rows(self) -> list[NodeStats]:
+        """Return the counters of every statement that ran, in source order."""
+        return sorted((stats for _, stats in self.nodes.values()), key=lambda stats: (stats.line, stats.kind))
+
+    def report(self, sort: str = "exclusive", limit: int | None = None) -> str:
+        """Return the profile as a text table, functions sorted by `sort`, then the statements."""
+        rows = self.function_rows(sort)
+        if limit is not None:
+            rows = rows[:limit]
+        lines = [f"{'calls':>9} {'exclusive s':>12} {'inclusive s':>12} {'per call ms':>12}  function"]
+        for stats in rows:
+            where = "native" if stats.kind == "native" else f"{stats.filename}:{stats.line}"
+            lines.append(
+                f"{stats.calls:>9,} {stats.exclusive:12.6f} {stats.inclusive:12.6f} "
+                f"{stats.inclusive / stats.calls * 1000:12.4f}  {stats.name} ({where})"
+            )
+        nodes = self.node_rows()
+        if nodes:
+            lines.append("")
+            lines.append(f"{'line':>9} {'statement':>9} {'runs':>12} {'body runs':>12}")
+            for stats in nodes:
+                lines.append(f"{stats.line:>9} {stats.kind:>9} {stats.count:>12,} {stats.inner:>12,}")
+        if self.specialisation is not None:
+            spec = self.specialisation
+            lines.append("")
+            lines.append(
+                f"specialisation rate {spec['specialisation_rate']:.1%}: {spec['specialised_sites']:,} of "
+                f"{spec['sites']:,} BinOp sites specialised, {spec['deopts']:,} deopts"
+            )
+        return "\n".join(lines)
+
+    def as_dict(self, sort: str = "exclusive") -> dict:
+        """Return the profile as JSON-compatible data."""
+        return {
+            "filename": self.filename,
+            "functions": [stats.as_dict() for stats in self.function_rows(sort)],
+            "statements": [stats.as_dict() for stats in self.node_rows()],
+            **({} if self.specialisation is None else {"specialisation": self.specialisation}),
+        }
+
+    def pstats_data(self) -> dict:
+        """Return the profile in the structure the `pstats` module loads (as cProfile writes it)."""
+        data = {}
+        for stats in self.function_rows("name"):
+            callers = {
+                caller.key: (edge[0], edge[0], edge[1], edge[2])
+                for caller, edge in stats.callers.items()
+                if caller is not None
+            }
+            data[stats.key] = (stats.calls, stats.calls, stats.exclusive, stats.inclusive, callers)
+        return data
+
+    def dump(self, path: str):
+        """Save the profile to `path`: JSON when it ends in ".json", pstats format otherwise."""
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(self.as_dict(), f, indent=2)
+        else:
+            with open(path, "wb") as f:
+                marshal.dump(self.pstats_data(), f)
+
+
+class ProfilingEvaluator(Evaluator):
+    """Tree-walking evaluator that records calls and statement counts in a Profiler."""
+
+    def __init__(self, env=None, profiler: Profiler | None = None):
+        """Initialize the evaluator with an environment and the profiler it shares with its callees."""
+        super().__init__(env)
+        self.profiler = profiler if profiler is not None else Profiler()
+
+    def spawn(self, env):
+        """Create the evaluator for a function body, recording into the same profiler."""
+        return type(self)(env, self.profiler)
+
+    def eval_FunctionCall(self, node: FunctionCall):
+        """Evaluate a Function Call node, timing the call."""
+        func = self.resolve_function(node)
+        args = [self.eval(arg) for arg in node.args]
+        if isinstance(func, FunctionDef):
+            stats = self.profiler.function_stats(func)
+            return self.profiler.call(stats, self.call_function, node, func, args)
+        elif isinstance(func, NativeFunction):
+            stats = self.profiler.function_stats(func)
+            return self.profiler.call(stats, func.py_callable, *args)
+        else:
+            raise TypeError(f"'{node.name}' is not a function")
+
+    def eval_IfStmt(self, node: IfStmt):
+        """Evaluate an IfStmt node, counting how often it runs and takes its then-block."""
+        stats = self.profiler.node_stats(node, "if")
+        stats.count += 1
+        if self.eval(node.condition):
+            stats.inner += 1
+            return self.eval(node.then_block)
+        elif node.else_block:
+            return self.eval(node.else_block)
+        return None
+
+    def eval_WhileStmt(self, node: WhileStmt):
+        """Evaluate a WhileStmt node, counting how often it runs and iterates."""
+        stats = self.profiler.node_stats(node, "while")
+        stats.count += 1
+        result = None
+        while self.eval(node.condition):
+            stats.inner += 1
+            result = self.eval(node.body)
+        return result
+
+    def eval_ForStmt(self, node: ForStmt):
+        """Evaluate a ForStmt node, counting how often it runs and iterates."""
+        stats = self.profiler.node_stats(node, "for")
+        stats.count += 1
+        start = self.eval(node.start)
+        end = self.eval(node.end)
+        step = 1 if node.step is None else self.eval(node.step)
+        env, name, body = self.env, node.var.name, node.body
+        result = None
+        for value in counted_range(start, end, step):
+            env[name] = value
+            stats.inner += 1
+            result = self.eval(body)
+        return result
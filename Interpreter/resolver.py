@@ -0,0 +1,268 @@
+"""
+Lexical address resolution and array-backed call frames.
+The Resolver gives every local name of a function (its parameters, assigned names,
+loop variables and nested function names) a slot number, and annotates each Variable, Assign and
+FunctionCall of the body with an address. The FrameEvaluator then keeps locals in a
+fixed-size list per call instead of a fresh Environment dict.
+
+GB functions see their caller's variables (a function's outer scope is the scope
+it is called from), so a name that is not local to a function has no static
+address: it is looked up by name through the calling frames, then the globals.
+"""
+
+from Interpreter.ast_nodes import (
+    Variable,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    Assign,
+    IndexAssign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+)
+from Interpreter.evaluator import Evaluator, NativeFunction, counted_range
+
+
+class _Unset:
+    """Marker for a local slot that has not been assigned yet in this call."""
+
+    def __repr__(self):
+        """Represent the marker in a readable format."""
+        return "<unset>"
+
+
+UNSET = _Unset()
+
+
+class FrameLayout:
+    """Maps the local names of one function to slot indexes."""
+
+    __slots__ = ("names", "slots", "size", "params_are_slots")
+
+    def __init__(self, params: list, names: list):
+        """Build the slot table; parameters take the first slots in order."""
+        self.slots: dict[str, int] = {}
+        for name in list(params) + list(names):
+            self.slots.setdefault(name, len(self.slots))
+        self.names = tuple(self.slots)
+        self.size = len(self.names)
+        # True when parameter i lives in slot i (no repeated parameter names).
+        self.params_are_slots = len(set(params)) == len(params)
+
+    def __repr__(self):
+        """Represent the layout in a readable format."""
+        return f"FrameLayout({list(self.names)})"
+
+
+class Frame:
+    """The locals of one GB function call."""
+
+    __slots__ = ("values", "layout", "caller")
+
+    def __init__(self, values: list, layout: FrameLayout, caller):
+        """Store the slot values, the layout and the calling frame (None for globals)."""
+        self.values = values
+        self.layout = layout
+        self.caller = caller
+
+
+class Resolver:
+    """Assigns slots to the locals of function bodies and annotates their nodes."""
+
+    def __init__(self):
+        """Initialize the resolver with the set of names that are local somewhere."""
+        # Names bound as a local in any resolved function. A free name outside this
+        # set can never be found in a calling frame, so it goes straight to globals.
+        self.local_names: set[str] = set()
+
+    def resolve_function(self, func: FunctionDef) -> FrameLayout:
+        """Build the frame layout of a function and annotate its body."""
+        assigned: list[str] = []
+        self.collect(func.body, assigned)
+        layout = FrameLayout(func.params, assigned)
+        self.local_names.update(layout.names)
+        self.annotate(func.body, layout)
+        return layout
+
+    def collect(self, node, names: list):
+        """Collect the names a statement binds in the current function."""
+        if isinstance(node, list):
+            for stmt in node:
+                self.collect(stmt, names)
+        elif isinstance(node, Assign):
+            names.append(node.name.name)
+        elif isinstance(node, FunctionDef):
+            # The nested function's name is local; its body is resolved on its own.
+            names.append(node.name)
+        elif isinstance(node, IfStmt):
+            self.collect(node.then_block, names)
+            self.collect(node.else_block or [], names)
+        elif isinstance(node, WhileStmt):
+            self.collect(node.body, names)
+        elif isinstance(node, ForStmt):
+            names.append(node.var.name)
+            self.collect(node.body, names)
+
+    def annotate(self, node, layout: FrameLayout):
+        """Set `address` on the name-bearing nodes below `node`."""
+        if isinstance(node, list):
+            for stmt in node:
+                self.annotate(stmt, layout)
+        elif isinstance(node, Variable):
+            node.address = self.address(node.name, layout)
+        elif isinstance(node, Assign):
+            node.address = self.address(node.name.name, layout)
+            self.annotate(node.value, layout)
+        elif isinstance(node, FunctionCall):
+            node.address = self.address(node.name, layout)
+            for arg in node.args:
+                self.annotate(arg, layout)
+        elif isinstance(node, BinOp):
+            self.annotate(node.left, layout)
+            self.annotate(node.right, layout)
+        elif isinstance(node, ArrayLiteral):
+            for element in node.elements:
+                self.annotate(element, layout)
+        elif isinstance(node, ListLiteral):
+            for element in node.elements:
+                self.annotate(element, layout)
+        elif isinstance(node, DictLiteral):
+            self.annotate(node.keys, layout)
+            self.annotate(node.values, layout)
+        elif isinstance(node, Index):
+            self.annotate(node.target, layout)
+            self.annotate(node.index, layout)
+        elif isinstance(node, IndexAssign):
+            self.annotate(node.target, layout)
+            self.annotate(node.index, layout)
+            self.annotate(node.value, layout)
+        elif isinstance(node, IfStmt):
+            self.annotate(node.condition, layout)
+            self.annotate(node.then_block, layout)
+            self.annotate(node.else_block or [], layout)
+        elif isinstance(node, WhileStmt):
+            self.annotate(node.condition, layout)
+            self.annotate(node.body, layout)
+        elif isinstance(node, ForStmt):
+            self.annotate(node.var, layout)
+            self.annotate(node.start, layout)
+            self.annotate(node.end, layout)
+            if node.step is not None:
+                self.annotate(node.step, layout)
+            self.annotate(node.body, layout)
+
+    def address(self, name: str, layout: FrameLayout):
+        """Return (depth, slot) for a local name, or None for a name found dynamically."""
+        slot = layout.slots.get(name)
+        return None if slot is None else (0, slot)
+
+
+class FrameEvaluator(Evaluator):
+    """Evaluator that keeps function locals in array-backed frames."""
+
+    def __init__(self, env=None, resolver=None):
+        """Initialize the evaluator with the global environment and a resolver."""
+        super().__init__(env)
+        self.resolver = resolver if resolver is not None else Resolver()
+        self.frame = None  # None while running top-level code.
+        self.calls = 0  # GB calls made: they allocate Frames, not Environments.
+
+    def layout_for(self, func: FunctionDef) -> FrameLayout:
+        """Return the layout of a function, resolving it on first call."""
+        # Kept on the node, so it is freed with the function rather than piling up in the evaluator.
+        layout = func.layout
+        if layout is None:
+            layout = func.layout = self.resolver.resolve_function(func)
+        return layout
+
+    def lookup(self, name: str, address):
+        """Read a name from the current frame, the calling frames, then the globals."""
+        frame = self.frame
+        if address is not None:
+            value = frame.values[address[1]]
+            if value is not UNSET:
+                return value
+            frame = frame.caller
+        if name in self.resolver.local_names:
+            while frame is not None:
+                slot = frame.layout.slots.get(name)
+                if slot is not None and frame.values[slot] is not UNSET:
+                    return frame.values[slot]
+                frame = frame.caller
+        return self.env[name]
+
+    def eval_Variable(self, node: Variable):
+        """Evaluate a Variable node."""
+        if self.frame is None:
+            return self.env[node.name]
+        return self.lookup(node.name, node.address)
+
+    def eval_Assign(self, node: Assign):
+        """Evaluate an Assign node."""
+        value = self.eval(node.value)
+        if self.frame is None:
+            self.env[node.name.name] = value
+        else:
+            self.frame.values[node.address[1]] = value
+        return None
+
+    def eval_ForStmt(self, node: ForStmt):
+        """Evaluate a ForStmt node, storing the loop variable in its slot."""
+        if self.frame is None:
+            return super().eval_ForStmt(node)
+        start = self.eval(node.start)
+        end = self.eval(node.end)
+        step = 1 if node.step is None else self.eval(node.step)
+        values, slot, body = self.frame.values, node.var.address[1], node.body
+        result = None
+        for value in counted_range(start, end, step):
+            values[slot] = value
+            result = self.eval(body)
+        return result
+
+    def eval_FunctionDef(self, node: FunctionDef):
+        """Evaluate a Function Definition node."""
+        if self.frame is None:
+            self.env[node.name] = node
+        else:
+            self.frame.values[self.frame.layout.slots[node.name]] = node
+        return None
+
+    def eval_FunctionCall(self, node: FunctionCall):
+        """Evaluate a Function Call node without allocating an Environment or Evaluator."""
+        if self.frame is None:
+            func = self.env[node.name]
+        else:
+            func = self.lookup(node.name, node.address)
+        args = [self.eval(arg) for arg in node.args]
+
+        if isinstance(func, FunctionDef):
+            if len(args) != len(func.params):
+                raise TypeError(
+                    f"Function '{node.name}' expects {len(func.params)} arguments, but got {len(args)}"
+                )
+            layout = self.layout_for(func)
+            if layout.params_are_slots:
+                values = args + [UNSET] * (layout.size - len(args))
+            else:
+                values = [UNSET] * layout.size
+                for name, val in zip(func.params, args):
+                    values[layout.slots[name]] = val
+            caller = self.frame
+            self.frame = Frame(values, layout, caller)
+            self.calls += 1
+            try:
+                return self.eval(func.body)
+            finally:
+                self.frame = caller
+
+        elif isinstance(func, NativeFunction):
+            return func.py_callable(*args)
+
+        else:
+            raise TypeError(f"'{node.name}' is not a function")
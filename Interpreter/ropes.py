@@ -0,0 +1,148 @@
+"""
+Lazy string concatenation for GB.
+`s = s + "..."` in a loop copies the whole of `s` on every iteration when strings
+are concatenated eagerly, so building a string of n characters costs O(n²). Instead,
+GB `+` on two strings whose result is at least MIN_ROPE_LENGTH characters long
+returns a Rope: the list of pieces the string is made of, joined only when the text
+is needed.
+
+A Rope is an immutable value, but ropes share their piece lists: appending to a rope
+that is the longest view of its list appends to the list in place and returns a new
+rope that sees one more piece. Appending to an older view copies the piece pointers
+it sees first. Repeated appends therefore cost O(1) amortised, and the characters
+are copied once, when the rope is flattened.
+
+A rope is flattened (joined into a str, which it then keeps) when it is compared,
+hashed, printed or repeated with `*`, and when it is passed to a native function or
+returned to Python by the REPL. Its pieces are always strings, so a rope has a
+depth of one and flattening it never recurses.
+"""
+
+# Concatenations with a shorter result are plain copies: they are cheap, and a str is smaller than a rope.
+MIN_ROPE_LENGTH = 1024
+
+
+def concat(left: str, right):
+    """Concatenate a str and a GB value, building a rope when the result is long."""
+    if type(right) is str:
+        length = len(left) + len(right)
+        if length < MIN_ROPE_LENGTH:
+            return left + right
+        return Rope([left, right], 2, length)
+    # A Rope on the right is handled by Rope.__radd__; anything else raises Python's TypeError.
+    return left + right
+
+
+def flatten(value):
+    """Return the str of a rope, or any other value unchanged."""
+    return value.flatten() if type(value) is Rope else value
+
+
+def _text(value):
+    """Return the str of a str or a rope, or None for any other value."""
+    if type(value) is str:
+        return value
+    if type(value) is Rope:
+        return value.flatten()
+    return None
+
+
+class Rope:
+    """A string built by concatenation: the first `count` strings of `parts`."""
+
+    __slots__ = ("parts", "count", "length")
+
+    def __init__(self, parts: list, count: int, length: int):
+        """Wrap the first `count` pieces of `parts`, which hold `length` characters in total."""
+        self.parts = parts
+        self.count = count
+        self.length = length
+
+    def flatten(self) -> str:
+        """Join the pieces into a str, and keep that str as the rope's only piece."""
+        if self.count == 1:
+            return self.parts[0]
+        parts = self.parts
+        text = "".join(parts if len(parts) == self.count else parts[: self.count])
+        # Other ropes may still see the old list, so it is replaced rather than modified.
+        self.parts, self.count = [text], 1
+        return text
+
+    def _append(self, piece: str) -> "Rope":
+        """Return a new rope with `piece` added at the end."""
+        parts = self.parts
+        if len(parts) != self.count:
+            # A longer rope already extends the shared list: copy the pieces this one sees.
+            parts = parts[: self.count]
+        parts.append(piece)
+        return Rope(parts, self.count + 1, self.length + len(piece))
+
+    def __add__(self, other):
+        """Concatenate a str or a rope at the end."""
+        text = _text(other)
+        if text is None:
+            raise TypeError(f'can only concatenate str (not "{type(other).__name__}") to str')
+        return self._append(text)
+
+    def __radd__(self, other):
+        """Concatenate a str at the start (the rope is on the right of `+`)."""
+        if type(other) is not str:
+            raise TypeError(f"unsupported operand type(s) for +: '{type(other).__name__}' and 'str'")
+        return Rope([other, *self.parts[: self.count]], self.count + 1, self.length + len(other))
+
+    def __mul__(self, times):
+        """Repeat the string, like str * int."""
+        return self.flatten() * times
+
+    __rmul__ = __mul__
+
+    def __len__(self):
+        """Return the number of characters, without flattening."""
+        return self.length
+
+    def __bool__(self):
+        """A rope is true when it is not empty, like a str."""
+        return self.length > 0
+
+    def __str__(self):
+        """Return the text of the rope."""
+        return self.flatten()
+
+    def __repr__(self):
+        """Represent the rope as the str it stands for."""
+        return repr(self.flatten())
+
+    def __hash__(self):
+        """Hash like the str the rope stands for, so it can be compared with strs in sets and dicts."""
+        return hash(self.flatten())
+
+    def _compare(self, other, compare):
+        """Compare the text of the rope with a str or another rope."""
+        text = _text(other)
+        if text is None:
+            return NotImplemented
+        return compare(self.flatten(), text)
+
+    def __eq__(self, other):
+        """Compare for equality with a str or a rope."""
+        return self._compare(other, str.__eq__)
+
+    def __ne__(self, other):
+        """Compare for inequality with a str or a rope."""
+        return self._compare(other, str.__ne__)
+
+    def __lt__(self, other):
+        """Order the rope before a str or a rope."""
+        return self._compare(other, str.__lt__)
+
+    def __le__(self, other):
+        """Order the rope before or equal to a str or a rope."""
+        return self._compare(other, str.__le__)
+
+    def __gt__(self, other):
+        """Order the rope after a str or a rope."""
+        return self._compare(other, str.__gt__)
+
+    def __ge__(self, other):
+        """Order the rope after or equal to a str or a rope."""
+        return self._compare(other, str.__ge__)
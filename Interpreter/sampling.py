@@ -0,0 +1,109 @@
+"""
+Sampling profiler for GB programs.
+A Sampler thread wakes up every `interval` seconds, looks at the Python stack of
+the thread running the program, and rebuilds the GB call stack from it: every
+GB call in progress on the tree-walking backends is a frame of
+Evaluator.call_function, whose `func` local is the FunctionDef being run. The
+evaluator is not changed at all, so the cost of the profile is set by the
+sampling rate, not by the number of calls.
+
+The counts are written as collapsed stacks, one line per distinct stack:
+
+    <program>;main;fib;fib 42
+
+which is the input format of flamegraph tools (flamegraph.pl, speedscope, inferno).
+"""
+
+import sys
+import threading
+from collections import Counter
+
+from Interpreter.evaluator import Evaluator
+
+DEFAULT_INTERVAL = 0.005  # Seconds between samples (200 per second).
+ROOT_FRAME = "<program>"  # The frame every stack starts with: top-level code.
+
+# The Python code of a GB call. Evaluator subclasses that override call_function
+# (memoisation) still run the body through this one, so each call is seen once.
+CALL_CODE = Evaluator.call_function.__code__
+
+
+def gb_stack(frame) -> tuple[str, ...]:
+    """Return the names of the GB functions being called in a Python stack, outermost first."""
+    names = []
+    while frame is not None:
+        if frame.f_code is CALL_CODE:
+            names.append(frame.f_locals["func"].name)
+        frame = frame.f_back
+    names.reverse()
+    return tuple(names)
+
+
+class Sampler:
+    """Periodically samples the GB call stack of one thread from a background thread."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        """Create a stopped sampler that takes a sample every `interval` seconds."""
+        if interval <= 0:
+            raise ValueError("The sampling interval must be positive")
+        self.interval = interval
+        self.counts: Counter = Counter()  # Maps a stack (tuple of names) -> samples.
+        self.thread_id = None  # The sampled thread: the one that called start().
+        self._thread = None
+        self._stopped = threading.Event()
+        self._users = 0  # Nested start() calls; the thread stops with the last stop().
+
+    def sample(self):
+        """Count the current GB call stack of the sampled thread once."""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is not None:
+            self.counts[gb_stack(frame)] += 1
+
+    def _run(self):
+        """Take samples until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        """Start sampling the calling thread from a daemon thread (nested starts share it)."""
+        self._users += 1
+        if self._thread is None:
+            self.thread_id = threading.get_ident()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="gb-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop sampling once every start() has been matched."""
+        self._users -= 1
+        if self._users == 0 and self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        """Start sampling for the duration of a `with` block."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop sampling at the end of a `with` block."""
+        self.stop()
+
+    @property
+    def total(self) -> int:
+        """The number of samples taken."""
+        return sum(self.counts.values())
+
+    def collapsed(self) -> str:
+        """Return the samples as collapsed stacks, the most frequent stack first."""
+        lines = [
+            ";".join((ROOT_FRAME, *stack)) + f" {count}"
+            for stack, count in self.counts.most_common()
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write(self, path: str):
+        """Write the collapsed stacks to a file."""
+        with open(path, "w") as f:
+            f.write(self.collapsed())
@@ -0,0 +1,304 @@
+"""
+Evaluator that keeps all pending work on an explicit stack instead of the Python stack.
+Every node is evaluated by a generator ("step"). A step yields `(node, env)` to ask
+for the value of a child, and receives it as the result of the yield. A step that
+ends by evaluating one more node yields `TailEval(node, env)` instead: the driver
+replaces the step with the child rather than stacking it, so the value of the
+child becomes the value of the step directly.
+
+Blocks, if-branches and function bodies all end that way, so a GB call in tail
+position (the last statement of a function body) does not grow the stack at all,
+and any other call costs one suspended generator per pending node. Recursion depth
+is bounded by `memory_limit`, not by `sys.getrecursionlimit()`.
+
+The budget counts pending steps only. A function's environment is chained to its
+caller's, so the Environments of a run of tail calls stay alive until the run
+returns, but they are not counted: a tail-recursive loop is bounded by the memory
+of the process, not by `memory_limit`.
+"""
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    Assign,
+    IndexAssign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+)
+from Interpreter.arrays import GBArray
+from Interpreter.containers import get_item, set_item
+from Interpreter.evaluator import (
+    Environment,
+    Evaluator,
+    NativeFunction,
+    counted_range,
+)
+from Interpreter.flat_ast import OPERATORS, OPERATOR_FUNCTIONS
+
+BINARY_FUNCTIONS = dict(zip(OPERATORS, OPERATOR_FUNCTIONS))
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+# Approximate memory held by one pending step: the suspended generator and its frame,
+# plus the Environment of the call it belongs to (about 840 bytes measured for a
+# non-tail recursive call).
+STEP_BYTES = 1024
+
+
+class TailEval:
+    """Request from a step to be replaced by the evaluation of `node` in `env`."""
+
+    __slots__ = ("node", "env")
+
+    def __init__(self, node, env: Environment):
+        """Store the node to evaluate and its environment."""
+        self.node = node
+        self.env = env
+
+
+class StackEvaluator(Evaluator):
+    """Evaluator with heap-allocated call frames and proper tail calls."""
+
+    def __init__(self, env=None, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        """Initialize the evaluator with the global environment and a memory budget in bytes."""
+        super().__init__(env)
+        self.memory_limit = memory_limit
+        # Names bound in some function environment. Any other name can only live in
+        # the global environment, so its lookup skips the chain of calling scopes.
+        self.local_names: set[str] = set()
+        self.steps = {}  # Maps node type -> step method.
+        # Nodes that need no step: their value is computed as soon as it is asked for.
+        self.leaves = {
+            Number: self.leaf_literal,
+            String: self.leaf_literal,
+            Variable: self.leaf_Variable,
+        }
+        self.max_depth = 0  # Deepest stack seen, for diagnostics.
+
+    @property
+    def max_steps(self) -> int:
+        """The number of pending steps that fit in the memory budget."""
+        return max(1, self.memory_limit // STEP_BYTES)
+
+    def eval(self, node):
+        """Evaluate a node in the global environment."""
+        return self.run(node, self.env)
+
+    def run(self, node, env: Environment):
+        """Drive the steps of `node` until its value is known."""
+        leaf = self.leaves.get(type(node))
+        if leaf is not None:
+            return leaf(node, env)
+        pending = []  # Suspended steps waiting for the value of a child.
+        max_steps = self.max_steps  # Read once per run, so the budget can be changed between runs.
+        step = self.step_for(node, env)
+        value = None
+        while True:
+            try:
+                request = step.send(value)
+            except StopIteration as stop:
+                if not pending:
+                    return stop.value
+                value = stop.value
+                step = pending.pop()
+                continue
+
+            if type(request) is TailEval:
+                node, env = request.node, request.env
+                leaf = self.leaves.get(type(node))
+                if leaf is not None:
+                    # The step is finished: its value is the value of the leaf.
+                    value = leaf(node, env)
+                    if not pending:
+                        return value
+                    step = pending.pop()
+                else:
+                    step = self.step_for(node, env)
+                    value = None
+                continue
+
+            node, env = request
+            leaf = self.leaves.get(type(node))
+            if leaf is not None:
+                value = leaf(node, env)
+                continue
+            pending.append(step)
+            if len(pending) > self.max_depth:
+                self.max_depth = len(pending)
+            if len(pending) > max_steps:
+                raise RecursionError(
+                    f"Maximum recursion depth exceeded (memory limit of "
+                    f"{self.memory_limit // (1024 * 1024)} MiB)"
+                )
+            step = self.step_for(node, env)
+            value = None
+
+    def step_for(self, node, env: Environment):
+        """Create the step generator that evaluates `node`."""
+        node_type = type(node)
+        step_method = self.steps.get(node_type)
+        if step_method is None:
+            step_method = getattr(self, f"step_{node_type.__name__}", self.generic_step)
+            self.steps[node_type] = step_method
+        return step_method(node, env)
+
+    def lookup(self, name: str, env: Environment):
+        """Look a name up through the calling scopes without recursing."""
+        if name not in self.local_names:
+            return self.env[name]
+        while env is not None:
+            if name in env:
+                return dict.__getitem__(env, name)
+            env = env.outer
+        raise NameError(f"Undefined variable '{name}'")
+
+    def bind(self, env: Environment, name: str, value):
+        """Bind a name in an environment, recording it if the environment is local."""
+        if env is not self.env:
+            self.local_names.add(name)
+        env[name] = value
+
+    # ----- Leaves -----
+
+    def leaf_literal(self, node, env: Environment):
+        """Evaluate a Number or String node."""
+        return node.value
+
+    def leaf_Variable(self, node: Variable, env: Environment):
+        """Evaluate a Variable node."""
+        return self.lookup(node.name, env)
+
+    # ----- Steps -----
+
+    def generic_step(self, node, env: Environment):
+        """Evaluate a node this evaluator has no step for with the tree walker."""
+        value = Evaluator(env).eval(node)
+        if env is not self.env:
+            # The tree walker may have bound names in this local environment.
+            self.local_names.update(env)
+        return value
+        yield  # Makes this method a generator.
+
+    def step_list(self, node: list, env: Environment):
+        """Evaluate a block; its last statement replaces the block."""
+        if not node:
+            return None
+        for stmt in node[:-1]:
+            yield (stmt, env)
+        yield TailEval(node[-1], env)
+
+    def step_BinOp(self, node: BinOp, env: Environment):
+        """Evaluate a BinOp node."""
+        function = BINARY_FUNCTIONS.get(node.op)
+        if function is None:
+            raise ValueError(f"Unknown operator '{node.op}'")
+        left_val = yield (node.left, env)
+        right_val = yield (node.right, env)
+        return function(left_val, right_val)
+
+    def step_ArrayLiteral(self, node: ArrayLiteral, env: Environment):
+        """Evaluate an ArrayLiteral node."""
+        elements = []
+        for element in node.elements:
+            elements.append((yield (element, env)))
+        return GBArray.from_values(elements)
+
+    def step_Index(self, node: Index, env: Environment):
+        """Evaluate an Index node."""
+        container = yield (node.target, env)
+        index = yield (node.index, env)
+        return get_item(container, index)
+
+    def step_ListLiteral(self, node: ListLiteral, env: Environment):
+        """Evaluate a ListLiteral node."""
+        elements = []
+        for element in node.elements:
+            elements.append((yield (element, env)))
+        return elements
+
+    def step_DictLiteral(self, node: DictLiteral, env: Environment):
+        """Evaluate a DictLiteral node."""
+        result = {}
+        for key_node, value_node in zip(node.keys, node.values):
+            key = yield (key_node, env)
+            value = yield (value_node, env)
+            set_item(result, key, value)
+        return result
+
+    def step_IndexAssign(self, node: IndexAssign, env: Environment):
+        """Evaluate an IndexAssign node."""
+        container = yield (node.target, env)
+        index = yield (node.index, env)
+        value = yield (node.value, env)
+        set_item(container, index, value)
+        return None
+
+    def step_Assign(self, node: Assign, env: Environment):
+        """Evaluate an Assign node."""
+        value = yield (node.value, env)
+        self.bind(env, node.name.name, value)
+        return None
+
+    def step_IfStmt(self, node: IfStmt, env: Environment):
+        """Evaluate an IfStmt node; the chosen branch replaces the statement."""
+        if (yield (node.condition, env)):
+            yield TailEval(node.then_block, env)
+        elif node.else_block:
+            yield TailEval(node.else_block, env)
+        return None
+
+    def step_WhileStmt(self, node: WhileStmt, env: Environment):
+        """Evaluate a WhileStmt node."""
+        result = None
+        while (yield (node.condition, env)):
+            result = yield (node.body, env)
+        return result
+
+    def step_ForStmt(self, node: ForStmt, env: Environment):
+        """Evaluate a ForStmt node by iterating over a native range."""
+        start = yield (node.start, env)
+        end = yield (node.end, env)
+        step = 1 if node.step is None else (yield (node.step, env))
+        name = node.var.name
+        result = None
+        for value in counted_range(start, end, step):
+            self.bind(env, name, value)
+            result = yield (node.body, env)
+        return result
+
+    def step_FunctionDef(self, node: FunctionDef, env: Environment):
+        """Evaluate a Function Definition node."""
+        self.bind(env, node.name, node)
+        return None
+        yield  # Makes this method a generator.
+
+    def step_FunctionCall(self, node: FunctionCall, env: Environment):
+        """Evaluate a Function Call node; the body of a GB function replaces the call."""
+        func = self.lookup(node.name, env)
+        args = []
+        for arg in node.args:
+            args.append((yield (arg, env)))
+
+        if isinstance(func, FunctionDef):
+            if len(args) != len(func.params):
+                raise TypeError(
+                    f"Function '{node.name}' expects {len(func.params)} arguments, but got {len(args)}"
+                )
+            local_env = Environment(outer=env)
+            for name, val in zip(func.params, args):
+                local_env[name] = val
+            self.local_names.update(func.params)
+            yield TailEval(func.body, local_env)
+
+        elif isinstance(func, NativeFunction):
+            return func.py_callable(*args)
+
+        else:
+            raise TypeError(f"'{node.name}' is not a function")
@@ -0,0 +1,98 @@
+"""
+Phase-level statistics of a program run.
+REPL.run_with_stats runs a program one phase at a time (lex, parse, optimise,
+eval) and returns a RunStats: the wall time of each phase, the number of tokens,
+the number of AST nodes before and after optimisation, the function scopes and GB
+function calls made while evaluating, and optionally the peak memory traced by
+tracemalloc.
+
+The counters come from bookkeeping the interpreter already does (see
+Environment.scopes and FrameEvaluator.calls), so runs without statistics are not
+slowed down. Tracing memory is optional: tracemalloc makes evaluation several
+times slower, so a run that traces memory has inflated phase times.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PHASES = ("lex", "parse", "optimise", "eval")
+
+
+class RunStats:
+    """The per-phase times and counters of one program run."""
+
+    def __init__(self, backend: str, opt_level: int, clock=time.perf_counter):
+        """Start empty statistics for a run on `backend` at `opt_level`, timed with `clock`."""
+        self.backend = backend
+        self.opt_level = opt_level
+        self.clock = clock
+        self.times = dict.fromkeys(PHASES, 0.0)  # Seconds spent in each phase.
+        self.tokens = 0
+        self.nodes = 0  # AST nodes produced by the parser.
+        self.optimised_nodes = 0  # AST nodes left after optimisation.
+        self.environments = 0  # Function scopes (Environments) allocated.
+        self.calls = 0  # GB function calls whose body ran.
+        self.peak_memory = None  # Peak traced bytes above the start of the run, or None when not traced.
+        self.result = None  # The program's result.
+
+    @contextmanager
+    def phase(self, name: str):
+        """Add the time spent in the `with` block to the phase `name`."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.times[name] += self.clock() - start
+
+    @property
+    def total(self) -> float:
+        """The time spent in all phases together."""
+        return sum(self.times.values())
+
+    def as_dict(self) -> dict:
+        """Return the statistics as JSON-compatible data (without the program's result)."""
+        return {
+            "backend": self.backend,
+            "opt_level": self.opt_level,
+            "times": dict(self.times),
+            "total": self.total,
+            "tokens": self.tokens,
+            "nodes": self.nodes,
+            "optimised_nodes": self.optimised_nodes,
+            "environments": self.environments,
+            "calls": self.calls,
+            "peak_memory": self.peak_memory,
+        }
+
+    def report(self) -> str:
+        """Return the statistics as a short text summary."""
+        total = self.total or 1.0
+        lines = [f"{'phase':>9} {'seconds':>10} {'share':>7}"]
+        for name in PHASES:
+            seconds = self.times[name]
+            lines.append(f"{name:>9} {seconds:10.6f} {seconds / total:7.1%}")
+        lines.append(f"{'total':>9} {self.total:10.6f}")
+        lines.append("")
+        lines.append(f"backend {self.backend}, -O{self.opt_level}")
+        lines.append(f"{self.tokens:,} tokens, {self.nodes:,} AST nodes ({self.optimised_nodes:,} after optimisation)")
+        lines.append(f"{self.calls:,} function calls, {self.environments:,} environments allocated")
+        if self.peak_memory is not None:
+            lines.append(f"peak traced memory {self.peak_memory / 1024:,.1f} KiB (times include tracemalloc)")
+        return "\n".join(lines)
+
+
+@contextmanager
+def traced_memory(stats: RunStats):
+    """Trace memory allocations in the `with` block and store their peak in `stats`."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        stats.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,262 @@
+"""
+Ahead-of-time transpiler from the GB AST to Python code objects.
+A parsed program is translated into Python source and handed to `compile()`, so GB
+loops and arithmetic run as CPython bytecode. GB semantics that differ from Python
+are kept: blocks evaluate to their last statement, division by zero raises
+"Division by zero", and calls go through the FunctionDef/NativeFunction convention.
+Anything that cannot be translated falls back to the tree-walking Evaluator.
+"""
+
+from Interpreter.ast_nodes import (
+    Number,
+    Variable,
+    String,
+    BinOp,
+    ArrayLiteral,
+    ListLiteral,
+    DictLiteral,
+    Index,
+    Assign,
+    IndexAssign,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    FunctionDef,
+    FunctionCall,
+    MethodNames,
+)
+from Interpreter.arrays import GBArray
+from Interpreter.containers import build_dict, get_item, set_item
+from Interpreter.ropes import concat
+from Interpreter.evaluator import (
+    Environment,
+    Evaluator,
+    NativeFunction,
+    add,
+    counted_range,
+    divide,
+)
+
+# Operators that map directly onto the Python operator of the same spelling.
+# `+` does too when an operand is a number literal; otherwise it may concatenate strings.
+PYTHON_OPERATORS = ("-", "*", "==", "!=", ">", "<", ">=", "<=")
+
+RESULT = "_r"  # Name of the Python local that holds the value of the current block.
+
+_STATEMENT_METHODS = MethodNames("stmt_")
+
+
+class Transpiler:
+    """Translates GB AST nodes into Python source and compiles it."""
+
+    # ----- Public API -----
+
+    def compile_program(self, statements: list):
+        """Compile top-level statements into a callable `program(env) -> value`."""
+        return self._compile_or_fallback("__gb_program", statements)
+
+    def function_for(self, func: FunctionDef):
+        """Return the compiled Python function for a FunctionDef, compiling it on first call."""
+        # Kept on the node, so it is freed with the function rather than piling up in the transpiler.
+        function = func.python_function
+        if function is None:
+            function = func.python_function = self._compile_or_fallback(f"__gb_fn_{func.name}", func.body)
+        return function
+
+    def translate(self, name: str, body: list) -> tuple[str, list]:
+        """Translate a block into the source of `def name(env)` plus the constants it uses."""
+        self.lines: list[str] = []
+        self.consts: list = []
+        self.temps = 0  # Number of `_t<n>` locals used by inline additions.
+        self.emit(0, f"def {name}(env):")
+        self.translate_block(body, RESULT, 1)
+        self.emit(1, f"return {RESULT}")
+        return "\n".join(self.lines), self.consts
+
+    # ----- Code generation -----
+
+    def _compile_or_fallback(self, name: str, body: list):
+        """Compile a block to a Python function, or wrap the tree walker if CPython refuses it."""
+        try:
+            return self._compile_function(name, body)
+        except (SyntaxError, RecursionError, MemoryError):
+            # CPython's own compiler has limits (e.g. nesting depth); the tree walker does not.
+
+            def tree_walker(env):
+                return Evaluator(env).eval(body)
+
+            return tree_walker
+
+    def _compile_function(self, name: str, body: list):
+        """Translate, compile and execute the source of a function; return the function."""
+        source, consts = self.translate(name, body)
+        namespace = {
+            "_call": self.call,
+            "_add": add,
+            "_concat": concat,
+            "_div": divide,
+            "_array": GBArray.from_values,
+            "_index": get_item,
+            "_dict": build_dict,
+            "_set_item": set_item,
+            "_fallback": self.fallback,
+            "_range": counted_range,
+            "_consts": consts,
+        }
+        exec(compile(source, f"<gb:{name}>", "exec"), namespace)
+        return namespace[name]
+
+    def emit(self, indent: int, line: str):
+        """Append an indented line of Python source."""
+        self.lines.append("    " * indent + line)
+
+    def add_const(self, value) -> str:
+        """Keep a reference to an object (AST node or value) and return the expression that loads it."""
+        self.consts.append(value)
+        return f"_consts[{len(self.consts) - 1}]"
+
+    def translate_block(self, stmts: list, target, indent: int):
+        """
+        Translate a block of statements.
+        When `target` is a name, the value of the block is stored in it;
+        when it is None, the value is discarded.
+        """
+        if not stmts:
+            self.emit(indent, f"{target} = None" if target else "pass")
+            return
+        for stmt in stmts[:-1]:
+            self.translate_statement(stmt, None, indent)
+        self.translate_statement(stmts[-1], target, indent)
+
+    def translate_statement(self, node, target, indent: int):
+        """Translate a statement based on its type."""
+        statement_method = getattr(self, _STATEMENT_METHODS[type(node)], None)
+        if statement_method is not None:
+            statement_method(node, target, indent)
+            return
+        # Every other node is an expression statement.
+        expr = self.translate_expression(node)
+        self.emit(indent, f"{target} = {expr}" if target else expr)
+
+    def stmt_list(self, node: list, target, indent: int):
+        """Translate a nested block."""
+        self.translate_block(node, target, indent)
+
+    def stmt_Assign(self, node: Assign, target, indent: int):
+        """Translate an Assign node."""
+        value = self.translate_expression(node.value)
+        self.emit(indent, f"env[{node.name.name!r}] = {value}")
+        if target:
+            self.emit(indent, f"{target} = None")
+
+    def stmt_IndexAssign(self, node: IndexAssign, target, indent: int):
+        """Translate an IndexAssign node."""
+        container = self.translate_expression(node.target)
+        index = self.translate_expression(node.index)
+        value = self.translate_expression(node.value)
+        self.emit(indent, f"_set_item({container}, {index}, {value})")
+        if target:
+            self.emit(indent, f"{target} = None")
+
+    def stmt_IfStmt(self, node: IfStmt, target, indent: int):
+        """Translate an IfStmt node."""
+        self.emit(indent, f"if {self.translate_expression(node.condition)}:")
+        self.translate_block(node.then_block, target, indent + 1)
+        if node.else_block or target:
+            self.emit(indent, "else:")
+            self.translate_block(node.else_block or [], target, indent + 1)
+
+    def stmt_WhileStmt(self, node: WhileStmt, target, indent: int):
+        """Translate a WhileStmt node into a native while loop."""
+        if target:
+            self.emit(indent, f"{target} = None")
+        self.emit(indent, f"while {self.translate_expression(node.condition)}:")
+        self.translate_block(node.body, target, indent + 1)
+
+    def stmt_ForStmt(self, node: ForStmt, target, indent: int):
+        """Translate a ForStmt node into a native for loop that binds the variable in `env`."""
+        if target:
+            self.emit(indent, f"{target} = None")
+        start = self.translate_expression(node.start)
+        end = self.translate_expression(node.end)
+        step = "1" if node.step is None else self.translate_expression(node.step)
+        self.emit(indent, f"for env[{node.var.name!r}] in _range({start}, {end}, {step}):")
+        self.translate_block(node.body, target, indent + 1)
+
+    def stmt_FunctionDef(self, node: FunctionDef, target, indent: int):
+        """Translate a FunctionDef node. Its body is compiled on first call."""
+        self.emit(indent, f"env[{node.name!r}] = {self.add_const(node)}")
+        if target:
+            self.emit(indent, f"{target} = None")
+
+    def translate_expression(self, node) -> str:
+        """Translate an expression into a Python expression string."""
+        if isinstance(node, (Number, String)):
+            if type(node.value) in (int, bool, str):
+                return repr(node.value)
+            return self.add_const(node.value)
+        if isinstance(node, Variable):
+            return f"env[{node.name!r}]"
+        if isinstance(node, BinOp):
+            left = self.translate_expression(node.left)
+            right = self.translate_expression(node.right)
+            if node.op in PYTHON_OPERATORS:
+                return f"({left} {node.op} {right})"
+            if node.op == "+":
+                return self.translate_add(node, left, right)
+            if node.op == "/":
+                return f"_div({left}, {right})"
+        if isinstance(node, ArrayLiteral):
+            elements = ", ".join(self.translate_expression(element) for element in node.elements)
+            return f"_array([{elements}])"
+        if isinstance(node, Index):
+            target = self.translate_expression(node.target)
+            return f"_index({target}, {self.translate_expression(node.index)})"
+        if isinstance(node, ListLiteral):
+            return "[" + ", ".join(self.translate_expression(element) for element in node.elements) + "]"
+        if isinstance(node, DictLiteral):
+            items = "".join(
+                f"{self.translate_expression(key)}, {self.translate_expression(value)}, "
+                for key, value in zip(node.keys, node.values)
+            )
+            return f"_dict([{items}])"
+        if isinstance(node, FunctionCall):
+            # The callee is looked up before the arguments, as in the tree walker.
+            args = "".join(f", {self.translate_expression(arg)}" for arg in node.args)
+            return f"_call(env[{node.name!r}], {node.name!r}, env{args})"
+        return f"_fallback(env, {self.add_const(node)})"
+
+    def translate_add(self, node: BinOp, left: str, right: str) -> str:
+        """Translate `+`, which must concatenate two strings lazily rather than with Python's `+`."""
+        if isinstance(node.left, Number) or isinstance(node.right, Number):
+            return f"({left} + {right})"
+        if isinstance(node.right, (Number, String, Variable)):
+            # Checked inline: the right operand is a short expression, so repeating it is cheap.
+            temp = f"_t{self.temps}"
+            self.temps += 1
+            return f"(_concat({temp}, {right}) if type({temp} := {left}) is str else {temp} + {right})"
+        return f"_add({left}, {right})"
+
+    # ----- Runtime support -----
+
+    def call(self, func, name: str, env: Environment, *args):
+        """Call a GB function value with the tree walker's calling convention."""
+        if isinstance(func, FunctionDef):
+            if len(args) != len(func.params):
+                raise TypeError(
+                    f"Function '{name}' expects {len(func.params)} arguments, but got {len(args)}"
+                )
+            local_env = Environment(outer=env)
+            for param, val in zip(func.params, args):
+                local_env[param] = val
+            return self.function_for(func)(local_env)
+
+        elif isinstance(func, NativeFunction):
+            return func.py_callable(*args)
+
+        else:
+            raise TypeError(f"'{name}' is not a function")
+
+    def fallback(self, env: Environment, node):
+        """Evaluate a node the transpiler could not translate with the tree walker."""
+        return Evaluator(env).eval(node)
@@ -0,0 +1,208 @@
+"""
+Stack-based virtual machine that executes the bytecode produced by `bytecode.py`.
+GB calls do not recurse into Python: every call pushes a frame onto the VM's own
+frame list, and RETURN_VALUE pops it again.
+"""
+
+from Interpreter.ast_nodes import FunctionDef
+from Interpreter.bytecode import (
+    LOAD_CONST,
+    LOAD_NAME,
+    STORE_NAME,
+    POP_TOP,
+    BINARY_ADD,
+    BINARY_SUB,
+    BINARY_MUL,
+    BINARY_DIV,
+    COMPARE_EQ,
+    COMPARE_NE,
+    COMPARE_GT,
+    COMPARE_LT,
+    COMPARE_GE,
+    COMPARE_LE,
+    JUMP,
+    JUMP_IF_FALSE,
+    CALL_FUNCTION,
+    DEFINE_FUNCTION,
+    RETURN_VALUE,
+    EVAL_NODE,
+    GET_RANGE,
+    FOR_ITER,
+    STORE_LOOP_VALUE,
+    BUILD_ARRAY,
+    BINARY_SUBSCR,
+    BUILD_LIST,
+    BUILD_DICT,
+    STORE_SUBSCR,
+    CodeObject,
+    Compiler,
+)
+from Interpreter.arrays import GBArray
+from Interpreter.containers import build_dict, get_item, set_item
+from Interpreter.ropes import concat
+from Interpreter.evaluator import (
+    Environment,
+    Evaluator,
+    NativeFunction,
+    counted_range,
+    divide,
+)
+
+
+class VM:
+    """Executes CodeObjects with an operand stack per frame."""
+
+    def __init__(self, compiler=None):
+        """Initialize the VM with the compiler of function bodies."""
+        self.compiler = compiler if compiler is not None else Compiler()
+
+    def code_for(self, func: FunctionDef) -> CodeObject:
+        """Return the code object of a function, compiling it on first call."""
+        # Kept on the node, so it is freed with the function rather than piling up in the VM.
+        code = func.bytecode
+        if code is None:
+            code = func.bytecode = self.compiler.compile_function(func)
+        return code
+
+    def run(self, code: CodeObject, env: Environment):
+        """Execute a code object in the given environment and return its value."""
+        frames = []  # Saved caller state: (instructions, consts, names, stack, pc, env)
+        instructions, consts, names = code.instructions, code.consts, code.names
+        stack = []
+        pc = 0
+
+        # The dispatch loop. The branches are ordered by how often they execute.
+        while True:
+            opcode, arg = instructions[pc]
+            pc += 1
+
+            if opcode == LOAD_NAME:
+                stack.append(env[names[arg]])
+            elif opcode == LOAD_CONST:
+                stack.append(consts[arg])
+            elif opcode == STORE_NAME:
+                env[names[arg]] = stack.pop()
+            elif opcode == JUMP_IF_FALSE:
+                if not stack.pop():
+                    pc = arg
+            elif opcode == JUMP:
+                pc = arg
+            elif opcode == FOR_ITER:
+                value = next(stack[-1], stack)  # The stack itself marks the end.
+                if value is stack:
+                    stack.pop()
+                    pc = arg
+                else:
+                    stack.append(value)
+            elif opcode == BINARY_ADD:
+                right = stack.pop()
+                left = stack[-1]
+                stack[-1] = concat(left, right) if type(left) is str else left + right
+            elif opcode == BINARY_SUB:
+                right = stack.pop()
+                stack[-1] = stack[-1] - right
+            elif opcode == COMPARE_LT:
+                right = stack.pop()
+                stack[-1] = stack[-1] < right
+            elif opcode == COMPARE_GT:
+                right = stack.pop()
+                stack[-1] = stack[-1] > right
+            elif opcode == COMPARE_LE:
+                right = stack.pop()
+                stack[-1] = stack[-1] <= right
+            elif opcode == COMPARE_GE:
+                right = stack.pop()
+                stack[-1] = stack[-1] >= right
+            elif opcode == COMPARE_EQ:
+                right = stack.pop()
+                stack[-1] = stack[-1] == right
+            elif opcode == COMPARE_NE:
+                right = stack.pop()
+                stack[-1] = stack[-1] != right
+            elif opcode == BINARY_MUL:
+                right = stack.pop()
+                stack[-1] = stack[-1] * right
+            elif opcode == BINARY_DIV:
+                right = stack.pop()
+                stack[-1] = divide(stack[-1], right)
+            elif opcode == POP_TOP:
+                stack.pop()
+            elif opcode == CALL_FUNCTION:
+                call_name, argc = consts[arg]
+                if argc:
+                    args = stack[-argc:]
+                    del stack[-argc:]
+                else:
+                    args = []
+                func = stack.pop()
+
+                if isinstance(func, FunctionDef):
+                    if argc != len(func.params):
+                        raise TypeError(
+                            f"Function '{call_name}' expects {len(func.params)} arguments, but got {argc}"
+                        )
+                    frames.append((instructions, consts, names, stack, pc, env))
+                    env = Environment(outer=env)
+                    for name, val in zip(func.params, args):
+                        env[name] = val
+                    callee = self.code_for(func)
+                    instructions, consts, names = (
+                        callee.instructions,
+                        callee.consts,
+                        callee.names,
+                    )
+                    stack = []
+                    pc = 0
+                elif isinstance(func, NativeFunction):
+                    stack.append(func.py_callable(*args))
+                else:
+                    raise TypeError(f"'{call_name}' is not a function")
+            elif opcode == RETURN_VALUE:
+                value = stack.pop()
+                if not frames:
+                    return value
+                instructions, consts, names, stack, pc, env = frames.pop()
+                stack.append(value)
+            elif opcode == STORE_LOOP_VALUE:
+                value = stack.pop()
+                stack[-2] = value
+            elif opcode == GET_RANGE:
+                step = stack.pop()
+                end = stack.pop()
+                stack[-1] = iter(counted_range(stack[-1], end, step))
+            elif opcode == BINARY_SUBSCR:
+                index = stack.pop()
+                stack[-1] = get_item(stack[-1], index)
+            elif opcode == BUILD_ARRAY:
+                if arg:
+                    elements = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    elements = []
+                stack.append(GBArray.from_values(elements))
+            elif opcode == BUILD_LIST:
+                if arg:
+                    elements = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    elements = []
+                stack.append(elements)
+            elif opcode == BUILD_DICT:
+                if arg:
+                    items = stack[-2 * arg:]
+                    del stack[-2 * arg:]
+                else:
+                    items = []
+                stack.append(build_dict(items))
+            elif opcode == STORE_SUBSCR:
+                value = stack.pop()
+                index = stack.pop()
+                set_item(stack.pop(), index, value)
+            elif opcode == DEFINE_FUNCTION:
+                func = consts[arg]
+                env[func.name] = func
+            elif opcode == EVAL_NODE:
+                stack.append(Evaluator(env).eval(consts[arg]))
+            else:
+                raise RuntimeError(f"Unknown opcode {opcode}")
+
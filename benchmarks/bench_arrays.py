@@ -0,0 +1,63 @@
+"""
+Benchmark for numeric arrays.
+Computes the dot product of two sequences of integers twice: element by element in
+an interpreted GB loop, and with the array type's element-wise `*` followed by
+`sum`, which run in C. Reports the time of both and the speedup.
+
+Usage: python benchmarks/bench_arrays.py [--sizes 10000 100000] [--repeat 3] [--backend tree]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from repl import BACKENDS, REPL
+
+# Both programs compute sum(i * (i + 1)) for i in 0 .. n-1.
+LOOP = """
+sup total = 0;
+for (i in 0, {n}) {{
+    total = total + i * (i + 1);
+}}
+total;
+"""
+
+VECTORISED = """
+sup xs = range_array(0, {n});
+sum(xs * (xs + 1));
+"""
+
+
+def best_time(source: str, backend: str, repeat: int) -> tuple[float, object]:
+    """Return the best wall time over `repeat` runs and the program's result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        repl = REPL(backend=backend, cache=False)
+        start = time.perf_counter()
+        result = repl.run_program(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per size."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark array operations against GB loops.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="elements")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    arg_parser.add_argument("--backend", choices=BACKENDS, default="tree")
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'elements':>10} {'loop s':>9} {'array s':>9} {'speedup':>8}")
+    for size in args.sizes:
+        loop_seconds, loop_result = best_time(LOOP.format(n=size), args.backend, args.repeat)
+        array_seconds, array_result = best_time(VECTORISED.format(n=size), args.backend, args.repeat)
+        assert loop_result == array_result, "results disagree"
+        print(f"{size:>10,} {loop_seconds:9.4f} {array_seconds:9.4f} {loop_seconds / array_seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
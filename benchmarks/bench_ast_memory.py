@@ -0,0 +1,96 @@
+"""
+Memory benchmark for the AST.
+Parses a generated program and reports the bytes retained per node for three
+representations of the same tree:
+
+    dict     node objects with an instance __dict__ (the classes before __slots__)
+    slots    the node classes of `ast_nodes.py`
+    flat     the columnar FlatAST of `flat_ast.py`
+
+Every figure includes the block lists and the node objects, measured with
+tracemalloc; literal values and names are shared by all three and not counted.
+
+Usage: python benchmarks/bench_ast_memory.py [--statements 20000]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Interpreter.flat_ast import encode
+from Interpreter.parser import parse
+
+SNIPPET = """
+def add_numbers(first_value, second_value) {
+    sup total = first_value + second_value * 2;
+    total;
+}
+sup counter = 0;
+while (counter <= 1000) {
+    counter = counter + add_numbers(counter, 12345);
+    if (counter != 99) { print("Hello, World!"); } else { counter = counter - 1; }
+}
+"""
+
+# Dict-backed stand-ins for the node classes, one class per node type so that the
+# instances share dictionary keys exactly as the original classes did.
+_DICT_CLASSES: dict[type, type] = {}
+
+
+def dict_class_for(node_type: type) -> type:
+    """Return a class with the same name and no __slots__ for a node class."""
+    dict_class = _DICT_CLASSES.get(node_type)
+    if dict_class is None:
+        dict_class = _DICT_CLASSES[node_type] = type(f"Dict{node_type.__name__}", (), {})
+    return dict_class
+
+
+def copy_tree(node, class_for):
+    """Copy a tree of nodes, building each copy as an instance of `class_for(type(node))`."""
+    if isinstance(node, list):
+        return [copy_tree(stmt, class_for) for stmt in node]
+    if not hasattr(type(node), "__slots__"):
+        return node  # A literal value or a name, shared with the original tree.
+    copy = object.__new__(class_for(type(node)))
+    for field in type(node).__slots__:
+        setattr(copy, field, copy_tree(getattr(node, field), class_for))
+    return copy
+
+
+def retained_bytes(build) -> tuple[int, object]:
+    """Return the bytes still allocated after `build()` together with its result."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per representation."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark AST memory per node.")
+    arg_parser.add_argument("--statements", type=int, default=20000, help="copies of the sample program")
+    args = arg_parser.parse_args(argv)
+
+    source = SNIPPET * args.statements
+    # Parse once; each representation is then built from the same tree.
+    tree = parse(source)
+    flat = encode(tree)
+    nodes = len(flat)  # Every node and block of the program, as counted by the encoder.
+
+    dict_bytes, _ = retained_bytes(lambda: copy_tree(tree, dict_class_for))
+    slots_bytes, _ = retained_bytes(lambda: copy_tree(tree, lambda node_type: node_type))
+    flat_bytes, _ = retained_bytes(lambda: encode(tree))
+
+    print(f"{nodes:,} nodes ({len(source) / (1024 * 1024):.2f} MB of source)")
+    print(f"{'layout':>6} {'MB':>8} {'bytes/node':>11} {'saving':>7}")
+    for name, size in (("dict", dict_bytes), ("slots", slots_bytes), ("flat", flat_bytes)):
+        print(f"{name:>6} {size / (1024 * 1024):8.2f} {size / nodes:11.1f} {dict_bytes / size:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for counted loops.
+Runs the same summing loop written as a `while` loop (a comparison, an addition and
+an assignment per iteration) and as a `for` loop driven by a native range, on every
+backend, and reports the time per loop and the speedup of `for` over `while`.
+
+Usage: python benchmarks/bench_for_loop.py [--iterations 200000] [--repeat 3] [--backends tree vm]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from repl import BACKENDS, REPL
+
+WHILE_LOOP = """
+sup total = 0;
+sup i = 0;
+while (i < {n}) {{
+    total = total + i;
+    i = i + 1;
+}}
+total;
+"""
+
+FOR_LOOP = """
+sup total = 0;
+for (i in 0, {n}) {{
+    total = total + i;
+}}
+total;
+"""
+
+# The same loops inside a function, where backends such as `frames` keep locals in slots.
+WHILE_FUNCTION = """
+def count(n) {{
+    sup total = 0;
+    sup i = 0;
+    while (i < n) {{
+        total = total + i;
+        i = i + 1;
+    }}
+    total;
+}}
+count({n});
+"""
+
+FOR_FUNCTION = """
+def count(n) {{
+    sup total = 0;
+    for (i in 0, n) {{
+        total = total + i;
+    }}
+    total;
+}}
+count({n});
+"""
+
+WORKLOADS = {
+    "global": (WHILE_LOOP, FOR_LOOP),
+    "function": (WHILE_FUNCTION, FOR_FUNCTION),
+}
+
+
+def best_time(source: str, backend: str, repeat: int) -> tuple[float, object]:
+    """Return the best wall time over `repeat` runs and the program's result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        repl = REPL(backend=backend, cache=False)
+        start = time.perf_counter()
+        result = repl.run_program(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per workload and backend."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark for loops against while loops.")
+    arg_parser.add_argument("--iterations", type=int, default=200_000, help="iterations per loop")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    arg_parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    args = arg_parser.parse_args(argv)
+
+    expected = args.iterations * (args.iterations - 1) // 2
+    print(f"{'workload':>9} {'backend':>9} {'while s':>9} {'for s':>9} {'speedup':>8}")
+    for workload, (while_source, for_source) in WORKLOADS.items():
+        for backend in args.backends:
+            while_seconds, while_result = best_time(while_source.format(n=args.iterations), backend, args.repeat)
+            for_seconds, for_result = best_time(for_source.format(n=args.iterations), backend, args.repeat)
+            assert while_result == for_result == expected, "loops disagree"
+            print(
+                f"{workload:>9} {backend:>9} {while_seconds:9.3f} {for_seconds:9.3f} "
+                f"{while_seconds / for_seconds:7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
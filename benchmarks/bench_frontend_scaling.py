@@ -0,0 +1,167 @@
+"""
+Scaling benchmark for the front end (lexer and parser).
+Generates seeded random programs of growing size (see program_generator.py) in
+four shapes and reports, for each size (about that many statements, except for
+the deep shape):
+
+    flat        many top-level assignments
+    nested      statements that open if/else and for blocks a few levels deep
+    long_expr   assignments whose expressions have hundreds of operands
+    deep        one chain of nested blocks; the size is the nesting depth
+
+the time of `lex()`, `Parser.parse_program()` and of streaming the program
+through `iter_parse()`, tokens and statements per second, and the peak memory of
+lexing and parsing (traced in a separate run, so tracing does not slow the timed
+runs). Between two sizes it fits the growth exponent of each time,
+log(t2 / t1) / log(n2 / n1), against the characters of the source for lexing and
+streaming and against the tokens for parsing: 1.0 is linear, and anything above
+--threshold is flagged as super-linear. Times under MIN_SECONDS are too noisy to
+fit. Sizes that raise RecursionError are reported, not timed.
+
+Usage: python benchmarks/bench_frontend_scaling.py [--sizes 1000 10000 100000] [--shapes flat deep] [--repeat 3]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Interpreter.lexer import lex
+from Interpreter.parser import Parser, iter_parse
+from program_generator import ProgramGenerator
+
+# Generator settings of each shape, and how a size maps onto them.
+SHAPES = {
+    "flat": lambda size: (ProgramGenerator(depth=0), size),
+    # A nested top-level statement holds about seven, so the sizes are scaled to match.
+    "nested": lambda size: (ProgramGenerator(depth=4, nesting=0.5), max(1, size // 7)),
+    "long_expr": lambda size: (ProgramGenerator(depth=0, expression_terms=200), max(1, size // 50)),
+    "deep": lambda size: (ProgramGenerator(depth=size, nesting=1.0, block_size=1, functions=0), 1),
+}
+DEEP_SIZES = [100, 200, 400, 800]
+# The input size each phase's time is fitted against.
+PHASE_SIZES = {"lex": "chars", "parse": "tokens", "stream": "chars"}
+MIN_SECONDS = 0.005
+
+
+def best_time(function, argument, repeat: int) -> tuple[float, object]:
+    """Return the best wall time of `function(argument)` over `repeat` runs and its result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def parse_tokens(tokens: list):
+    """Parse a list of tokens into a list of statements."""
+    return Parser(tokens).parse_program()
+
+
+def stream(source: str) -> int:
+    """Lex and parse a program statement by statement, keeping none of them; return the count."""
+    count = 0
+    for _ in iter_parse(source):
+        count += 1
+    return count
+
+
+def peak_memory(source: str) -> int:
+    """Return the peak traced memory of lexing and parsing a program, AST included."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        parse_tokens(lex(source))
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def measure(shape: str, size: int, repeat: int) -> dict | None:
+    """Generate and measure one program; None when the front end runs out of recursion depth."""
+    generator, statements = SHAPES[shape](size)
+    source = generator.program(statements)
+    try:
+        lex_seconds, tokens = best_time(lex, source, repeat)
+        parse_seconds, _ = best_time(parse_tokens, tokens, repeat)
+        stream_seconds, _ = best_time(stream, source, repeat)
+    except RecursionError:
+        return None
+    return {
+        "chars": len(source),
+        "tokens": len(tokens),
+        "statements": generator.statement_count,
+        "lex": lex_seconds,
+        "parse": parse_seconds,
+        "stream": stream_seconds,
+        "memory": peak_memory(source),
+    }
+
+
+def exponent(previous: dict, current: dict, phase: str) -> float | None:
+    """Return the growth exponent of a phase's time against its input size, or None if it cannot be fitted."""
+    size = PHASE_SIZES[phase]
+    if previous[phase] < MIN_SECONDS or current[size] <= previous[size]:
+        return None
+    return math.log(current[phase] / previous[phase]) / math.log(current[size] / previous[size])
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per shape and size."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark how the lexer and parser scale with program size.")
+    arg_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="statements per program"
+    )
+    arg_parser.add_argument(
+        "--deep-sizes", type=int, nargs="+", default=DEEP_SIZES, help="nesting depths of the deep shape"
+    )
+    arg_parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=1.2, help="growth exponent flagged as super-linear (default: 1.2)"
+    )
+    args = arg_parser.parse_args(argv)
+
+    print(
+        f"{'shape':>9} {'size':>8} {'tokens':>10} {'statements':>10} {'lex s':>8} {'parse s':>8} {'stream s':>8} "
+        f"{'tokens/s':>11} {'stmts/s':>10} {'B/token':>8}  growth (lex, parse, stream)"
+    )
+    flagged = []
+    for shape in args.shapes:
+        previous = None
+        for size in args.deep_sizes if shape == "deep" else args.sizes:
+            row = measure(shape, size, args.repeat)
+            if row is None:
+                print(f"{shape:>9} {size:>8,}  RecursionError")
+                flagged.append(f"{shape} {size:,}: RecursionError")
+                break
+            front_end = row["lex"] + row["parse"]
+            line = (
+                f"{shape:>9} {size:>8,} {row['tokens']:>10,} {row['statements']:>10,} {row['lex']:8.3f} "
+                f"{row['parse']:8.3f} {row['stream']:8.3f} {row['tokens'] / row['lex']:>11,.0f} "
+                f"{row['statements'] / front_end:>10,.0f} {row['memory'] / row['tokens']:8.0f}"
+            )
+            if previous is not None:
+                growth = [exponent(previous, row, phase) for phase in PHASE_SIZES]
+                line += "  " + ", ".join("-" if value is None else f"{value:.2f}" for value in growth)
+                for phase, value in zip(PHASE_SIZES, growth):
+                    if value is not None and value > args.threshold:
+                        line += f"  SUPER-LINEAR {phase}"
+                        flagged.append(f"{shape} {size:,}: {phase} grows as n^{value:.2f}")
+            print(line)
+            previous = row
+    if flagged:
+        print("\nFlagged:")
+        for message in flagged:
+            print(f"  {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Throughput benchmark for the lexer.
+Compares `lex()` with the previous character-by-character lexer on generated
+sources of increasing size and reports megabytes and tokens per second. The "code"
+workload is ordinary statements; the "literals" workload is made of very long
+string literals and identifiers, which the old lexer grew one character at a time.
+
+Usage: python benchmarks/bench_lexer.py [--sizes 0.5 1 2] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Interpreter.lexer import lex, Token, NUMBER, SYMBOL, IDENT, STRING
+
+SNIPPET = """
+# Sum the first numbers and build a greeting.
+def add_numbers(first_value, second_value) {
+    sup total = first_value + second_value * 2;
+    total;
+}
+sup counter_1 = 0;
+while (counter_1 <= 1000) {
+    counter_1 = counter_1 + add_numbers(counter_1, 12345);
+    if (counter_1 != 99) { print("Hello, World! This is a longer string literal."); }
+}
+"""
+
+
+def legacy_lex(input_str: str) -> list[Token]:
+    """The character-by-character lexer that `lex()` replaced, kept for comparison."""
+    tokens: list[Token] = []
+    i: int = 0
+    while i < len(input_str):
+        ch = input_str[i]
+
+        if ch.isspace():
+            i += 1
+            continue
+
+        if ch == "#":
+            i += 1
+            while i < len(input_str) and input_str[i] != "\n":
+                i += 1
+            continue
+
+        if ch == '"':
+            i += 1
+            str_val = ""
+            while i < len(input_str) and input_str[i] != '"':
+                str_val += input_str[i]
+                i += 1
+            if i >= len(input_str):
+                raise ValueError("Unterminated string literal")
+            i += 1
+            tokens.append(Token(STRING, str_val))
+            continue
+
+        if ch.isdigit():
+            num = ch
+            i += 1
+            while i < len(input_str) and input_str[i].isdigit():
+                num += input_str[i]
+                i += 1
+            tokens.append(Token(NUMBER, int(num)))
+            continue
+
+        if ch.isalpha() or ch == "_":
+            ident = ch
+            i += 1
+            while i < len(input_str) and (
+                input_str[i].isalnum() or input_str[i] == "_"
+            ):
+                ident += input_str[i]
+                i += 1
+            tokens.append(Token(IDENT, ident))
+            continue
+
+        if ch in ["+", "-", "*", "/", "=", "!", "<", ">", ";", "(", ")", "{", "}", ","]:
+            next_ch = input_str[i + 1] if i + 1 < len(input_str) else ""
+            two_char_sym = ch + next_ch
+            if two_char_sym in ["==", "!=", "<=", ">="]:
+                tokens.append(Token(SYMBOL, two_char_sym))
+                i += 2
+            else:
+                tokens.append(Token(SYMBOL, ch))
+                i += 1
+        else:
+            raise ValueError(f"Unknown character: {ch}")
+
+    return tokens
+
+
+def make_source(megabytes: float, workload: str = "code") -> str:
+    """Build a valid GB source of roughly the requested size."""
+    if workload == "literals":
+        snippet = f'sup {"long_identifier_" * 500} = "{"x" * 50_000}";\n'
+    else:
+        snippet = SNIPPET
+    copies = max(1, int(megabytes * 1024 * 1024 / len(snippet)))
+    return snippet * copies
+
+
+def best_time(lexer, source: str, repeat: int) -> tuple[float, int]:
+    """Return the best wall time over `repeat` runs and the number of tokens produced."""
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(lexer(source))
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per lexer and size."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark lexer throughput.")
+    arg_parser.add_argument("--sizes", type=float, nargs="+", default=[0.5, 1, 2], help="source sizes in MB")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'workload':>9} {'size':>8} {'lexer':>8} {'seconds':>9} {'MB/s':>8} {'tokens/s':>12} {'speedup':>8}")
+    for workload in ("code", "literals"):
+        for size in args.sizes:
+            source = make_source(size, workload)
+            megabytes = len(source) / (1024 * 1024)
+            assert lex(source) == legacy_lex(source), "lexers disagree"
+            legacy_seconds, count = best_time(legacy_lex, source, args.repeat)
+            seconds, _ = best_time(lex, source, args.repeat)
+            for name, elapsed in (("legacy", legacy_seconds), ("regex", seconds)):
+                print(
+                    f"{workload:>9} {megabytes:7.2f}M {name:>8} {elapsed:9.3f} {megabytes / elapsed:8.2f} "
+                    f"{count / elapsed:12,.0f} {legacy_seconds / elapsed:7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
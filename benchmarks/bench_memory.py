@@ -0,0 +1,109 @@
+"""
+Memory harness for the benchmark programs.
+Runs every workload of benchmarks/programs (see suite.py) through
+REPL.profile_memory and reports, in KiB, the memory each phase left allocated,
+the peak of the run, what the REPL still retains after the run and what is left
+once the REPL is dropped (a leak). Each workload is run once untraced first, so
+one-time caches (interned method names, compiled regular expressions) are not
+mistaken for leaks.
+
+With --output the numbers are saved as JSON; with --baseline they are compared
+against such a file, and the harness exits with status 1 when the peak, retained
+or leaked memory of a workload grew by more than --threshold. The numbers
+measured when the harness was added are in benchmarks/memory_baseline.json
+(they depend on the Python version, which the file records).
+
+Usage: python benchmarks/bench_memory.py [--backends tree vm] [--output FILE] [--baseline benchmarks/memory_baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from repl import BACKENDS, REPL
+from suite import load_programs
+
+COLUMNS = ("setup", "lex", "parse", "optimise", "eval")
+CHECKED = ("peak", "retained", "leaked")  # The numbers compared against a baseline.
+SLACK = 1024  # Bytes of growth always tolerated, so tiny numbers do not fail on noise.
+
+
+def measure(source: str, backend: str) -> dict:
+    """Return the memory numbers of one workload, after an untraced warm-up run."""
+    REPL(backend=backend, cache=False).run_program(source)
+    report = REPL.profile_memory(source, backend)
+    return report.as_dict()
+
+
+def regressions(base: dict, new: dict, threshold: float) -> list[str]:
+    """Return a message for every checked number that grew beyond the threshold."""
+    messages = []
+    for key, numbers in new["benchmarks"].items():
+        base_numbers = base["benchmarks"].get(key)
+        if base_numbers is None:
+            continue
+        for name in CHECKED:
+            limit = base_numbers[name] * (1 + threshold) + SLACK
+            if numbers[name] > limit:
+                messages.append(f"{key} {name}: {base_numbers[name] / 1024:,.1f} -> {numbers[name] / 1024:,.1f} KiB")
+    return messages
+
+
+def main(argv=None):
+    """Run the harness and print one line per workload and backend."""
+    arg_parser = argparse.ArgumentParser(description="Measure the memory of the benchmark programs.")
+    arg_parser.add_argument("--programs", nargs="+", help="workloads to run (default: all)")
+    arg_parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["tree"])
+    arg_parser.add_argument("--output", metavar="FILE", help="save the numbers as JSON")
+    arg_parser.add_argument("--baseline", metavar="FILE", help="compare against numbers saved with --output")
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="relative growth that fails against the baseline (default: 0.10)"
+    )
+    args = arg_parser.parse_args(argv)
+    try:
+        programs = load_programs(args.programs)
+    except ValueError as e:
+        arg_parser.error(str(e))
+
+    results = {"python": platform.python_version(), "benchmarks": {}}
+    print(
+        f"{'benchmark':>16} {'backend':>9} "
+        + " ".join(f"{name:>8}" for name in COLUMNS)
+        + f" {'peak':>8} {'retained':>8} {'leaked':>8}   (KiB)"
+    )
+    for name, (source, _) in programs.items():
+        for backend in args.backends:
+            numbers = measure(source, backend)
+            results["benchmarks"][f"{name}/{backend}"] = {
+                "phases": {phase: numbers["phases"][phase]["allocated"] for phase in COLUMNS},
+                **{key: numbers[key] for key in CHECKED},
+                "retained_objects": numbers["retained_objects"],
+            }
+            print(
+                f"{name:>16} {backend:>9} "
+                + " ".join(f"{numbers['phases'][phase]['allocated'] / 1024:8.1f}" for phase in COLUMNS)
+                + "".join(f" {numbers[key] / 1024:8.1f}" for key in CHECKED)
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            base = json.load(f)
+        messages = regressions(base, results, args.threshold)
+        if messages:
+            print(f"\n{len(messages)} regression(s) against {args.baseline}:")
+            for message in messages:
+                print(f"  {message}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
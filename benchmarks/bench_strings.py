@@ -0,0 +1,79 @@
+"""
+Benchmark for repeated string concatenation.
+Builds a string of the given size in a GB `while` loop (`s = s + chunk;`) and reports
+the time with lazy concatenation (ropes) and, for sizes up to --eager-limit, with
+eager concatenation, which copies the whole string on every iteration.
+
+Usage: python benchmarks/bench_strings.py [--sizes 1000000 10000000] [--chunk 100] [--backend tree]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from Interpreter import ropes
+from repl import BACKENDS, REPL
+
+PROGRAM = """
+sup s = "";
+sup i = 0;
+while (i < {iterations}) {{
+    s = s + "{chunk}";
+    i = i + 1;
+}}
+len(s);
+"""
+
+
+def best_time(source: str, backend: str, repeat: int) -> tuple[float, object]:
+    """Return the best wall time over `repeat` runs and the program's result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        repl = REPL(backend=backend, cache=False)
+        start = time.perf_counter()
+        result = repl.run_program(source)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def eager_time(source: str, backend: str, repeat: int) -> tuple[float, object]:
+    """Like best_time, with every concatenation copying (no ropes)."""
+    saved = ropes.MIN_ROPE_LENGTH
+    ropes.MIN_ROPE_LENGTH = sys.maxsize
+    try:
+        return best_time(source, backend, repeat)
+    finally:
+        ropes.MIN_ROPE_LENGTH = saved
+
+
+def main(argv=None):
+    """Run the benchmark and print one line per size."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark building a large string in a GB loop.")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000], help="characters")
+    arg_parser.add_argument("--chunk", type=int, default=100, help="characters appended per iteration")
+    arg_parser.add_argument("--eager-limit", type=int, default=1_000_000, help="largest size run eagerly")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is kept)")
+    arg_parser.add_argument("--backend", choices=BACKENDS, default="tree")
+    args = arg_parser.parse_args(argv)
+
+    chunk = "x" * args.chunk
+    print(f"{'characters':>11} {'rope s':>9} {'eager s':>9} {'speedup':>8}")
+    for size in args.sizes:
+        source = PROGRAM.format(iterations=size // args.chunk, chunk=chunk)
+        expected = size // args.chunk * args.chunk
+        rope_seconds, rope_result = best_time(source, args.backend, args.repeat)
+        assert rope_result == expected, "wrong length"
+        if size > args.eager_limit:
+            print(f"{expected:>11,} {rope_seconds:9.3f} {'-':>9} {'-':>8}")
+            continue
+        eager_seconds, eager_result = eager_time(source, args.backend, args.repeat)
+        assert eager_result == expected, "wrong length"
+        print(f"{expected:>11,} {rope_seconds:9.3f} {eager_seconds:9.3f} {eager_seconds / rope_seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
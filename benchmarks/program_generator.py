@@ -0,0 +1,171 @@
+"""
+Seeded generator of random, valid GB programs.
+The same seed and shape always give the same program. Programs are built to
+parse and to run: every variable is declared before use, every call matches the
+arity of a function defined above it, and loops are counted `for` loops with a
+few iterations (one inside another loop, so deep nests stay cheap to run).
+
+Values stay bounded, so every backend computes the same finite result. Operands
+are at most MAX_OPERAND in size, expressions only add and subtract them or multiply
+one by a digit, and every assignment and function body divides its expression by
+the most it could have grown: variables and function results never exceed
+MAX_OPERAND either.
+
+The shape is controlled by:
+    statements        top-level statements (nested statements are extra)
+    depth             how deeply if/else and for blocks nest
+    nesting           the chance that a statement opens a block, while depth is left
+    block_size        statements per nested block
+    expression_terms  operands per expression
+    functions         functions defined at the top of the program
+
+Usage: python benchmarks/program_generator.py [--statements 100] [--seed 0] [--depth 2] > prog.gb
+"""
+
+import argparse
+import random
+import sys
+
+OPERATORS = ("+", "-", "*", "+", "-")  # Arithmetic, weighted towards + and -.
+MAX_OPERAND = 99  # Largest literal operand, and so the bound on every variable.
+MAX_FACTOR = 9  # `*` only multiplies an operand by a digit up to this.
+COMPARISONS = ("<", ">", "<=", ">=", "==", "!=")
+
+
+class ProgramGenerator:
+    """Builds random GB programs of a given shape from a seed."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        depth: int = 2,
+        nesting: float = 0.4,
+        block_size: int = 2,
+        expression_terms: int = 4,
+        functions: int = 4,
+        variables: int = 8,
+    ):
+        """Create a generator; every program it builds starts from `seed`."""
+        self.seed = seed
+        self.depth = depth
+        self.nesting = nesting
+        self.block_size = block_size
+        self.expression_terms = expression_terms
+        self.functions = functions
+        self.variables = [f"v{i}" for i in range(variables)]
+        self.rng = random.Random(seed)
+        self.loops = 0  # Loop variables handed out, so nested loops never share one.
+        self.arities: list[int] = []  # Parameter counts of the functions defined so far.
+        self.statement_count = 0  # Statements written by the last program(), nested ones included.
+
+    def program(self, statements: int) -> str:
+        """Return the source of a program with `statements` top-level statements."""
+        self.rng.seed(self.seed)
+        self.loops = 0
+        self.statement_count = 0
+        self.arities = []
+        lines = [f"sup {name} = {self.rng.randint(0, 9)} / {self.rng.randint(1, 9)};" for name in self.variables]
+        for index in range(self.functions):
+            # A body only calls the functions defined before it, so there is no recursion.
+            params = [f"p{i}" for i in range(self.rng.randint(1, 3))]
+            body = self.expression(self.expression_terms, params)
+            lines.append(f"def f{index}({', '.join(params)}) {{ ({body}) / {self.scale}; }}")
+            self.arities.append(len(params))
+        # Each level of nesting costs two Python frames here, so deep programs need a higher limit.
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, 2 * self.depth + 200))
+        try:
+            for _ in range(statements):
+                lines.append(self.statement(self.depth, self.variables, 0, False))
+        finally:
+            sys.setrecursionlimit(limit)
+        lines.append(f"{self.variables[0]};")
+        return "\n".join(lines) + "\n"
+
+    def statement(self, depth: int, names: list[str], indent: int, in_loop: bool) -> str:
+        """Return one statement that may nest blocks `depth` levels deep."""
+        self.statement_count += 1
+        pad = "    " * indent
+        if depth == 0 or self.rng.random() >= self.nesting:
+            target = self.rng.choice(self.variables)
+            return f"{pad}{target} = ({self.expression(self.expression_terms, names)}) / {self.scale};"
+        if self.rng.random() < 0.5:
+            condition = self.comparison(names)
+            then_block = self.block(depth - 1, names, indent, in_loop)
+            # Only the then-block nests further, so one chain of blocks stays linear in size.
+            else_block = self.block(0, names, indent, in_loop)
+            return f"{pad}if ({condition}) {{\n{then_block}\n{pad}}} else {{\n{else_block}\n{pad}}}"
+        loop_var = f"i{self.loops}"
+        self.loops += 1
+        end = 1 if in_loop else self.rng.randint(1, 3)
+        body = self.block(depth - 1, names + [loop_var], indent, True)
+        return f"{pad}for ({loop_var} in 0, {end}) {{\n{body}\n{pad}}}"
+
+    def block(self, depth: int, names: list[str], indent: int, in_loop: bool) -> str:
+        """Return the statements of a nested block."""
+        statements = []
+        for _ in range(self.block_size):
+            statements.append(self.statement(depth, names, indent + 1, in_loop))
+        return "\n".join(statements)
+
+    @property
+    def scale(self) -> int:
+        """The most an expression of operands within MAX_OPERAND can exceed MAX_OPERAND by."""
+        return MAX_FACTOR * self.expression_terms
+
+    def comparison(self, names: list[str]) -> str:
+        """Return a comparison of two expressions."""
+        terms = max(1, self.expression_terms // 2)
+        return f"{self.expression(terms, names)} {self.rng.choice(COMPARISONS)} {self.expression(terms, names)}"
+
+    def expression(self, terms: int, names: list[str]) -> str:
+        """Return an arithmetic expression with `terms` operands."""
+        parts = [self.operand(names)]
+        for _ in range(terms - 1):
+            operator = self.rng.choice(OPERATORS)
+            if operator == "*":
+                # Multiply the last operand by a digit, then go on adding or subtracting.
+                parts += ["*", str(self.rng.randint(1, MAX_FACTOR))]
+                operator = self.rng.choice(("+", "-"))
+            parts.append(operator)
+            parts.append(self.operand(names))
+        text = " ".join(parts)
+        # Parentheses now and then, so the parser sees nesting inside expressions too.
+        return f"({text})" if terms > 1 and self.rng.random() < 0.2 else text
+
+    def operand(self, names: list[str]) -> str:
+        """Return a number, a variable or a call of a function defined so far."""
+        kind = self.rng.random()
+        if kind < 0.4:
+            return str(self.rng.randint(0, 99))
+        if kind < 0.9 or not self.arities:
+            return self.rng.choice(names)
+        index = self.rng.randrange(len(self.arities))
+        args = ", ".join(self.rng.choice(names) for _ in range(self.arities[index]))
+        return f"f{index}({args})"
+
+
+def main(argv=None):
+    """Print a generated program."""
+    arg_parser = argparse.ArgumentParser(description="Generate a random, valid GB program.")
+    arg_parser.add_argument("--statements", type=int, default=100, help="top-level statements")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--depth", type=int, default=2, help="nesting depth of blocks")
+    arg_parser.add_argument("--nesting", type=float, default=0.4, help="chance that a statement opens a block")
+    arg_parser.add_argument("--block-size", type=int, default=2, help="statements per nested block")
+    arg_parser.add_argument("--expression-terms", type=int, default=4, help="operands per expression")
+    arg_parser.add_argument("--functions", type=int, default=4, help="functions defined at the top")
+    args = arg_parser.parse_args(argv)
+    generator = ProgramGenerator(
+        seed=args.seed,
+        depth=args.depth,
+        nesting=args.nesting,
+        block_size=args.block_size,
+        expression_terms=args.expression_terms,
+        functions=args.functions,
+    )
+    print(generator.program(args.statements), end="")
+
+
+if __name__ == "__main__":
+    main()
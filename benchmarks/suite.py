@@ -0,0 +1,192 @@
+"""
+Benchmark suite of representative GB programs, with regression tracking.
+Every `.gb` file in benchmarks/programs is a workload. Its `# expect: <value>` line
+gives the result it must produce. Each workload is run through REPL.run_program
+on a fresh REPL (no parse cache), first `--warmup` times untimed and then
+`--repeat` times timed. The results are printed as min, median, mean and standard
+deviation, and can be saved as JSON together with the commit they were measured on.
+
+`compare` reads two such JSON files and reports the change in median time of
+every workload. It exits with status 1 when a workload got slower than the
+threshold allows, so a CI job can fail on regressions.
+
+Usage:
+    python benchmarks/suite.py run [--backends tree vm] [--repeat 5] [--output results.json]
+    python benchmarks/suite.py compare base.json new.json [--threshold 0.05]
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Add the project root to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from repl import BACKENDS, REPL
+
+PROGRAMS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+EXPECT_PREFIX = "# expect:"
+
+
+def load_programs(names: list[str] | None = None) -> dict[str, tuple[str, str]]:
+    """Return name -> (source, expected result as text) for the workloads, all of them by default."""
+    programs = {}
+    for path in sorted(glob.glob(os.path.join(PROGRAMS_DIR, "*.gb"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if names and name not in names:
+            continue
+        with open(path) as f:
+            source = f.read()
+        expected = next(
+            (line[len(EXPECT_PREFIX):].strip() for line in source.splitlines() if line.startswith(EXPECT_PREFIX)),
+            None,
+        )
+        if expected is None:
+            raise ValueError(f"{path} has no '{EXPECT_PREFIX}' line")
+        programs[name] = (source, expected)
+    missing = set(names or ()) - set(programs)
+    if missing:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(missing))}")
+    return programs
+
+
+def time_program(source: str, expected: str, backend: str, warmup: int, repeat: int) -> list[float]:
+    """Run a workload `warmup` times untimed, then `repeat` times timed, and return the times."""
+    times = []
+    for run in range(warmup + repeat):
+        repl = REPL(backend=backend, cache=False)
+        start = time.perf_counter()
+        result = repl.run_program(source)
+        elapsed = time.perf_counter() - start
+        if str(result) != expected:
+            raise AssertionError(f"expected {expected}, got {result!r}")
+        if run >= warmup:
+            times.append(elapsed)
+    return times
+
+
+def summarise(times: list[float]) -> dict:
+    """Return the statistics of a list of run times."""
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "times": times,
+    }
+
+
+def git_commit() -> str | None:
+    """Return the commit of the working tree, or None outside a git checkout."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_suite(programs: dict, args) -> dict:
+    """Time every workload on every backend, print a table and return the results."""
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "benchmarks": {},
+    }
+    print(f"{'benchmark':>16} {'backend':>9} {'min s':>9} {'median s':>9} {'mean s':>9} {'stdev s':>9}")
+    for name, (source, expected) in programs.items():
+        for backend in args.backends:
+            stats = summarise(time_program(source, expected, backend, args.warmup, args.repeat))
+            results["benchmarks"][f"{name}/{backend}"] = stats
+            print(
+                f"{name:>16} {backend:>9} {stats['min']:9.4f} {stats['median']:9.4f} "
+                f"{stats['mean']:9.4f} {stats['stdev']:9.4f}"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def compare(base: dict, new: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Return the report lines comparing two result sets and the benchmarks that regressed."""
+    lines = [f"{'benchmark':>26} {'base s':>9} {'new s':>9} {'change':>8}"]
+    regressions = []
+    for key, new_stats in new["benchmarks"].items():
+        base_stats = base["benchmarks"].get(key)
+        if base_stats is None:
+            lines.append(f"{key:>26} {'-':>9} {new_stats['median']:9.4f} {'new':>8}")
+            continue
+        change = new_stats["median"] / base_stats["median"] - 1
+        if change > threshold:
+            verdict = "  slower"
+            regressions.append(key)
+        elif change < -threshold:
+            verdict = "  faster"
+        else:
+            verdict = ""
+        lines.append(f"{key:>26} {base_stats['median']:9.4f} {new_stats['median']:9.4f} {change:+8.1%}{verdict}")
+    for key in sorted(base["benchmarks"].keys() - new["benchmarks"].keys()):
+        lines.append(f"{key:>26} {base['benchmarks'][key]['median']:9.4f} {'-':>9} {'gone':>8}")
+    return lines, regressions
+
+
+def compare_files(args) -> int:
+    """Print the comparison of two result files and return the exit status."""
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(f"base {base.get('commit') or '?'} -> new {new.get('commit') or '?'}, threshold {args.threshold:.0%}")
+    lines, regressions = compare(base, new, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    """Run the benchmark suite or compare two result files."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark suite of GB programs.")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the workloads")
+    run_parser.add_argument("--programs", nargs="+", help="workloads to run (default: all)")
+    run_parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["tree"])
+    run_parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing")
+    run_parser.add_argument("--repeat", type=int, default=5, help="timed runs per workload")
+    run_parser.add_argument("--output", metavar="FILE", help="save the results as JSON")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base", help="results of the baseline")
+    compare_parser.add_argument("new", help="results to check for regressions")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.05, help="relative slowdown of the median that fails (default: 0.05)"
+    )
+
+    args = arg_parser.parse_args(argv)
+    if args.command == "run":
+        if args.repeat < 1:
+            arg_parser.error("--repeat must be at least 1")
+        try:
+            programs = load_programs(args.programs)
+        except ValueError as e:
+            arg_parser.error(str(e))
+        run_suite(programs, args)
+        return 0
+    return compare_files(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,44 @@
+import argparse
+import contextlib
+import json
+import os
 import sys
+from Interpreter.adaptive import AdaptiveEvaluator, ProfilingAdaptiveEvaluator, specialisation_stats
+from Interpreter.arrays import ARRAY_FUNCTIONS
+from Interpreter.ast_nodes import FunctionDef, walk
+from Interpreter.bytecode import Compiler, disassemble
+from Interpreter.cache import ProgramCache, cache_directory_for
+from Interpreter.closure_compiler import ClosureCompiler
+from Interpreter.containers import CONTAINER_FUNCTIONS
 from Interpreter.evaluator import Evaluator, Environment, NativeFunction
-from Interpreter.parser import parse
+from Interpreter.flat_ast import FlatEvaluator, encode
+from Interpreter.inline_cache import inline_cache_stats
+from Interpreter.memo import MemoEvaluator, MemoStats
+from Interpreter.memory import MemoryReport, MemoryTracer
+from Interpreter.optimizer import DEFAULT_OPT_LEVEL, OPT_LEVELS, optimize
+from Interpreter.lexer import lex
+from Interpreter.parser import Parser, parse, iter_parse
+from Interpreter.profiler import SORT_KEYS, Profiler, ProfilingEvaluator
+from Interpreter.resolver import FrameEvaluator
+from Interpreter.ropes import flatten
+from Interpreter.sampling import DEFAULT_INTERVAL, Sampler
+from Interpreter.stack_evaluator import DEFAULT_MEMORY_LIMIT, StackEvaluator
+from Interpreter.stats import RunStats, traced_memory
+from Interpreter.transpiler import Transpiler
+from Interpreter.vm import VM
 
+BACKENDS = ("tree", "closure", "vm", "python", "frames", "flat", "stack", "adaptive")
+# The backends that run on a profiling evaluator when profiling is on.
+PROFILED_BACKENDS = ("tree", "adaptive")
+# The backends that run on a memoising evaluator when memoisation is on.
+MEMOIZED_BACKENDS = ("tree",)
+# The backends whose GB calls go through Evaluator.call_function, where the sampler finds them.
+SAMPLED_BACKENDS = ("tree", "adaptive")
+# The REPL method that runs each backend, named once instead of formatted per run.
+RUN_METHODS = {backend: f"run_{backend}" for backend in BACKENDS}
+# Scripts larger than this are lexed, parsed and evaluated as a stream.
+STREAMING_THRESHOLD = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
 PROMPT = ">>> "
 CONTINUE_PROMPT = "... "
 
@@ -10,8 +47,28 @@ class REPL:
     """Read-Eval-Print-Loop."""
 
     # UPDATED: The __init__ method now creates the global environment
-    def __init__(self, env=None):
-        """Initialize the REPL with a global environment."""
+    def __init__(
+        self,
+        env=None,
+        backend: str = "tree",
+        opt_level: int = DEFAULT_OPT_LEVEL,
+        cache: ProgramCache | bool | None = True,
+        memoize: bool = False,
+        profile: bool = False,
+        sample_interval: float | None = None,
+        stack_memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ):
+        """
+        Initialize the REPL with a global environment, a default backend and an
+        optimisation level. `cache` is a ProgramCache, True for a new in-memory
+        cache, or False/None to parse every program from scratch. With `memoize`,
+        the tree walker remembers the results of calls to pure functions; with
+        `profile`, the tree and adaptive backends record a profile of the calls and
+        statements they run. With a `sample_interval` (in seconds), a Sampler
+        records the GB call stack of the tree-walking backends that often while
+        programs run. `stack_memory_limit` is the memory budget, in bytes, of the
+        stack backend's pending work.
+        """
         if env is None:
 
             def native_print(*args):
@@ -37,18 +94,208 @@ class REPL:
             global_env = Environment()
             global_env["print"] = NativeFunction("print", native_print)
             global_env["input"] = NativeFunction("input", native_input)
+            for name, function in {**ARRAY_FUNCTIONS, **CONTAINER_FUNCTIONS}.items():
+                global_env[name] = NativeFunction(name, function)
+        else:
+            global_env = env
+        if memoize and profile:
+            raise ValueError("Memoisation and profiling cannot be combined")
+        if profile and backend not in PROFILED_BACKENDS:
+            raise ValueError(f"Profiling is not supported on the '{backend}' backend")
+        if memoize and backend not in MEMOIZED_BACKENDS:
+            raise ValueError(f"Memoisation is not supported on the '{backend}' backend")
+        if sample_interval is not None and backend not in SAMPLED_BACKENDS:
+            raise ValueError(f"Sampling is not supported on the '{backend}' backend")
+        if memoize:
+            self.evaluator = MemoEvaluator(global_env)
+        elif profile:
+            self.evaluator = ProfilingEvaluator(global_env)
+        else:
             self.evaluator = Evaluator(global_env)
+        self.sampler = Sampler(sample_interval) if sample_interval is not None else None
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'")
+        self.backend = backend
+        if opt_level not in OPT_LEVELS:
+            raise ValueError(f"Unknown optimisation level {opt_level}")
+        self.opt_level = opt_level
+        if cache is True:
+            cache = ProgramCache()
+        self.cache = None if cache is False else cache
+        self.closure_compiler = ClosureCompiler()
+        self.vm = VM()
+        self.transpiler = Transpiler()
+        self.frame_evaluator = FrameEvaluator(self.evaluator.env)
+        self.flat_evaluator = FlatEvaluator(self.evaluator.env)
+        self.stack_evaluator = StackEvaluator(self.evaluator.env, stack_memory_limit)
+        if profile:
+            # Both profiling backends record into the same profile.
+            self.adaptive_evaluator = ProfilingAdaptiveEvaluator(self.evaluator.env, self.evaluator.profiler)
         else:
-            self.evaluator = Evaluator(env)
+            self.adaptive_evaluator = AdaptiveEvaluator(self.evaluator.env)
+        self.last_program: list = []
+
+    def parse_program(self, program_string: str, filename: str | None = None) -> list:
+        """Return the optimised statements of a program, from the cache when possible."""
+        if self.cache is None:
+            return optimize(parse(program_string), self.opt_level)
+        return self.cache.program(program_string, self.opt_level, filename)
+
+    def run_program(self, program_string: str, backend: str | None = None, filename: str | None = None):
+        """Run a program string with the chosen backend and return the last result."""
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'")
+        ast_nodes = self.parse_program(program_string, filename)
+        self.last_program = ast_nodes
+        with self.sampling():
+            return flatten(getattr(self, RUN_METHODS[backend])(ast_nodes))
+
+    def run_with_stats(self, program_string: str, backend: str | None = None, trace_memory: bool = False) -> RunStats:
+        """
+        Run a program phase by phase and return its RunStats; the program's result
+        is in its `result`. The program is always lexed and parsed, never read from
+        the cache. With `trace_memory`, the peak memory of the run is traced too.
+        """
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'")
+        stats = RunStats(backend, self.opt_level)
+        root = self.evaluator.env.root
+        scopes, frame_calls = root.scopes, self.frame_evaluator.calls
+        with traced_memory(stats) if trace_memory else contextlib.nullcontext():
+            with stats.phase("lex"):
+                tokens = lex(program_string)
+            with stats.phase("parse"):
+                ast_nodes = Parser(tokens).parse_program()
+            stats.nodes = sum(1 for _ in walk(ast_nodes))  # Before optimisation rewrites the tree.
+            with stats.phase("optimise"):
+                optimised = optimize(ast_nodes, self.opt_level)
+            self.last_program = optimised
+            with stats.phase("eval"), self.sampling():
+                stats.result = flatten(getattr(self, RUN_METHODS[backend])(optimised))
+        stats.tokens = len(tokens)
+        stats.optimised_nodes = sum(1 for _ in walk(optimised))
+        stats.environments = root.scopes - scopes
+        stats.calls = stats.environments + self.frame_evaluator.calls - frame_calls
+        return stats
+
+    @classmethod
+    def profile_memory(cls, program_string: str, backend: str = "tree", top: int = 5, **options) -> MemoryReport:
+        """
+        Run a program on a new REPL (made with `options`, without a cache) under
+        tracemalloc and return its MemoryReport: the allocations of each phase, the
+        peak, the memory retained while the REPL is alive and what is left once it
+        is dropped. The program's result is in the report's `result`.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'")
+        with MemoryTracer(backend, top) as tracer:
+            with tracer.phase("setup"):
+                repl = cls(backend=backend, cache=False, **options)
+            with tracer.phase("lex"):
+                tokens = lex(program_string)
+            with tracer.phase("parse"):
+                ast_nodes = Parser(tokens).parse_program()
+            with tracer.phase("optimise"):
+                optimised = optimize(ast_nodes, repl.opt_level)
+            repl.last_program = optimised
+            with tracer.phase("eval"):
+                tracer.report.result = flatten(getattr(repl, RUN_METHODS[backend])(optimised))
+            del tokens, ast_nodes, optimised
+            tracer.retained()
+            del repl
+            tracer.leaked()
+        return tracer.report
+
+    def run_stream(self, source, backend: str | None = None):
+        """
+        Run a program given as a string or an iterable of source chunks, evaluating
+        each top-level statement as soon as it is parsed. Return the last result.
+        """
+        backend = backend or self.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'")
+        run_backend = getattr(self, RUN_METHODS[backend])
+        last_result = None
+        with self.sampling():
+            for statement in iter_parse(source):
+                last_result = run_backend(optimize([statement], self.opt_level))
+        return flatten(last_result)
+
+    def inline_cache_stats(self) -> dict:
+        """Return the tree walker's inline cache counters for the last program and the global functions."""
+        functions = [value for value in self.evaluator.env.values() if isinstance(value, FunctionDef)]
+        return inline_cache_stats(self.last_program + functions)
 
-    def run_program(self, program_string: str):
-        """Run a program string and return the last result."""
-        ast_nodes = parse(program_string)
+    def memo_stats(self) -> dict:
+        """Return the memoisation counters of the tree walker (all zero unless memoisation is on)."""
+        memoizer = getattr(self.evaluator, "memoizer", None)
+        if memoizer is None:
+            return MemoStats().as_dict()
+        return {**memoizer.stats.as_dict(), "entries": len(memoizer), "bytes": memoizer.nbytes}
+
+    @property
+    def profiler(self) -> Profiler | None:
+        """The profile of the tree and adaptive backends, or None unless profiling is on."""
+        return getattr(self.evaluator, "profiler", None)
+
+    def sampling(self):
+        """Return a context manager that samples the call stack while it is active, if sampling is on."""
+        return self.sampler if self.sampler is not None else contextlib.nullcontext()
+
+    def specialisation_stats(self) -> dict:
+        """Return the adaptive evaluator's BinOp specialisation counters for the last program and the global functions."""
+        functions = [value for value in self.evaluator.env.values() if isinstance(value, FunctionDef)]
+        return specialisation_stats(self.last_program + functions)
+
+    def run_tree(self, ast_nodes: list):
+        """Run the AST with the tree-walking evaluator."""
         last_result = None
         for node in ast_nodes:
             last_result = self.evaluator.eval(node)
         return last_result
 
+    def run_closure(self, ast_nodes: list):
+        """Compile the AST into closures once, then run them."""
+        program = self.closure_compiler.compile_program(ast_nodes)
+        return program(self.evaluator.env)
+
+    def run_vm(self, ast_nodes: list):
+        """Compile the AST to bytecode and run it on the virtual machine."""
+        code = self.vm.compiler.compile_program(ast_nodes)
+        return self.vm.run(code, self.evaluator.env)
+
+    def run_python(self, ast_nodes: list):
+        """Transpile the AST to a Python code object and run it."""
+        program = self.transpiler.compile_program(ast_nodes)
+        return program(self.evaluator.env)
+
+    def run_frames(self, ast_nodes: list):
+        """Run the AST with resolved local slots and array-backed call frames."""
+        last_result = None
+        for node in ast_nodes:
+            last_result = self.frame_evaluator.eval(node)
+        return last_result
+
+    def run_flat(self, ast_nodes: list):
+        """Encode the AST into typed arrays and run it with the flat evaluator."""
+        return self.flat_evaluator.run(encode(ast_nodes))
+
+    def run_stack(self, ast_nodes: list):
+        """Run the AST with an explicit evaluation stack, so recursion depth is not limited by Python."""
+        last_result = None
+        for node in ast_nodes:
+            last_result = self.stack_evaluator.eval(node)
+        return last_result
+
+    def run_adaptive(self, ast_nodes: list):
+        """Run the AST with BinOp nodes that specialise on the operand types they see."""
+        last_result = None
+        for node in ast_nodes:
+            last_result = self.adaptive_evaluator.eval(node)
+        return last_result
+
     def run(self):
         """Run the REPL Loop."""
         buffer = ""
@@ -81,20 +328,161 @@ class REPL:
                 break
 
 
-if __name__ == "__main__":
-    repl = REPL()
-    if len(sys.argv) > 1:
-        if not sys.argv[1].endswith(".gb"):
+def main(argv=None):
+    """Run a .gb script, or start the interactive REPL when no script is given."""
+    arg_parser = argparse.ArgumentParser(description="Run GB programs or start the REPL.")
+    arg_parser.add_argument("filename", nargs="?", help="a .gb script to run")
+    arg_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="tree",
+        help="execution backend (default: tree)",
+    )
+    arg_parser.add_argument(
+        "--stack-memory-limit",
+        type=int,
+        default=DEFAULT_MEMORY_LIMIT // (1024 * 1024),
+        metavar="MIB",
+        help=f"memory budget of the stack backend's recursion, in MiB "
+        f"(default: {DEFAULT_MEMORY_LIMIT // (1024 * 1024)})",
+    )
+    arg_parser.add_argument(
+        "-O",
+        dest="opt_level",
+        type=int,
+        choices=OPT_LEVELS,
+        default=DEFAULT_OPT_LEVEL,
+        help=f"optimisation level: -O0, -O1 or -O2 (default: -O{DEFAULT_OPT_LEVEL})",
+    )
+    arg_parser.add_argument(
+        "--dis",
+        action="store_true",
+        help="print the bytecode of the script before running it",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write parsed programs in the __gbcache__ directory",
+    )
+    arg_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=f"run the script statement by statement as it is read "
+        f"(the default for scripts over {STREAMING_THRESHOLD // 1024} KiB)",
+    )
+    arg_parser.add_argument(
+        "--memoize",
+        action="store_true",
+        help="remember the results of calls to pure functions (tree backend only)",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile calls and statement runs, report on exit (tree and adaptive backends)",
+    )
+    arg_parser.add_argument(
+        "--profile-sort",
+        choices=SORT_KEYS,
+        default="exclusive",
+        help="column the profile report is sorted by (default: exclusive)",
+    )
+    arg_parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="also save the profile: as JSON if FILE ends in .json, else in pstats format",
+    )
+    arg_parser.add_argument(
+        "--sample-profile",
+        metavar="FILE",
+        help="sample the GB call stack while the program runs and write collapsed stacks "
+        "(flamegraph input) to FILE on exit (tree and adaptive backends)",
+    )
+    arg_parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=DEFAULT_INTERVAL * 1000,
+        metavar="MS",
+        help=f"milliseconds between samples (default: {DEFAULT_INTERVAL * 1000:g})",
+    )
+    arg_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the time of each phase (lex, parse, optimise, eval) and the token, node "
+        "and call counts on exit",
+    )
+    arg_parser.add_argument(
+        "--stats-memory",
+        action="store_true",
+        help="also trace the peak memory of the run with tracemalloc (slows every phase down)",
+    )
+    arg_parser.add_argument(
+        "--stats-output",
+        metavar="FILE",
+        help="also save the statistics as JSON to FILE",
+    )
+    args = arg_parser.parse_args(argv)
+    profile = args.profile or bool(args.profile_output)
+    if args.memoize and profile:
+        arg_parser.error("--memoize cannot be combined with --profile")
+    if args.memoize and args.backend not in MEMOIZED_BACKENDS:
+        arg_parser.error(f"--memoize needs the {' or '.join(MEMOIZED_BACKENDS)} backend, not {args.backend}")
+    if profile and args.backend not in PROFILED_BACKENDS:
+        arg_parser.error(f"--profile needs the {' or '.join(PROFILED_BACKENDS)} backend, not {args.backend}")
+    if args.sample_profile and args.backend not in SAMPLED_BACKENDS:
+        arg_parser.error(
+            f"--sample-profile needs the {' or '.join(SAMPLED_BACKENDS)} backend, not {args.backend}"
+        )
+    if args.sample_interval <= 0:
+        arg_parser.error("--sample-interval must be positive")
+    if args.stack_memory_limit <= 0:
+        arg_parser.error("--stack-memory-limit must be positive")
+
+    cache = not args.no_cache
+    if cache and args.filename:
+        cache = ProgramCache(directory=cache_directory_for(args.filename))
+    repl = REPL(
+        backend=args.backend,
+        opt_level=args.opt_level,
+        cache=cache,
+        memoize=args.memoize,
+        profile=profile,
+        sample_interval=args.sample_interval / 1000 if args.sample_profile else None,
+        stack_memory_limit=args.stack_memory_limit * 1024 * 1024,
+    )
+    if repl.profiler is not None and args.filename:
+        repl.profiler.filename = args.filename
+    if args.filename:
+        if not args.filename.endswith(".gb"):
             sys.exit("Usage: python repl.py [filename].gb")
-        filename = sys.argv[1]
+        filename = args.filename
         try:
+            show_stats = args.stats or args.stats_memory or bool(args.stats_output)
+            stream = not args.dis and not show_stats and (
+                args.stream or os.path.getsize(filename) > STREAMING_THRESHOLD
+            )
             with open(filename, "r") as f:
-                program_content = (
-                    f.read()
-                )  # Read the entire file content as a single string.
-                final_result = repl.run_program(program_content)
+                if stream:
+                    # Large scripts are read in chunks and run statement by statement.
+                    final_result = repl.run_stream(iter(lambda: f.read(CHUNK_SIZE), ""))
+                else:
+                    program_content = (
+                        f.read()
+                    )  # Read the entire file content as a single string.
+                    if args.dis:
+                        program = repl.parse_program(program_content, filename)
+                        print(disassemble(Compiler().compile_program(program)))
+                    if show_stats:
+                        stats = repl.run_with_stats(program_content, trace_memory=args.stats_memory)
+                        final_result = stats.result
+                    else:
+                        final_result = repl.run_program(program_content, filename=filename)
                 if final_result is not None:
                     print(repr(final_result))  # Print the final result of the program.
+                if show_stats:
+                    print(stats.report(), file=sys.stderr)
+                    if args.stats_output:
+                        with open(args.stats_output, "w") as out:
+                            json.dump(stats.as_dict(), out, indent=2)
         except FileNotFoundError:
             print(f"Error: File not found '{filename}'")
         # Add a specific block to catch exit signals during script execution.
@@ -109,3 +497,15 @@ if __name__ == "__main__":
             "Simple Interpreter v1.4 (Interrupts fixed). Type 'quit' or 'exit' to leave."
         )
         repl.run()
+    if repl.profiler is not None:
+        if repl.backend == "adaptive":
+            repl.profiler.specialisation = repl.specialisation_stats()
+        print(repl.profiler.report(args.profile_sort), file=sys.stderr)
+        if args.profile_output:
+            repl.profiler.dump(args.profile_output)
+    if repl.sampler is not None:
+        repl.sampler.write(args.sample_profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from Interpreter.evaluator import Environment, Evaluator
+from Interpreter.parser import parse
+from repl import REPL
+
+# Helpers shared by the backend tests
+def run_tree(program_string):
+    """Runs a full program string with the tree walker, for comparison."""
+    evaluator = Evaluator(Environment())
+    last_result = None
+    for statement in parse(program_string):
+        last_result = evaluator.eval(statement)
+    return last_result
+
+def run_repl(src, backend="tree"):
+    """Runs a program on a fresh REPL (with the native functions, unoptimised) and returns its result."""
+    return REPL(backend=backend, opt_level=0).run_program(src)
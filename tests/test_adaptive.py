@@ -0,0 +1,68 @@
+import pytest
+from Interpreter.adaptive import AdaptiveEvaluator, GENERIC, SPECIALISED, WARMING, WARMUP, MAX_DEOPTS
+from Interpreter.ast_nodes import BinOp, Variable
+from Interpreter.evaluator import Environment
+from Interpreter.parser import parse
+from repl import REPL
+from tests.helpers import run_tree
+
+# Helper function to run programs on the adaptive evaluator for tests
+def run_adaptive(program_string, env=None):
+    """Parses and evaluates a full program string with an AdaptiveEvaluator."""
+    evaluator = AdaptiveEvaluator(env if env is not None else Environment())
+    last_result = None
+    for statement in parse(program_string):
+        last_result = evaluator.eval(statement)
+    return last_result
+
+@pytest.mark.parametrize("src", [
+    "sup i = 0; sup t = 0; while (i < 50) { t = t + i * 2; i = i + 1; } t;",
+    'sup i = 0; sup s = ""; while (i < 20) { s = s + "ab"; i = i + 1; } s == "ab" + s;',
+    "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);",
+    "sup i = 0; sup x = 0; while (i < 30) { x = x + 7 / 2; i = i + 1; } x;",
+])
+def test_adaptive_matches_tree_walker(src):
+    """Tests that specialised sites compute the tree walker's values."""
+    assert run_adaptive(src) == run_tree(src)
+
+def test_site_specialises_after_warmup():
+    """Tests that a site with stable int operands is specialised."""
+    evaluator = AdaptiveEvaluator(Environment({"a": 1, "b": 2}))
+    node = BinOp(Variable("a"), "+", Variable("b"))
+    for _ in range(WARMUP - 1):
+        evaluator.eval(node)
+    assert node.site.state == WARMING
+    evaluator.eval(node)
+    assert node.site.state == SPECIALISED and node.site.left_type is int
+    assert evaluator.eval(node) == 3
+    assert node.site.hits == 1
+
+def test_guard_failure_deoptimises():
+    """Tests that a site falls back when its operand types change, and gives up when they keep changing."""
+    env = Environment({"a": 1, "b": 2})
+    evaluator = AdaptiveEvaluator(env)
+    node = BinOp(Variable("a"), "+", Variable("b"))
+    for _ in range(WARMUP):
+        evaluator.eval(node)
+    env["a"], env["b"] = "x", "y"
+    assert evaluator.eval(node) == "xy"
+    assert node.site.state == WARMING and node.site.deopts == 1
+    for round_number in range(MAX_DEOPTS):
+        env["a"], env["b"] = (1, 2) if round_number % 2 else ("x", "y")
+        for _ in range(WARMUP + 1):
+            evaluator.eval(node)
+    assert node.site.state == GENERIC
+
+def test_errors_on_specialised_path():
+    """Tests that runtime errors keep their messages once a site is specialised."""
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        run_adaptive("sup i = 10; while (i > 0 - 1) { 100 / i; i = i - 1; }")
+
+def test_specialisation_stats():
+    """Tests the specialisation rate reported through the REPL."""
+    repl = REPL(backend="adaptive")
+    repl.run_program("def sq(n) { n * n; } sup i = 0; while (i < 100) { sq(i); i = i + 1; }")
+    stats = repl.specialisation_stats()
+    assert stats["sites"] == 3  # n * n inside sq, plus the loop's i < 100 and i + 1.
+    assert stats["specialised_sites"] == 3
+    assert stats["specialisation_rate"] > 0.9
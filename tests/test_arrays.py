@@ -0,0 +1,88 @@
+import pytest
+from Interpreter.arrays import GBArray, native_range_array
+from Interpreter.ast_nodes import ArrayLiteral, Index, Number, Variable
+from Interpreter.parser import parse
+from repl import BACKENDS, REPL
+from tests.helpers import run_repl
+
+def values(result):
+    """Returns the elements of a GBArray result as a list."""
+    assert type(result) is GBArray
+    return result.tolist()
+
+def test_parse_array_literal_and_index():
+    """Tests that @[...] is an array literal and [...] after a factor is an index."""
+    assert parse("@[1, x][0];") == [Index(ArrayLiteral([Number(1), Variable("x")]), Number(0))]
+    assert parse("m[1][2];") == [Index(Index(Variable("m"), Number(1)), Number(2))]
+    assert parse("@[];") == [ArrayLiteral([])]
+
+def test_int_and_float_arrays():
+    """Tests that integer arrays stay integer until a float is involved."""
+    assert GBArray.from_values([1, 2]).data.typecode == "q"
+    assert GBArray.from_values([1, 2.5]).data.typecode == "d"
+    assert (GBArray.from_values([1, 2]) / 2).data.typecode == "d"
+    with pytest.raises(TypeError, match="Array elements must be numbers"):
+        run_repl('@[1, "two"];')
+
+@pytest.mark.parametrize("src, expected", [
+    ("@[1, 2, 3] + @[10, 20, 30];", [11, 22, 33]),
+    ("@[1, 2, 3] * 2;", [2, 4, 6]),
+    ("10 - @[1, 2, 3];", [9, 8, 7]),
+    ("@[1, 2, 4] / 2;", [0.5, 1.0, 2.0]),
+    ("8 / @[1, 2, 4];", [8.0, 4.0, 2.0]),
+    ("@[1, 5, 3] > 2;", [0, 1, 1]),
+    ("2 < @[1, 5, 3];", [0, 1, 1]),
+    ("@[1, 2] == @[1, 3];", [1, 0]),
+    ("range_array(0, 10, 3) * range_array(1, 5);", [0, 6, 18, 36]),
+])
+def test_elementwise_operations(src, expected):
+    """Tests the element-wise operators between arrays and numbers."""
+    assert values(run_repl(src)) == expected
+
+@pytest.mark.parametrize("src, error, message", [
+    ("@[1, 2] / @[1, 0];", ZeroDivisionError, "Division by zero"),
+    ("@[1, 2] / 0;", ZeroDivisionError, "Division by zero"),
+    ("@[1, 2] + @[1];", ValueError, r"Array lengths differ \(2 and 1\)"),
+    ('@[1, 2] + "a";', TypeError, "unsupported operand"),
+    ("@[1, 2][2];", IndexError, "Array index out of range"),
+    ("@[1, 2][1 / 1];", TypeError, "Array indices must be integers"),
+    ("if (@[1] == 1) { 1; }", TypeError, "truth value of an array is ambiguous"),
+    ("5[0];", TypeError, "'int' value cannot be indexed"),
+    ("min(@[]);", ValueError, r"min\(\) of an empty array"),
+    ("sum(3);", TypeError, r"sum\(\) expects an array"),
+    ("@[4611686018427387904] * 4;", OverflowError, "Array element out of range"),
+])
+def test_array_errors(src, error, message):
+    """Tests the errors of invalid array operations."""
+    with pytest.raises(error, match=message):
+        run_repl(src)
+
+def test_builtins():
+    """Tests len, sum, min, max and range_array."""
+    assert run_repl("len(range_array(0, 100));") == 100
+    assert run_repl('len("hello");') == 5
+    assert run_repl("sum(range_array(1, 101));") == 5050
+    assert run_repl("min(@[3, 3 / 2, 2]) + max(@[3, 3 / 2, 2]);") == 4.5
+    assert values(native_range_array(10, 0, -4)) == [10, 6, 2]
+    with pytest.raises(ValueError, match="step cannot be zero"):
+        run_repl("range_array(0, 3, 0);")
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_arrays_on_every_backend(backend):
+    """Tests that every backend evaluates array literals, operators and indexes."""
+    src = """
+    def dot(a, b) { sum(a * b); }
+    sup xs = range_array(0, 5);
+    sup ys = @[1, 1, 2, 2, 3] + xs;
+    sup t = 0;
+    for (i in 0, len(ys)) { t = t + ys[i]; }
+    t * 1000 + dot(xs, ys) + xs[4];
+    """
+    assert run_repl(src, backend) == 19000 + 53 + 4
+
+def test_print_shows_array_literal(capsys):
+    """Tests that print and the REPL show arrays as literals."""
+    repl = REPL()
+    repl.run_program("print(@[1, 5 / 2]);")
+    assert capsys.readouterr().out == "@[1.0, 2.5]\n"
+    assert repr(repl.run_program("@[1, 2];")) == "@[1, 2]"
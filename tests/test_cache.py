@@ -0,0 +1,66 @@
+import os
+import pytest
+from Interpreter.cache import CACHE_DIRECTORY, HEADER_SIZE, ProgramCache
+from Interpreter.parser import parse
+from repl import REPL, main
+
+def test_memory_cache_hits():
+    """Tests that the same source is parsed once per optimisation level."""
+    cache = ProgramCache()
+    first = cache.program("sup x = 1 + 2; x;", 1)
+    assert cache.program("sup x = 1 + 2; x;", 1) is first
+    cache.program("sup x = 1 + 2; x;", 0)
+    assert (cache.stats.memory_hits, cache.stats.misses) == (1, 2)
+    assert cache.program("sup x = 1 + 2; x;", 0) == parse("sup x = 1 + 2; x;")
+
+@pytest.mark.parametrize("policy, survivor", [("lru", "a;"), ("fifo", "b;")])
+def test_eviction_policies(policy, survivor):
+    """Tests that a full cache evicts the least recently used or the oldest entry."""
+    cache = ProgramCache(maxsize=2, policy=policy)
+    cache.program("a;", 1)
+    cache.program("b;", 1)
+    cache.program("a;", 1)  # A hit: under LRU, "a;" becomes the most recent entry.
+    cache.program("c;", 1)
+    assert cache.stats.evictions == 1
+    hits = cache.stats.memory_hits
+    cache.program(survivor, 1)
+    assert cache.stats.memory_hits == hits + 1
+
+def test_invalid_configuration():
+    """Tests that bad cache settings are rejected."""
+    with pytest.raises(ValueError, match="Unknown eviction policy 'random'"):
+        ProgramCache(policy="random")
+
+def test_disk_cache(tmp_path):
+    """Tests that .gbc files are reused across caches and rejected when stale."""
+    directory = str(tmp_path / CACHE_DIRECTORY)
+    ProgramCache(directory=directory).program("sup x = 5; x;", 1, "script.gb")
+    path = os.path.join(directory, "script.O1.gbc")
+    assert os.path.exists(path)
+
+    cache = ProgramCache(directory=directory)
+    assert cache.program("sup x = 5; x;", 1, "script.gb") == parse("sup x = 5; x;")
+    assert cache.stats.disk_hits == 1
+
+    # A changed source, or a damaged file, is a miss and is rewritten.
+    cache = ProgramCache(directory=directory)
+    assert cache.program("sup x = 6; x;", 1, "script.gb") == parse("sup x = 6; x;")
+    with open(path, "r+b") as f:
+        f.seek(HEADER_SIZE)
+        f.write(b"garbage")
+    assert cache.program("sup x = 6; x;", 1, "other.gb") == parse("sup x = 6; x;")
+    cache = ProgramCache(directory=directory)
+    cache.program("sup x = 6; x;", 1, "script.gb")
+    assert (cache.stats.disk_hits, cache.stats.misses) == (0, 1)
+
+def test_repl_cache_flags(tmp_path, capsys):
+    """Tests that repl.py writes __gbcache__ unless --no-cache is given."""
+    script = tmp_path / "script.gb"
+    script.write_text("sup x = 2 * 21; x;")
+    main(["--no-cache", str(script)])
+    assert not (tmp_path / CACHE_DIRECTORY).exists()
+    main([str(script)])
+    main([str(script)])
+    assert capsys.readouterr().out == "42\n42\n42\n"
+    assert (tmp_path / CACHE_DIRECTORY / "script.O1.gbc").exists()
+    assert REPL(cache=False).cache is None
@@ -0,0 +1,65 @@
+import pytest
+from Interpreter.closure_compiler import ClosureCompiler
+from Interpreter.evaluator import Environment
+from Interpreter.parser import parse
+from repl import REPL
+
+# Helper function to compile and run programs for tests
+def compile_and_run(program_string, env=None):
+    """Parses, compiles and runs a full program string."""
+    program = ClosureCompiler().compile_program(parse(program_string))
+    return program(env if env is not None else Environment())
+
+@pytest.mark.parametrize("src, expected", [
+    ("sup x = (2 + 3) * 4; x;", 20),
+    ("10 - 4 / 2;", 8),
+    ("1 < 2;", True),
+    ("1 > 2;", False),
+    ("2 >= 2;", True),
+    ("3 <= 2;", False),
+    ("5 == 5;", True),
+    ('"a" != "b";', True),
+    ('"ab" + "cd";', "abcd"),
+])
+def test_expressions(src, expected):
+    """Tests that every operator closure matches the tree walker."""
+    assert compile_and_run(src) == expected
+
+def test_if_and_while():
+    """Tests control flow, including the value of the last statement."""
+    src = """
+    sup i = 0;
+    sup total = 0;
+    while (i < 5) {
+        if (i > 2) { total = total + i; } else { total = total + 1; }
+        i = i + 1;
+    }
+    total;
+    """
+    assert compile_and_run(src) == 10  # 1+1+1+3+4
+
+def test_recursive_function_and_scope():
+    """Tests recursion and that function locals do not leak."""
+    src = """
+    sup n = 100;
+    def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } }
+    fib(10) + n;
+    """
+    assert compile_and_run(src) == 155
+
+def test_errors_match_tree_walker():
+    """Tests that runtime errors keep their messages."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        compile_and_run("y + 1;")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        compile_and_run("1 / 0;")
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        compile_and_run("def add(a, b) { a + b; } add(1);")
+
+def test_repl_closure_backend():
+    """Tests that the closure backend is selectable from run_program and shares globals."""
+    repl = REPL()
+    repl.run_program("def double(n) { n * 2; } sup a = 21;")
+    assert repl.run_program("double(a);", backend="closure") == 42
+    with pytest.raises(ValueError, match="Unknown backend 'nope'"):
+        repl.run_program("1;", backend="nope")
@@ -0,0 +1,97 @@
+import pytest
+from Interpreter.ast_nodes import DictLiteral, Index, IndexAssign, ListLiteral, Number, String, Variable
+from Interpreter.parser import parse
+from repl import BACKENDS, REPL
+from tests.helpers import run_repl
+
+def test_parse_literals_and_index_assignment():
+    """Tests list and dictionary literals, and assignments to an element."""
+    assert parse("[1, x];") == [ListLiteral([Number(1), Variable("x")])]
+    assert parse('sup d = {"a": 1, k: 2};')[0].value == DictLiteral(
+        [String("a"), Variable("k")], [Number(1), Number(2)]
+    )
+    assert parse("sup d = {};")[0].value == DictLiteral([], [])
+    assert parse("m[0][1] = 5;") == [IndexAssign(Index(Variable("m"), Number(0)), Number(1), Number(5))]
+    # A `{` that starts a statement is still a block.
+    assert parse("{ 1; }") == [[Number(1)]]
+
+def test_lists():
+    """Tests indexing, element assignment and the list builtins."""
+    src = """
+    sup xs = [1, "two"];
+    push(xs, 3);
+    xs[0] = xs[0] + 10;
+    sup last = pop(xs);
+    [xs, last, len(xs), xs[0 - 1]];
+    """
+    assert run_repl(src) == [[11, "two"], 3, 2, "two"]
+
+def test_dicts():
+    """Tests key lookup, key assignment and the dictionary builtins."""
+    src = """
+    sup d = {"a": 1, 2: "b"};
+    d["c"] = 3;
+    set(d, "a", 10);
+    sup removed = pop(d, 2);
+    [keys(d), d["a"], get(d, "missing", 0), get(d, "c"), removed, len(d)];
+    """
+    assert run_repl(src) == [["a", "c"], 10, 0, 3, "b", 2]
+
+def test_containers_are_shared_with_functions():
+    """Tests that a function that modifies its argument modifies the caller's container."""
+    src = """
+    def fill(values, n) {
+        for (i in 0, n) { push(values, i * i); }
+    }
+    sup squares = [];
+    fill(squares, 4);
+    sup alias = squares;
+    alias[0] = 100;
+    squares;
+    """
+    assert run_repl(src) == [100, 1, 4, 9]
+
+@pytest.mark.parametrize("src, error, message", [
+    ("[1, 2][2];", IndexError, "List index out of range"),
+    ('[1, 2]["a"];', TypeError, "List indices must be integers"),
+    ('sup d = {"a": 1}; d["b"];', LookupError, "Key 'b' not found"),
+    ("sup d = {[1]: 1};", TypeError, "Dictionary keys must be numbers or strings"),
+    ('sup s = "abc"; s[0] = "x";', TypeError, "'str' value does not support item assignment"),
+    ("pop([]);", IndexError, r"pop\(\) from an empty list"),
+    ("push({}, 1);", TypeError, r"push\(\) expects a list"),
+    ("keys([1]);", TypeError, r"keys\(\) expects a dictionary"),
+    ("len(5);", TypeError, r"len\(\) expects"),
+])
+def test_container_errors(src, error, message):
+    """Tests the errors of invalid container operations."""
+    with pytest.raises(error, match=message):
+        run_repl(src)
+
+def test_array_element_assignment():
+    """Tests that assigning a float to an integer array makes it a float array."""
+    result = run_repl("sup a = @[1, 2]; a[0] = 3 / 2; a;")
+    assert result.data.typecode == "d" and result.tolist() == [1.5, 2.0]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_containers_on_every_backend(backend):
+    """Tests that every backend evaluates literals, indexes and element assignments."""
+    src = """
+    def count_words(words) {
+        sup counts = {};
+        for (i in 0, len(words)) {
+            sup word = words[i];
+            counts[word] = get(counts, word, 0) + 1;
+        }
+        counts;
+    }
+    sup grid = [[0, 0], [0, 0]];
+    grid[1][0] = 7;
+    sup counts = count_words(["a", "b", "a"]);
+    [counts["a"], counts["b"], grid[1][0], keys(counts)];
+    """
+    assert run_repl(src, backend) == [2, 1, 7, ["a", "b"]]
+
+def test_print_shows_containers(capsys):
+    """Tests that print shows lists and dictionaries."""
+    REPL().run_program('print([1, "a"], {"k": [2]});')
+    assert capsys.readouterr().out == "[1, 'a'] {'k': [2]}\n"
@@ -22,3 +22,9 @@ def test_missing_closing_brace():
     code = 'if (1) { print("hi"); '
     with pytest.raises(SyntaxError, match="Unexpected end of input, expected SYMBOL }"):
         parse(code)
+
+def test_for_loop_without_in():
+    """Test that a for loop must name its variable and then 'in'."""
+    code = 'for (i = 0, 10) { i; }'
+    with pytest.raises(SyntaxError, match="Expected 'in', got '='"):
+        parse(code)
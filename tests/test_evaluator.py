@@ -45,6 +45,26 @@ def test_while_loop_execution():
     """
     assert evaluate_program(src) == 10 # 0+1+2+3+4
 
+def test_for_loop_execution():
+    """Tests that a for loop counts from start up to, but not including, end."""
+    src = """
+    sup total = 0;
+    for (i in 0, 5) {
+        total = total + i;
+    }
+    total * 100 + i;
+    """
+    assert evaluate_program(src) == 1004 # 0+1+2+3+4, and i keeps its last value
+    assert evaluate_program("sup t = 0; for (i in 10, 0, 0 - 3) { t = t * 100 + i; } t;") == 10070401
+    assert evaluate_program("for (i in 3, 3) { 1; }") is None
+
+def test_for_loop_bound_errors():
+    """Tests that for loop bounds must be integers and the step non-zero."""
+    with pytest.raises(TypeError, match="For loop bounds must be integers"):
+        evaluate_program('for (i in 0, "3") { i; }')
+    with pytest.raises(ValueError, match="For loop step cannot be zero"):
+        evaluate_program("for (i in 0, 3, 0) { i; }")
+
 def test_function_definition_and_call():
     """Tests defining a function and then calling it."""
     src = """
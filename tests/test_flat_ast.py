@@ -0,0 +1,61 @@
+import pytest
+from Interpreter.ast_nodes import Number, BinOp, FunctionCall
+from Interpreter.evaluator import Environment
+from Interpreter.flat_ast import (
+    FlatEvaluator, FlatFunction, encode, decode, BINOP, BLOCK, NUMBER
+)
+from Interpreter.parser import parse
+from repl import REPL
+from tests.helpers import run_tree
+
+# Helper function to run programs from their flat encoding for tests
+def run_flat(program_string):
+    """Parses, encodes and evaluates a full program string with the FlatEvaluator."""
+    return FlatEvaluator(Environment()).run(encode(parse(program_string)))
+
+def test_nodes_have_no_dict():
+    """Tests that AST nodes are slot-based."""
+    for node in (Number(1), BinOp(Number(1), "+", Number(2)), FunctionCall("f", [])):
+        assert not hasattr(node, "__dict__")
+
+def test_encode_layout():
+    """Tests the columns produced for a small expression."""
+    flat = encode(parse("1 + 1;"))
+    assert list(flat.kinds) == [NUMBER, NUMBER, BINOP, BLOCK]
+    assert flat.constants == [1]  # Equal literals share one pool entry.
+    assert flat.root == 3
+
+@pytest.mark.parametrize("src", [
+    "sup x = (2 + 3) * 4; x;",
+    'sup s = "a" + "b"; s == "ab";',
+    "if (1 > 2) { 1; } else { 2; }",
+    "if (1 > 2) { 1; }",
+    "sup i = 0; while (i < 5) { i = i + 1; } i;",
+    "def add(a, b) { sup r = a + b; r; } add(7, 8);",
+    "sup x = 100; def f() { sup x = 5; } f(); x;",
+    "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);",
+    "def outer() { sup y = 3; inner(); } def inner() { y * 2; } outer();",
+])
+def test_flat_matches_tree_walker(src):
+    """Tests that decoding round-trips and that the flat walk gives the tree walker's value."""
+    assert decode(encode(parse(src))) == parse(src)
+    assert run_flat(src) == run_tree(src)
+
+def test_flat_errors():
+    """Tests that runtime errors keep the tree walker's messages."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        run_flat("y + 1;")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        run_flat("1 / 0;")
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        run_flat("def add(a, b) { a + b; } add(1);")
+    with pytest.raises(TypeError, match="'x' is not a function"):
+        run_flat("sup x = 1; x();")
+
+def test_flat_functions_work_in_other_backends():
+    """Tests that functions defined by flat code can be called from any backend."""
+    repl = REPL(backend="flat")
+    repl.run_program("def double(n) { n * 2; }")
+    assert isinstance(repl.evaluator.env["double"], FlatFunction)
+    for backend in ("tree", "closure", "vm", "python", "frames", "flat"):
+        assert repl.run_program("double(21);", backend) == 42
@@ -0,0 +1,57 @@
+import pytest
+from Interpreter.ast_nodes import ForStmt
+from Interpreter.flat_ast import decode, encode
+from Interpreter.memo import Memoizer, MemoEvaluator
+from Interpreter.evaluator import Environment
+from Interpreter.optimizer import optimize
+from Interpreter.parser import parse
+from repl import BACKENDS, REPL
+
+PROGRAMS = [
+    # Sum with the default step; the loop variable keeps its last value.
+    ("sup t = 0; for (i in 0, 100) { t = t + i; } t * 1000 + i;", 4950099),
+    # A negative step, and the value of the loop is the value of its last body.
+    ("sup t = 0; for (i in 10, 0, 0 - 2) { t = t + i; t; }", 30),
+    # An empty range: the body never runs and the variable is not bound.
+    ("sup n = 0; for (i in 5, n) { 1; }", None),
+    # Nested loops inside a function, with bounds read from parameters.
+    ("def grid(w, h) { sup c = 0; for (y in 0, h) { for (x in 0, w) { c = c + x * y; } } c; } grid(4, 3);", 18),
+    # Assigning the loop variable in the body does not change the iteration.
+    ("sup n = 0; for (i in 0, 3) { i = 100; n = n + 1; } n;", 3),
+]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("src, expected", PROGRAMS)
+def test_for_loop_on_every_backend(backend, src, expected):
+    """Tests that every backend runs for loops like the tree walker."""
+    assert REPL(backend=backend, opt_level=0).run_program(src) == expected
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_for_loop_errors_on_every_backend(backend):
+    """Tests that every backend reports bad bounds with the same messages."""
+    with pytest.raises(TypeError, match="For loop bounds must be integers"):
+        REPL(backend=backend).run_program("for (i in 0, 4 / 2) { i; }")
+    with pytest.raises(ValueError, match="For loop step cannot be zero"):
+        REPL(backend=backend).run_program("sup s = 0; for (i in 0, 3, s) { i; }")
+
+def test_flat_encoding_round_trip():
+    """Tests that a for loop survives encoding to arrays and back."""
+    program = parse("for (i in 0, 10, 2) { print(i); } for (j in 1, 2) { j; }")
+    assert decode(encode(program)) == program
+
+def test_optimizer_removes_empty_loop():
+    """Tests that a loop with constant bounds and no iterations is removed."""
+    assert optimize(parse("for (i in 3, 0) { print(i); } 1;")) == parse("1;")
+    kept = optimize(parse("for (i in 0, 3, 0) { i; }"))
+    assert isinstance(kept[0], ForStmt)
+
+def test_pure_function_with_for_loop_is_memoised():
+    """Tests that a loop over locals does not make a function impure."""
+    memoizer = Memoizer()
+    evaluator = MemoEvaluator(Environment(), memoizer)
+    src = "def tri(n) { sup t = 0; for (i in 0, n + 1) { t = t + i; } t; } tri(10) + tri(10);"
+    result = None
+    for statement in parse(src):
+        result = evaluator.eval(statement)
+    assert result == 110
+    assert memoizer.stats.hits == 1
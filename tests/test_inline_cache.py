@@ -0,0 +1,69 @@
+import pytest
+from Interpreter.evaluator import Environment, Evaluator
+from Interpreter.inline_cache import inline_cache_stats
+from Interpreter.parser import parse
+from repl import REPL
+
+# Helper function to run parsed statements with the tree walker for tests
+def run(statements, env=None):
+    """Evaluates parsed statements in `env` and returns the last result."""
+    evaluator = Evaluator(env if env is not None else Environment())
+    last_result = None
+    for statement in statements:
+        last_result = evaluator.eval(statement)
+    return last_result
+
+def test_call_sites_hit_after_first_call():
+    """Tests that a recursive call site resolves its callee once per version."""
+    program = parse("def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);")
+    assert run(program) == 610
+    stats = inline_cache_stats(program)
+    assert stats["hit_rate"] > 0.99
+    assert stats["sites"] == 3  # The three calls of fib; `n` is a local.
+
+def test_redefined_function_is_called():
+    """Tests that rebinding a function invalidates the cached callee."""
+    src = """
+    def f() { 1; }
+    sup t = 0; sup i = 0;
+    while (i < 4) {
+        t = t * 10 + f();
+        if (i == 1) { def f() { 2; } }
+        i = i + 1;
+    }
+    t;
+    """
+    assert run(parse(src)) == 1122
+
+def test_local_binding_shadows_cached_global():
+    """Tests that a caller's local hides a global a site has already cached."""
+    src = """
+    sup x = 1;
+    def g() { x; }
+    sup first = g(); sup second = g();
+    def h() { sup x = 5; g(); }
+    first + second + h();
+    """
+    assert run(parse(src)) == 7
+
+def test_rebinding_a_function_name_to_a_value():
+    """Tests that a cached callee is dropped when its name no longer holds a function."""
+    with pytest.raises(TypeError, match="'g' is not a function"):
+        run(parse("def f() { 1; } sup g = f; g(); g(); g = 5; g();"))
+
+def test_caches_are_per_global_environment():
+    """Tests that a site cached under one global scope is not reused under another."""
+    program = parse("answer();")
+    first, second = Environment(), Environment()
+    run(parse("def answer() { 1; }"), first)
+    run(parse("def answer() { 2; }"), second)
+    assert run(program, first) == 1
+    assert run(program, second) == 2
+
+def test_repl_stats():
+    """Tests the hit and miss counters exposed by the REPL."""
+    repl = REPL()
+    repl.run_program("sup i = 0; while (i < 10) { i = i + 1; } i;")
+    stats = repl.inline_cache_stats()
+    assert stats["sites"] == 3
+    assert stats["misses"] == 3 and stats["hits"] == 19
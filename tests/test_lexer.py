@@ -1,5 +1,7 @@
 import pytest
-from Interpreter.lexer import lex, Token, NUMBER, SYMBOL, IDENT, STRING
+from Interpreter.lexer import (
+    lex, iter_lex, Token, NUMBER, SYMBOL, IDENT, STRING, KW_IF, KW_ELSE, KW_WHILE, KW_DEF, KW_SUP
+)
 
 def test_simple_statement():
     """Tests a simple assignment statement."""
@@ -90,4 +92,39 @@ def test_full_function_definition():
         Token(IDENT, 'arg2'),
         Token(SYMBOL, ';'),
         Token(SYMBOL, '}'),
-    ]
\ No newline at end of file
+    ]
+
+@pytest.mark.parametrize("src, message", [
+    ('sup s = "never closed;', "Unterminated string literal"),
+    ("sup x = 5 & 2;", "Unknown character: &"),
+    ("x" + " " * 10000 + "$", r"Unknown character: \$"),
+])
+def test_lexer_errors(src, message):
+    """Tests that invalid input reports the offending text."""
+    with pytest.raises(ValueError, match=message):
+        lex(src)
+
+def test_comment_at_end_of_input():
+    """Tests that a trailing comment without a newline produces no tokens."""
+    assert lex("x; # done") == [Token(IDENT, 'x'), Token(SYMBOL, ';')]
+
+def test_keyword_kinds():
+    """Tests that keywords stay IDENT tokens but carry their own kind."""
+    toks = lex("if else while def sup iffy")
+    assert [t.type for t in toks] == [IDENT] * 6
+    assert [t.kind for t in toks] == [KW_IF, KW_ELSE, KW_WHILE, KW_DEF, KW_SUP, IDENT]
+    assert Token(IDENT, 'while').kind == KW_WHILE
+
+def test_compact_tokens():
+    """Tests that tokens have no per-instance dict and that names are interned."""
+    first, _, second = lex("counter_name + counter_name")
+    assert not hasattr(first, "__dict__")
+    assert first.value is second.value
+    assert repr(first) == "Token(IDENT, counter_name)"
+
+def test_token_lines():
+    """Tests that tokens record their source line, also across chunks and multi-line strings."""
+    src = 'sup a = 1;\n\n"two\nlines"; # note\nif (a) {\n  b; }'
+    expected = [1, 1, 1, 1, 1, 3, 4, 5, 5, 5, 5, 5, 6, 6, 6]
+    assert [t.line for t in lex(src)] == expected
+    assert [t.line for t in iter_lex(iter(src))] == expected
@@ -0,0 +1,146 @@
+import pytest
+from Interpreter.evaluator import Environment, Evaluator, NativeFunction
+from Interpreter.memo import Memoizer, MemoEvaluator, PurityAnalyzer
+from Interpreter.parser import parse
+from repl import REPL, main
+
+FIB = "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } }"
+
+# Helper function to run programs with memoisation for tests
+def run_memo(program_string, memoizer=None, env=None):
+    """Parses and evaluates a full program string with a MemoEvaluator."""
+    evaluator = MemoEvaluator(env if env is not None else Environment(), memoizer)
+    last_result = None
+    for statement in parse(program_string):
+        last_result = evaluator.eval(statement)
+    return last_result
+
+def is_pure(program_string, name):
+    """Defines the functions of a program and reports whether `name` is pure."""
+    env = Environment({"print": NativeFunction("print", print)})
+    run_memo(program_string, env=env)
+    return PurityAnalyzer(env).is_pure(env[name])
+
+@pytest.mark.parametrize("src", [
+    FIB,
+    "def f(a, b) { sup t = a * b; t + 1; }",
+    "def f(n) { if (n > 0) { sup x = 1; } else { sup x = 2; } x; }",
+    "def f(n) { sup i = 0; while (i < n) { i = i + 1; } i; }",
+    "def g(x) { x * 2; } def f(x) { g(x) + 1; }",
+    "def even(n) { if (n == 0) { 1; } else { odd(n - 1); } } def odd(n) { if (n == 0) { 0; } else { even(n - 1); } } def f(n) { even(n); }",
+])
+def test_pure_functions(src):
+    """Tests that functions depending only on their arguments are pure."""
+    assert is_pure(src, "f" if "def f(" in src else "fib")
+
+@pytest.mark.parametrize("src", [
+    "def f(x) { print(x); x; }",
+    "def f(x) { x + y; }",
+    "def f(x) { sup y = y + x; y; }",
+    "def f(n) { if (n > 0) { sup x = 1; } x; }",
+    "def f(n) { while (n > 0) { sup x = 1; n = n - 1; } x; }",
+    "def f(x) { def g() { 1; } g(); }",
+    "def f(g) { g(1); }",
+    "def g(x) { print(x); } def f(x) { g(x); }",
+    "def f(x) { missing(x); }",
+])
+def test_impure_functions(src):
+    """Tests that functions reading outside state or with effects are rejected."""
+    assert not is_pure(src, "f")
+
+def test_recursion_through_impure_function():
+    """Tests that a function is not left pure after assuming its impure caller was."""
+    env = Environment({"print": NativeFunction("print", print)})
+    run_memo("def f(x) { g(x); print(x); } def g(x) { f(x); }", env=env)
+    analyzer = PurityAnalyzer(env)
+    assert not analyzer.is_pure(env["f"])
+    assert not analyzer.is_pure(env["g"])
+
+def test_fib_takes_linear_time():
+    """Tests that each fib(n) is computed once: exponential recursion becomes linear."""
+    memoizer = Memoizer()
+    assert run_memo(FIB + " fib(40);", memoizer) == 102334155
+    assert memoizer.stats.misses == 41
+    assert memoizer.stats.hits == 38
+
+@pytest.mark.parametrize("src", [
+    FIB + " fib(15);",
+    "def f(x) { print(x); x + 1; } f(1) + f(1);",
+    "sup y = 1; def f(x) { x + y; } sup a = f(1); y = 5; a + f(1);",
+    'def f(s) { s + "!"; } f("a") + f("a");',
+    "def f(x) { x; } f(2 / 2) == f(1);",
+])
+def test_results_match_tree_walker(src, capsys):
+    """Tests that memoisation never changes a program's result."""
+    expected = Evaluator(Environment({"print": NativeFunction("print", print)}))
+    result = None
+    for statement in parse(src):
+        result = expected.eval(statement)
+    assert run_memo(src, env=Environment({"print": NativeFunction("print", print)})) == result
+
+def test_argument_types_are_part_of_the_key():
+    """Tests that 1 and 1.0 do not share an entry."""
+    assert type(run_memo("def f(x) { x; } f(1); f(2 / 2);")) is float
+
+def test_redefined_callee_invalidates_results():
+    """Tests that rebinding a function a pure function calls drops the old results."""
+    src = "def g(x) { x + 1; } def f(x) { g(x); } sup a = f(1); def g(x) { x + 2; } a * 10 + f(1);"
+    memoizer = Memoizer()
+    assert run_memo(src, memoizer) == 23
+    assert memoizer.stats.invalidations >= 1
+
+def test_per_function_bound_evicts_oldest():
+    """Tests that a table keeps at most `maxsize` results."""
+    memoizer = Memoizer(maxsize=2)
+    run_memo("def f(x) { x * x; } f(1); f(2); f(3); f(1);", memoizer)
+    assert len(memoizer) == 2
+    assert memoizer.stats.evictions == 2
+    assert memoizer.stats.hits == 0
+
+def test_global_byte_cap():
+    """Tests that all tables together stay under `max_bytes`."""
+    memoizer = Memoizer(max_bytes=2000)
+    run_memo("def f(x) { x * x; } sup i = 0; while (i < 100) { f(i); i = i + 1; }", memoizer)
+    assert 0 < memoizer.nbytes <= 2000
+    assert memoizer.stats.evictions > 0
+
+def test_function_arguments_are_not_memoised():
+    """Tests that calls with a non-scalar argument run normally."""
+    memoizer = Memoizer()
+    assert run_memo("def g() { 1; } def f(x) { 2; } f(g); f(g);", memoizer) == 2
+    assert memoizer.stats.skipped == 2 and len(memoizer) == 0
+
+def test_errors_are_not_memoised():
+    """Tests that a call that raises raises again."""
+    memoizer = Memoizer()
+    evaluator = MemoEvaluator(Environment(), memoizer)
+    evaluator.eval(parse("def f(x) { 1 / x; }")[0])
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError, match="Division by zero"):
+            evaluator.eval(parse("f(0);")[0])
+
+def test_repl_memoize_option():
+    """Tests the REPL option and its counters."""
+    repl = REPL(memoize=True)
+    assert repl.run_program(FIB + " fib(30);") == 832040
+    stats = repl.memo_stats()
+    assert stats["misses"] == 31 and stats["entries"] == 31
+    assert REPL().memo_stats()["hits"] == 0
+
+def test_memoize_flag(tmp_path, capsys):
+    """Tests that --memoize runs a script with memoisation."""
+    script = tmp_path / "fib.gb"
+    script.write_text(FIB + " fib(60);")
+    main([str(script), "--memoize", "--no-cache"])
+    assert capsys.readouterr().out.strip() == "1548008755920"
+
+@pytest.mark.parametrize("backend", ["vm", "closure", "adaptive"])
+def test_memoize_rejects_other_backends(tmp_path, capsys, backend):
+    """Tests that memoisation on a backend without a memoising evaluator is an error, not a silent no-op."""
+    with pytest.raises(ValueError, match="not supported"):
+        REPL(backend=backend, memoize=True)
+    script = tmp_path / "fib.gb"
+    script.write_text(FIB + " fib(10);")
+    with pytest.raises(SystemExit):
+        main([str(script), "--memoize", "--backend", backend, "--no-cache"])
+    assert "--memoize needs the tree backend" in capsys.readouterr().err
@@ -0,0 +1,60 @@
+import gc
+import pytest
+from Interpreter.ast_nodes import BinOp, FunctionDef, MethodNames, Number
+from Interpreter.memory import MemoryTracer
+from repl import REPL
+
+SOURCE = """
+def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } }
+sup x = 1 + 2;
+fib(8);
+"""
+
+@pytest.mark.parametrize("backend", ["tree", "vm", "closure"])
+def test_phases_and_result(backend):
+    """Tests that every phase is recorded and the program's result is kept."""
+    report = REPL.profile_memory(SOURCE, backend)
+    assert report.result == 21 and report.backend == backend
+    assert list(report.phases) == ["setup", "lex", "parse", "optimise", "eval"]
+    assert report.phases["lex"].allocated > 0 and report.phases["parse"].allocated > 0
+    assert report.peak >= max(phase.peak for phase in report.phases.values())
+    assert set(report.as_dict()) >= {"phases", "peak", "retained", "leaked"}
+
+def test_nothing_leaks_once_warm():
+    """Tests that a dropped REPL leaves no interpreter objects and almost no memory behind."""
+    REPL.profile_memory(SOURCE)
+    report = REPL.profile_memory(SOURCE)
+    assert not report.leaked_objects
+    assert report.leaked < 1024
+    # Only the global environment outlives the calls.
+    assert report.retained_objects["Environment"] == 1
+    assert "leaked after the REPL is dropped" in report.report()
+
+@pytest.mark.parametrize("backend", ["closure", "vm", "python", "frames"])
+def test_compiled_functions_do_not_pile_up(backend):
+    """Tests that a long-lived REPL keeps no compiled code for functions that were redefined."""
+    repl = REPL(backend=backend, cache=False)
+    for i in range(50):
+        repl.run_program(f"def f(n) {{ n + {i}; }} def g(n) {{ f(n) * 2; }} def h(n) {{ g(n) - 1; }} h({i});")
+    gc.collect()
+    # The three current definitions, plus at most the last program's copies.
+    assert sum(type(obj) is FunctionDef for obj in gc.get_objects()) <= 6
+
+def test_tracer_leaves_tracing_as_found():
+    """Tests that a tracer only stops tracemalloc if it started it."""
+    import tracemalloc
+    assert not tracemalloc.is_tracing()
+    with MemoryTracer("tree"):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+def test_method_names_are_interned_once():
+    """Tests that dispatch names are built once per node type and shared."""
+    names = MethodNames("eval_")
+    assert names[BinOp] == "eval_BinOp"
+    assert names[BinOp] is names[BinOp] and names[Number] == "eval_Number"
+
+def test_unknown_backend():
+    """Tests that an unknown backend is rejected."""
+    with pytest.raises(ValueError):
+        REPL.profile_memory(SOURCE, "nope")
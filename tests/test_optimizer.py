@@ -0,0 +1,112 @@
+import pytest
+from Interpreter.ast_nodes import Number, String, Variable, BinOp, Assign, FunctionCall
+from Interpreter.optimizer import (
+    ConstantFolding, DeadCodeElimination, NodeTransformer, PassManager, optimize
+)
+from Interpreter.parser import parse
+from Interpreter.ropes import MIN_ROPE_LENGTH
+from repl import REPL, main
+
+def test_constant_folding():
+    """Tests that nested operations on literals fold into one literal."""
+    assert optimize(parse("sup x = 60 * 60 * 24;")) == [Assign(Variable("x"), Number(86400))]
+    assert optimize(parse('"a" + "b";')) == [String("ab")]
+    assert optimize(parse("x * (2 + 3);")) == [BinOp(Variable("x"), "*", Number(5))]
+
+def test_folding_long_concatenation():
+    """Tests that a concatenation long enough to be a rope folds into a plain string literal."""
+    left, right = "a" * (MIN_ROPE_LENGTH - 100), "b" * 100
+    folded = optimize(parse(f'"{left}" + "{right}";'))
+    assert folded == [String(left + right)] and type(folded[0].value) is str
+    too_long = parse(f'"{left}" + "{right}c";')
+    assert optimize(too_long) == too_long
+
+def test_folding_keeps_runtime_errors():
+    """Tests that division by zero is left for the runtime to report."""
+    assert optimize(parse("1 / 0;")) == parse("1 / 0;")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        REPL(opt_level=2).run_program("if (1) { 1 / 0; }")
+
+def test_dead_code_elimination():
+    """Tests that unreachable branches and loops are removed."""
+    assert optimize(parse("if (0) { a(); } else { b(); } c();")) == [
+        FunctionCall("b", []), FunctionCall("c", [])
+    ]
+    assert optimize(parse("while (1 > 2) { a(); } 5;")) == [Number(5)]
+    assert optimize(parse("x; if (0) { a(); }")) == [Variable("x"), []]
+
+def test_arguments_are_not_treated_as_a_block():
+    """Tests that literal call arguments are never dropped as dead statements."""
+    assert optimize(parse('print("hi", 1);')) == parse('print("hi", 1);')
+
+def test_algebraic_identities_only_at_level_2():
+    """Tests x * 1 and x + 0, which are only applied at -O2 and only to operands known to be numbers."""
+    src = "(1 / 0) * 1 + 0;"  # Not folded, since it raises, but it can only be a number.
+    assert optimize(parse(src), 1) == parse(src)
+    assert optimize(parse(src), 2) == parse("1 / 0;")
+    # A variable may hold anything, and a comparison is a boolean that `* 1` turns into a number.
+    for src in ("x * 1 + 0;", "0 + f();", "(a < b) * 1;"):
+        assert optimize(parse(src), 2) == parse(src)
+
+@pytest.mark.parametrize("src", [
+    'sup s = "ab"; s + 0;',
+    'sup s = "ab"; s - 0;',
+    'sup s = "ab"; 1 * s;',
+    'sup d = {"a": 1}; d * 1;',
+    "sup a = [1, 2]; a + 0;",
+    "sup a = [1, 2]; sup b = a * 1; b[0] = 99; a[0];",
+    "sup a = @[1, 2]; sup b = a * 1; b[0] = 99; a[0];",
+    "sup a = @[1, 2]; sup b = 0 + a; b[0] = 99; a[0];",
+    "sup t = 1 < 2; t * 1;",
+])
+def test_level_2_keeps_behaviour_of_non_numbers(src):
+    """Tests that -O2 gives the result or the error of -O0 on strings, lists, dicts, arrays and booleans."""
+    def outcome(level):
+        try:
+            result = REPL(opt_level=level).run_program(src)
+            return type(result), result
+        except Exception as e:
+            return type(e), str(e)
+    assert outcome(2) == outcome(0)
+
+def test_input_tree_is_not_modified():
+    """Tests that passes copy the nodes they change."""
+    program = parse("def f() { sup x = 2 * 3; } while (0) { f(); }")
+    expected = parse("def f() { sup x = 2 * 3; } while (0) { f(); }")
+    optimize(program, 2)
+    assert program == expected
+
+def test_custom_pass():
+    """Tests that the pass manager runs user passes in order."""
+    class RenameVariables(NodeTransformer):
+        def visit_Variable(self, node):
+            return Variable(node.name.upper())
+
+    manager = PassManager([ConstantFolding()]).add(RenameVariables()).add(DeadCodeElimination())
+    assert manager.run(parse("1 + 2; y;")) == [Variable("Y")]
+    with pytest.raises(ValueError, match="Unknown optimisation level 3"):
+        PassManager.for_level(3)
+
+@pytest.mark.parametrize("src", [
+    "sup i = 0; sup t = 0; while (i < 10) { sup k = 2 * 3 + 0; t = t + k * 1; i = i + 1; } t;",
+    "def f(n) { if (1 == 1) { n * 2; } else { 0; } } f(21);",
+    "sup s = \"ab\" + \"cd\"; if (s == \"abcd\") { 1; } else { 2; }",
+    "if (0) { 1; }",
+    "5; 6; if (2 > 1) { 7; 8; }",
+])
+def test_levels_preserve_results(src):
+    """Tests that every level gives the same result on every backend."""
+    expected = REPL(opt_level=0).run_program(src)
+    for level in (1, 2):
+        for backend in ("tree", "closure", "vm", "python", "frames", "flat"):
+            assert REPL(backend=backend, opt_level=level).run_program(src) == expected
+
+def test_repl_opt_flag(tmp_path, capsys):
+    """Tests the -O option of repl.py."""
+    script = tmp_path / "script.gb"
+    script.write_text("sup x = 60 * 60 * 24; x;")
+    main(["-O2", "--backend", "vm", "--dis", str(script)])
+    out = capsys.readouterr().out
+    assert "(86400)" in out and "BINARY_MUL" not in out
+    main(["-O0", "--backend", "vm", "--dis", str(script)])
+    assert "BINARY_MUL" in capsys.readouterr().out
@@ -1,8 +1,9 @@
 import pytest
-from Interpreter.parser import parse
+from Interpreter.lexer import lex
+from Interpreter.parser import parse, iter_parse, Parser
 from Interpreter.ast_nodes import (
     Number, Variable, String, BinOp, Assign, IfStmt, WhileStmt,
-    FunctionDef, FunctionCall
+    ForStmt, FunctionDef, FunctionCall
 )
 
 def test_parse_single_assignment():
@@ -57,6 +58,16 @@ def test_parse_while_loop():
     ]
     assert ast == expected
 
+def test_parse_for_loop():
+    """Tests parsing of a for loop, with and without a step."""
+    body = [Assign(Variable('t'), BinOp(Variable('t'), '+', Variable('i')))]
+    assert parse("for (i in 0, n) { t = t + i; }") == [
+        ForStmt(Variable('i'), Number(0), Variable('n'), body)
+    ]
+    assert parse("for (i in 10, 0, 0 - 2) { t = t + i; }") == [
+        ForStmt(Variable('i'), Number(10), Number(0), body, BinOp(Number(0), '-', Number(2)))
+    ]
+
 def test_parse_function_definition():
     """Tests parsing a function definition with multiple parameters."""
     src = "def add(a, b) { a + b; }"
@@ -89,4 +100,41 @@ def test_parse_multiple_statements():
     assert len(ast) == 3
     assert isinstance(ast[0], Assign)
     assert isinstance(ast[1], Assign)
-    assert isinstance(ast[2], BinOp)
\ No newline at end of file
+    assert isinstance(ast[2], BinOp)
+
+def test_parse_from_token_stream():
+    """Tests that a lazily consumed token stream gives the same AST as a token list."""
+    src = "sup x = 1; if (x > 0) { print(x); } else { x = 2; } f(x, 3);"
+    assert list(iter_parse(src)) == parse(src)
+    chunks = [src[i:i + 4] for i in range(0, len(src), 4)]
+    assert list(iter_parse(chunks)) == parse(src)
+
+def test_streaming_parser_is_lazy():
+    """Tests that statements are yielded before the rest of the input is read."""
+    def tokens():
+        yield from lex("sup x = 1;")
+        raise AssertionError("read past the first statement")
+    statements = Parser(tokens()).iter_statements()
+    assert next(statements) == Assign(Variable("x"), Number(1))
+
+def test_parse_operator_precedence_and_associativity():
+    """Tests every precedence level and left associativity of the operator table."""
+    ast = parse("1 - 2 - 3 * 4 / 5 + 6 < 7 == 8 >= 9;")
+    n = Number
+    expected = BinOp(
+        BinOp(
+            BinOp(
+                BinOp(BinOp(n(1), '-', n(2)), '-', BinOp(BinOp(n(3), '*', n(4)), '/', n(5))),
+                '+', n(6),
+            ),
+            '<', n(7),
+        ),
+        '==',
+        BinOp(n(8), '>=', n(9)),
+    )
+    assert ast == [expected]
+
+def test_statements_carry_source_lines():
+    """Tests that function definitions and control flow statements record their line."""
+    func, loop = parse("def f(x) {\n  if (x) { x; }\n}\n\nwhile (0) {}")
+    assert (func.line, func.body[0].line, loop.line) == (1, 2, 5)
@@ -0,0 +1,129 @@
+import json
+import marshal
+import pstats
+import pytest
+from Interpreter.evaluator import Environment, NativeFunction
+from Interpreter.parser import parse
+from Interpreter.profiler import Profiler, ProfilingEvaluator
+import repl
+from repl import REPL
+
+SOURCE = """def fib(n) {
+    if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); }
+}
+def run(k) {
+    sup total = 0;
+    for (i in 0, k) { total = total + fib(5); }
+    while (total > 0) { total = total - 10; }
+    total + len("abc");
+}
+run(3);
+"""
+
+class FakeClock:
+    """A clock that advances by one second every time it is read."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time and advance the clock."""
+        self.now += 1.0
+        return self.now
+
+def profile(src, clock=None):
+    """Runs a program with a ProfilingEvaluator and returns its result and profiler."""
+    profiler = Profiler("prog.gb", clock) if clock else Profiler("prog.gb")
+    evaluator = ProfilingEvaluator(Environment({"len": NativeFunction("len", len)}), profiler)
+    result = None
+    for node in parse(src):
+        result = evaluator.eval(node)
+    return result, profiler
+
+def test_call_counts_and_lines():
+    """Tests that calls are counted per function, with the line of the definition."""
+    result, profiler = profile(SOURCE)
+    assert result == -2
+    rows = {stats.name: stats for stats in profiler.function_rows("name")}
+    assert (rows["fib"].calls, rows["fib"].line, rows["fib"].kind) == (45, 1, "gb")
+    assert (rows["run"].calls, rows["run"].line) == (1, 4)
+    assert (rows["len"].calls, rows["len"].kind) == (1, "native")
+
+def test_statement_counts():
+    """Tests that if, while and for statements count their runs and body runs."""
+    _, profiler = profile(SOURCE)
+    counts = [(s.line, s.kind, s.count, s.inner) for s in profiler.node_rows()]
+    assert counts == [(2, "if", 45, 24), (6, "for", 1, 3), (7, "while", 1, 2)]
+
+def test_inclusive_and_exclusive_times():
+    """Tests the times of nested and recursive calls with a clock that ticks once per read."""
+    _, profiler = profile("def leaf() { 1; }\ndef outer() { leaf() + leaf(); }\nouter();", FakeClock())
+    rows = {stats.name: stats for stats in profiler.function_rows("name")}
+    # Each leaf call lasts one tick; outer's clock reads surround both of them.
+    assert (rows["leaf"].inclusive, rows["leaf"].exclusive) == (2.0, 2.0)
+    assert (rows["outer"].inclusive, rows["outer"].exclusive) == (5.0, 3.0)
+    _, profiler = profile("def down(n) { if (n > 0) { down(n - 1); } }\ndown(2);", FakeClock())
+    (down,) = profiler.function_rows()
+    # The recursive calls are inside the outermost call, so they add no inclusive time.
+    assert (down.calls, down.inclusive, down.exclusive) == (3, 5.0, 5.0)
+
+def test_report_sorting():
+    """Tests that the text report lists functions in the order of the sort key."""
+    _, profiler = profile(SOURCE)
+    report = profiler.report("calls")
+    assert report.index("fib (prog.gb:1)") < report.index("run (prog.gb:4)")
+    assert "len (native)" in report and "while" in report
+    with pytest.raises(ValueError, match="Unknown sort key"):
+        profiler.report("size")
+
+def test_dumps(tmp_path):
+    """Tests the JSON dump and that pstats can load the pstats dump."""
+    _, profiler = profile(SOURCE)
+    profiler.dump(str(tmp_path / "out.json"))
+    data = json.loads((tmp_path / "out.json").read_text())
+    assert {row["name"] for row in data["functions"]} == {"fib", "run", "len"}
+    profiler.dump(str(tmp_path / "out.pstats"))
+    stats = pstats.Stats(str(tmp_path / "out.pstats"))
+    assert stats.total_calls == 47
+    assert ("prog.gb", 4, "run") in stats.stats[("prog.gb", 1, "fib")][4]
+
+def test_repl_profile_option(tmp_path, capsys):
+    """Tests --profile and --profile-output on a script."""
+    script = tmp_path / "prog.gb"
+    script.write_text(SOURCE)
+    out = tmp_path / "prof.pstats"
+    repl.main([str(script), "--no-cache", "--profile", "--profile-output", str(out)])
+    captured = capsys.readouterr()
+    assert captured.out == "-2\n"
+    assert f"fib ({script}:1)" in captured.err
+    assert (str(script), 1, "fib") in marshal.loads(out.read_bytes())
+    with pytest.raises(ValueError, match="cannot be combined"):
+        REPL(memoize=True, profile=True)
+    assert REPL().profiler is None
+
+@pytest.mark.parametrize("backend", ["vm", "closure", "frames"])
+def test_profile_rejects_uninstrumented_backends(tmp_path, capsys, backend):
+    """Tests that profiling a backend without a profiling evaluator is an error, not an empty report."""
+    with pytest.raises(ValueError, match="not supported"):
+        REPL(backend=backend, profile=True)
+    script = tmp_path / "prog.gb"
+    script.write_text(SOURCE)
+    with pytest.raises(SystemExit):
+        repl.main([str(script), "--no-cache", "--backend", backend, "--profile"])
+    assert "--profile needs the tree or adaptive backend" in capsys.readouterr().err
+
+def test_adaptive_profile_reports_specialisation(tmp_path, capsys):
+    """Tests that profiling the adaptive backend reports calls and the specialisation rate."""
+    script = tmp_path / "prog.gb"
+    script.write_text(SOURCE)
+    out = tmp_path / "prof.json"
+    repl.main([str(script), "--no-cache", "--backend", "adaptive", "--profile-output", str(out)])
+    captured = capsys.readouterr()
+    assert captured.out == "-2\n"
+    assert f"fib ({script}:1)" in captured.err
+    assert "specialisation rate" in captured.err
+    data = json.loads(out.read_text())
+    assert data["specialisation"]["sites"] > 0
+    assert 0 < data["specialisation"]["specialisation_rate"] <= 1
+    assert {row["name"] for row in data["functions"]} >= {"fib", "run"}
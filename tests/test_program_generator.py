@@ -0,0 +1,24 @@
+import math
+import pytest
+from benchmarks.program_generator import MAX_OPERAND, ProgramGenerator
+from repl import BACKENDS, REPL
+
+SHAPES = {
+    "flat": {"depth": 0},
+    "nested": {"depth": 4, "nesting": 0.6},
+    "long_expr": {"depth": 1, "expression_terms": 40},
+}
+
+def test_programs_are_reproducible():
+    """Tests that a seed always gives the same program, and another seed a different one."""
+    assert ProgramGenerator(seed=3).program(20) == ProgramGenerator(seed=3).program(20)
+    assert ProgramGenerator(seed=3).program(20) != ProgramGenerator(seed=4).program(20)
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_backends_agree_on_a_bounded_result(shape, seed):
+    """Tests that every backend runs a generated program to the same finite, bounded value."""
+    source = ProgramGenerator(seed=seed, **SHAPES[shape]).program(30)
+    results = [REPL(backend=backend, cache=False).run_program(source) for backend in BACKENDS]
+    assert all(math.isfinite(result) and abs(result) <= MAX_OPERAND for result in results)
+    assert all(math.isclose(result, results[0], rel_tol=1e-9, abs_tol=1e-12) for result in results)
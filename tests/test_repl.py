@@ -72,4 +72,21 @@ def test_file_execution_mode(tmp_path, repl_instance):
     result = repl_instance.run_program(script_content)
     
     # Assert that the final evaluated result is correct.
-    assert result == 42
\ No newline at end of file
+    assert result == 42
+
+def test_stream_execution(capsys, repl_instance):
+    """Tests that a chunked program runs statement by statement."""
+    source = 'print("first"); sup a = 21; def double(n) { n * 2; } double(a);'
+    chunks = (source[i:i + 5] for i in range(0, len(source), 5))
+    assert repl_instance.run_stream(chunks) == 42
+    assert capsys.readouterr().out == "'first'\n"
+
+def test_large_script_is_streamed(tmp_path, capsys, monkeypatch):
+    """Tests that scripts above the size threshold run through the streaming path."""
+    import repl
+    script = tmp_path / "big.gb"
+    script.write_text("sup x = 1;\n" * 100 + "x + 1;")
+    monkeypatch.setattr(repl, "STREAMING_THRESHOLD", 10)
+    monkeypatch.setattr(repl.REPL, "run_program", None)  # Must not be used.
+    repl.main([str(script)])
+    assert capsys.readouterr().out == "2\n"
@@ -0,0 +1,52 @@
+import pytest
+from Interpreter.evaluator import Environment
+from Interpreter.parser import parse
+from Interpreter.resolver import FrameEvaluator, Resolver
+from tests.helpers import run_tree
+
+# Helper function to run programs with array-backed frames for tests
+def run_frames(program_string):
+    """Parses and evaluates a full program string with the FrameEvaluator."""
+    evaluator = FrameEvaluator(Environment())
+    last_result = None
+    for statement in parse(program_string):
+        last_result = evaluator.eval(statement)
+    return last_result
+
+def test_resolve_function_addresses():
+    """Tests that params and assigned names get slots and free names do not."""
+    func = parse("def f(a, b) { sup c = a + g; c; }")[0]
+    layout = Resolver().resolve_function(func)
+    assert layout.names == ("a", "b", "c")
+    assign = func.body[0]
+    assert assign.address == (0, 2)
+    assert assign.value.left.address == (0, 0)
+    assert assign.value.right.address is None  # 'g' is free
+    assert func.body[1].address == (0, 2)
+
+@pytest.mark.parametrize("src", [
+    "def add(a, b) { sup result = a + b; result; } add(7, 8);",
+    "sup x = 100; def f() { sup x = 5; } f(); x;",
+    "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);",
+    # Callees see their caller's locals.
+    "def outer() { sup y = 3; inner(); } def inner() { y * 2; } outer();",
+    # A local read before its first assignment falls back to the caller's value.
+    "sup x = 1; def f() { sup y = x; sup x = 2; y + x; } f();",
+    # Nested function definitions are local to the call.
+    "def f() { def g(n) { n + 1; } g(41); } f();",
+    "def twice(a, a) { a; } twice(1, 2);",
+    "sup i = 0; def count(n) { sup k = 0; while (k < n) { k = k + 1; } k; } count(5);",
+])
+def test_frames_match_tree_walker(src):
+    """Tests that frame-based evaluation returns the tree walker's values."""
+    assert run_frames(src) == run_tree(src)
+
+def test_locals_do_not_leak():
+    """Tests that function locals are not visible after the call returns."""
+    with pytest.raises(NameError, match="Undefined variable 'c'"):
+        run_frames("def f() { sup c = 1; } f(); c;")
+
+def test_function_argument_mismatch_error():
+    """Tests that arity errors keep their message."""
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        run_frames("def add(a, b) { a + b; } add(1);")
@@ -0,0 +1,69 @@
+import pytest
+from Interpreter.ropes import MIN_ROPE_LENGTH, Rope, concat
+from repl import BACKENDS, REPL
+from tests.helpers import run_repl
+
+LONG = "x" * MIN_ROPE_LENGTH
+
+def test_short_concatenations_stay_strings():
+    """Tests that only long results become ropes."""
+    assert concat("ab", "cd") == "abcd" and type(concat("ab", "cd")) is str
+    rope = concat(LONG, "y")
+    assert type(rope) is Rope and len(rope) == MIN_ROPE_LENGTH + 1
+    assert rope == LONG + "y"
+
+def test_ropes_sharing_pieces_stay_independent():
+    """Tests that appending to an older rope does not change the ropes built from it."""
+    base = concat(LONG, "a")
+    first = base + "b"
+    second = base + "c"
+    assert base.parts is first.parts and second.parts is not first.parts
+    assert first == LONG + "ab" and second == LONG + "ac" and base == LONG + "a"
+    assert "<" + first + ">" == "<" + LONG + "ab>"
+
+def test_flattening_keeps_the_text():
+    """Tests that a flattened rope keeps a single piece and can still be extended."""
+    rope = concat(LONG, "a") + "b"
+    assert str(rope) == LONG + "ab"
+    assert rope.count == 1
+    assert rope + "c" == LONG + "abc"
+
+def test_rope_behaves_like_a_string():
+    """Tests comparisons, hashing, repetition and truth values of ropes."""
+    rope = concat(LONG, "a")
+    assert rope != LONG and rope > LONG and LONG < rope and rope <= rope
+    assert hash(rope) == hash(LONG + "a") and {LONG + "a": 1}[rope] == 1
+    assert rope * 2 == (LONG + "a") * 2 and bool(rope)
+    assert rope != 5
+    with pytest.raises(TypeError, match='can only concatenate str \\(not "int"\\) to str'):
+        rope + 5
+    with pytest.raises(TypeError, match="unsupported operand type"):
+        5 + rope
+
+def test_natives_and_results_receive_strings(capsys):
+    """Tests that ropes are flattened for native functions, dictionary keys and REPL results."""
+    repl = REPL()
+    result = repl.run_program(f"""
+    sup s = "{LONG}";
+    s = s + "!";
+    sup d = {{}};
+    d[s] = len(s);
+    print(s == "{LONG}!", d["{LONG}!"]);
+    s;
+    """)
+    assert type(result) is str and result == LONG + "!"
+    assert capsys.readouterr().out == f"True {MIN_ROPE_LENGTH + 1}\n"
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_string_building_on_every_backend(backend):
+    """Tests that every backend builds long strings with ropes and the same result."""
+    src = """
+    def wrap(s) { "<" + s + ">"; }
+    sup s = "";
+    for (i in 0, 300) { s = s + "abc" + "d"; }
+    sup t = wrap(s);
+    [len(t), t == "<" + s + ">", s + 1 == 0];
+    """
+    with pytest.raises(TypeError, match="can only concatenate str"):
+        run_repl(src, backend)
+    assert run_repl(src.replace(", s + 1 == 0", ""), backend) == [1202, True]
@@ -0,0 +1,85 @@
+import pytest
+from Interpreter.evaluator import NativeFunction
+from Interpreter.sampling import Sampler
+import repl
+from repl import REPL
+
+SOURCE = """
+def leaf(n) { probe(); n; }
+def middle(n) { leaf(n) + leaf(n); }
+def outer() { middle(1) + leaf(2); }
+outer();
+probe();
+"""
+
+def probing_repl(backend="tree", **kwargs):
+    """Returns a REPL whose `probe()` native takes a sample of the running program's stack."""
+    repl_ = REPL(backend=backend, cache=False, sample_interval=3600, **kwargs)
+    repl_.evaluator.env["probe"] = NativeFunction("probe", repl_.sampler.sample)
+    return repl_
+
+@pytest.mark.parametrize("backend", ["tree", "adaptive"])
+def test_samples_follow_the_gb_call_stack(backend):
+    """Tests that a sample holds the GB functions being called, outermost first."""
+    repl_ = probing_repl(backend)
+    repl_.run_program(SOURCE)
+    assert dict(repl_.sampler.counts) == {
+        ("outer", "middle", "leaf"): 2,
+        ("outer", "leaf"): 1,
+        (): 1,
+    }
+
+def test_memoised_calls_are_seen_once():
+    """Tests that the memoising evaluator's own call_function does not repeat a call in the stack."""
+    repl_ = probing_repl(memoize=True)
+    repl_.run_program(SOURCE)
+    assert repl_.sampler.counts[("outer", "middle", "leaf")] == 2
+
+def test_collapsed_stacks():
+    """Tests the flamegraph input format: most frequent stack first, rooted at the program."""
+    repl_ = probing_repl()
+    repl_.run_program(SOURCE)
+    assert repl_.sampler.collapsed() == (
+        "<program>;outer;middle;leaf 2\n"
+        "<program>;outer;leaf 1\n"
+        "<program> 1\n"
+    )
+    assert Sampler().collapsed() == ""
+
+def test_sampler_thread_runs_only_while_programs_run():
+    """Tests that the background thread samples during a run and stops afterwards."""
+    sampler = Sampler(0.001)
+    with sampler:
+        with sampler:
+            while sampler.total < 3:
+                pass
+        assert sampler._thread is not None
+    assert sampler._thread is None
+    with pytest.raises(ValueError, match="must be positive"):
+        Sampler(0)
+
+def test_sample_profile_flag_writes_collapsed_stacks(tmp_path):
+    """Tests that `repl.py --sample-profile FILE` writes one collapsed stack per line."""
+    script = tmp_path / "prog.gb"
+    script.write_text("""
+    def spin(n) { sup i = 0; while (i < n) { i = i + 1; } i; }
+    def main() { spin(200000); }
+    main();
+    """)
+    out = tmp_path / "stacks.txt"
+    repl.main([str(script), "--no-cache", "--sample-profile", str(out), "--sample-interval", "1"])
+    lines = out.read_text().splitlines()
+    assert lines and all(line.startswith("<program>") for line in lines)
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    assert max(stacks, key=stacks.get) == "<program>;main;spin"
+
+@pytest.mark.parametrize("backend", ["vm", "closure", "stack"])
+def test_sampling_rejects_other_backends(tmp_path, capsys, backend):
+    """Tests that sampling a backend whose calls the sampler cannot see is an error, not an empty flame graph."""
+    with pytest.raises(ValueError, match="not supported"):
+        REPL(backend=backend, sample_interval=0.005)
+    script = tmp_path / "prog.gb"
+    script.write_text("1 + 1;")
+    with pytest.raises(SystemExit):
+        repl.main([str(script), "--no-cache", "--backend", backend, "--sample-profile", str(tmp_path / "out.txt")])
+    assert "--sample-profile needs the tree or adaptive backend" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+import sys
+import pytest
+from Interpreter.evaluator import Environment
+from Interpreter.parser import parse
+from Interpreter.stack_evaluator import StackEvaluator
+import repl
+from repl import REPL
+from tests.helpers import run_tree
+
+# Helper function to run programs on the explicit-stack evaluator for tests
+def run_stack(program_string, evaluator=None):
+    """Parses and evaluates a full program string with a StackEvaluator."""
+    evaluator = evaluator or StackEvaluator(Environment())
+    last_result = None
+    for statement in parse(program_string):
+        last_result = evaluator.eval(statement)
+    return last_result
+
+@pytest.mark.parametrize("src", [
+    "sup x = (2 + 3) * 4; x;",
+    '"a" + "b" == "ab";',
+    "if (1 > 2) { 1; } else { 2; }",
+    "if (0) { 1; }",
+    "sup i = 0; sup t = 0; while (i < 5) { t = t + i; i = i + 1; } t;",
+    "def add(a, b) { sup r = a + b; r; } add(7, 8);",
+    "sup x = 100; def f() { sup x = 5; } f(); x;",
+    "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);",
+    "def outer() { sup y = 3; inner(); } def inner() { y * 2; } outer();",
+])
+def test_stack_matches_tree_walker(src):
+    """Tests that the explicit-stack evaluator returns the tree walker's value."""
+    assert run_stack(src) == run_tree(src)
+
+def test_stack_errors():
+    """Tests that runtime errors keep the tree walker's messages."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        run_stack("def f() { y; } f();")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        run_stack("1 / 0;")
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        run_stack("def add(a, b) { a + b; } add(1);")
+    with pytest.raises(TypeError, match="'x' is not a function"):
+        run_stack("sup x = 1; x();")
+
+def test_recursion_deeper_than_python():
+    """Tests non-tail recursion far beyond the Python recursion limit."""
+    depth = sys.getrecursionlimit() * 10
+    src = f"def sum(n) {{ if (n == 0) {{ 0; }} else {{ n + sum(n - 1); }} }} sum({depth});"
+    assert run_stack(src) == depth * (depth + 1) // 2
+
+def test_tail_calls_do_not_grow_the_stack():
+    """Tests that a call in tail position replaces the caller's pending work."""
+    evaluator = StackEvaluator(Environment())
+    src = "def count(n) { if (n == 0) { 42; } else { count(n - 1); } } count(20000);"
+    assert run_stack(src, evaluator) == 42
+    assert evaluator.max_depth < 5
+
+def test_memory_limit():
+    """Tests that recursion stops with a RecursionError at the memory budget."""
+    evaluator = StackEvaluator(Environment(), memory_limit=1024 * 1024)
+    with pytest.raises(RecursionError, match="memory limit of 1 MiB"):
+        run_stack("def down(n) { 1 + down(n + 1); } down(0);", evaluator)
+
+def test_memory_limit_can_change():
+    """Tests that the step budget follows memory_limit when it is changed after construction."""
+    evaluator = StackEvaluator(Environment(), memory_limit=1024 * 1024)
+    src = "def sum(n) { if (n == 0) { 0; } else { n + sum(n - 1); } } sum(3000);"
+    with pytest.raises(RecursionError, match="memory limit of 1 MiB"):
+        run_stack(src, evaluator)
+    evaluator.memory_limit = 64 * 1024 * 1024
+    assert evaluator.max_steps == 64 * 1024
+    assert run_stack(src, evaluator) == 3000 * 3001 // 2
+    evaluator.memory_limit = 1024 * 1024
+    with pytest.raises(RecursionError, match="memory limit of 1 MiB"):
+        run_stack(src, evaluator)
+
+def test_repl_stack_memory_limit(tmp_path, capsys):
+    """Tests that the REPL and --stack-memory-limit pass the budget to the stack backend."""
+    assert REPL(stack_memory_limit=2 * 1024 * 1024).stack_evaluator.memory_limit == 2 * 1024 * 1024
+    script = tmp_path / "deep.gb"
+    script.write_text("def down(n) { 1 + down(n + 1); } down(0);")
+    repl.main([str(script), "--no-cache", "--backend", "stack", "--stack-memory-limit", "1"])
+    assert "memory limit of 1 MiB" in capsys.readouterr().out
+
+def test_environment_lookup_is_iterative():
+    """Tests that a long chain of scopes can be searched without recursion."""
+    env = Environment({"x": 1})
+    for _ in range(sys.getrecursionlimit() * 2):
+        env = Environment(outer=env)
+    assert env["x"] == 1
+
+def test_repl_stack_backend():
+    """Tests that the REPL can run programs on the stack backend."""
+    assert REPL(backend="stack").run_program("def f(n) { n * 2; } f(21);") == 42
@@ -0,0 +1,70 @@
+import json
+import pytest
+from Interpreter.stats import PHASES, RunStats
+import repl
+from repl import BACKENDS, REPL
+
+SOURCE = """
+def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } }
+sup x = 1 + 2;
+fib(5);
+"""
+
+class FakeClock:
+    """A clock that advances by one second every time it is read."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time and advance the clock."""
+        self.now += 1.0
+        return self.now
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_counts_on_every_backend(backend):
+    """Tests the result and the token, node and call counts of a run."""
+    stats = REPL(backend=backend).run_with_stats(SOURCE)
+    assert stats.result == 5 and stats.backend == backend
+    assert stats.tokens == 46
+    assert stats.nodes == 22 and stats.optimised_nodes == 20  # 1 + 2 is folded.
+    assert stats.calls == 15
+    assert stats.environments == (0 if backend == "frames" else 15)
+    assert stats.peak_memory is None
+
+def test_counters_cover_one_run_only():
+    """Tests that a second run on the same REPL reports only its own calls."""
+    repl_ = REPL()
+    repl_.run_with_stats(SOURCE)
+    assert repl_.run_with_stats("fib(3);").calls == 5
+    assert repl_.evaluator.env.scopes == 20
+
+def test_phase_times_and_report():
+    """Tests that every phase is timed and appears in the report."""
+    stats = RunStats("tree", 1, FakeClock())
+    for name in PHASES:
+        with stats.phase(name):
+            pass
+    assert stats.times == dict.fromkeys(PHASES, 1.0) and stats.total == 4.0
+    report = stats.report()
+    assert all(name in report for name in PHASES) and "25.0%" in report
+    assert "peak traced memory" not in report
+
+def test_traced_memory():
+    """Tests that a run can trace its peak memory."""
+    stats = REPL().run_with_stats('sup s = [1, 2, 3]; len(s);', trace_memory=True)
+    assert stats.result == 3 and stats.peak_memory > 0
+    assert "peak traced memory" in stats.report()
+
+def test_stats_flag(tmp_path, capsys):
+    """Tests that `repl.py --stats` prints a summary to stderr and can save it as JSON."""
+    script = tmp_path / "prog.gb"
+    script.write_text(SOURCE)
+    out = tmp_path / "stats.json"
+    repl.main([str(script), "--no-cache", "--stats", "--stats-output", str(out)])
+    captured = capsys.readouterr()
+    assert captured.out == "5\n"
+    assert "eval" in captured.err and "15 function calls" in captured.err
+    data = json.loads(out.read_text())
+    assert set(data["times"]) == set(PHASES) and data["calls"] == 15 and data["peak_memory"] is None
@@ -0,0 +1,64 @@
+import pytest
+from Interpreter.ast_nodes import BinOp, Number
+from Interpreter.evaluator import Environment, Evaluator
+from Interpreter.parser import parse
+from Interpreter.transpiler import Transpiler
+from repl import REPL
+
+# Helper function to transpile and run programs for tests
+def transpile_and_run(program_string, env=None):
+    """Parses, transpiles and runs a full program string."""
+    program = Transpiler().compile_program(parse(program_string))
+    return program(env if env is not None else Environment())
+
+def test_translate_while_loop():
+    """Tests that a GB while loop becomes a native Python while loop."""
+    source, _ = Transpiler().translate("f", parse("while (i < 3) { i = i + 1; }"))
+    assert "while (env['i'] < 3):" in source
+    assert "env['i'] = (env['i'] + 1)" in source
+
+@pytest.mark.parametrize("src, expected", [
+    ("sup x = (2 + 3) * 4; x;", 20),
+    ("7 / 2;", 3.5),
+    ('"a" + "b" == "ab";', True),
+    ("sup x = 0; if (10 < 5) { x = 1; } else { x = 2; } x;", 2),
+    ("if (0) { 1; }", None),
+    ("sup i = 0; sup t = 0; while (i < 5) { t = t + i; i = i + 1; } t;", 10),
+    ("sup i = 0; while (i < 3) { i = i + 1; i * 10; }", 30),
+    ("sup x = 100; def f() { sup x = 5; } f(); x;", 100),
+])
+def test_transpiled_values(src, expected):
+    """Tests that transpiled programs return the tree walker's values."""
+    assert transpile_and_run(src) == expected
+
+def test_implicit_return_of_last_statement():
+    """Tests that function bodies return the value of their last statement."""
+    src = """
+    def classify(n) { if (n > 0) { "positive"; } else { "other"; } }
+    def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } }
+    classify(fib(10));
+    """
+    assert transpile_and_run(src) == "positive"
+
+def test_errors_match_tree_walker():
+    """Tests that runtime errors keep their messages."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        transpile_and_run("y + 1;")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        transpile_and_run("1 / 0;")
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        transpile_and_run("def add(a, b) { a + b; } add(1);")
+
+def test_native_functions(capsys):
+    """Tests that NativeFunctions are called with the usual convention."""
+    assert REPL().run_program('print("hi", 1); 5;', backend="python") == 5
+    assert capsys.readouterr().out == "'hi' 1\n"
+
+def test_fallback_to_tree_walker():
+    """Tests that untranslatable programs still run through the tree walker."""
+    # CPython refuses expressions nested this deeply; the tree walker does not.
+    expr = Number(1)
+    for _ in range(300):
+        expr = BinOp(expr, "+", Number(1))
+    program = Transpiler().compile_program([expr])
+    assert program(Environment()) == Evaluator(Environment()).eval(expr) == 301
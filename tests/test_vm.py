@@ -0,0 +1,72 @@
+import pytest
+from Interpreter.bytecode import (
+    Compiler, disassemble, LOAD_CONST, STORE_NAME, BINARY_ADD, RETURN_VALUE
+)
+from Interpreter.evaluator import Environment
+from Interpreter.parser import parse
+from Interpreter.vm import VM
+from repl import REPL, main
+from tests.helpers import run_tree
+
+# Helper function to compile and run programs on the VM for tests
+def run_vm(program_string, env=None):
+    """Parses, compiles and runs a full program string on the VM."""
+    code = Compiler().compile_program(parse(program_string))
+    return VM().run(code, env if env is not None else Environment())
+
+def test_compile_assignment():
+    """Tests the bytecode of a simple assignment, including the constants pool."""
+    code = Compiler().compile_program(parse("sup x = 1 + 1;"))
+    assert code.instructions == [
+        (LOAD_CONST, 0),
+        (LOAD_CONST, 0),
+        (BINARY_ADD, 0),
+        (STORE_NAME, 0),
+        (LOAD_CONST, 1),
+        (RETURN_VALUE, 0),
+    ]
+    assert code.consts == [1, None]
+    assert code.names == ["x"]
+
+@pytest.mark.parametrize("src", [
+    "sup x = (2 + 3) * 4; x;",
+    "7 / 2;",
+    '"a" + "b" == "ab";',
+    "sup x = 0; if (10 < 5) { x = 1; } else { x = 2; } x;",
+    "if (0) { 1; }",
+    "sup i = 0; while (i < 5) { i = i + 1; }",
+    "sup i = 0; sup t = 0; while (i < 5) { t = t + i; i = i + 1; } t;",
+    "def add(a, b) { sup r = a + b; r; } add(7, 8);",
+    "sup x = 100; def f() { sup x = 5; } f(); x;",
+    "def fib(n) { if (n < 2) { n; } else { fib(n - 1) + fib(n - 2); } } fib(15);",
+    "def outer() { sup y = 3; inner(); } def inner() { y * 2; } outer();",
+])
+def test_vm_matches_tree_walker(src):
+    """Tests that the VM returns the same value as the tree walker."""
+    assert run_vm(src) == run_tree(src)
+
+def test_vm_errors():
+    """Tests that runtime errors keep the tree walker's messages."""
+    with pytest.raises(NameError, match="Undefined variable 'y'"):
+        run_vm("y + 1;")
+    with pytest.raises(ZeroDivisionError, match="Division by zero"):
+        run_vm("1 / 0;")
+    with pytest.raises(TypeError, match="Function 'add' expects 2 arguments, but got 1"):
+        run_vm("def add(a, b) { a + b; } add(1);")
+    with pytest.raises(TypeError, match="'x' is not a function"):
+        run_vm("sup x = 1; x();")
+
+def test_disassemble():
+    """Tests that the disassembler lists instructions and function bodies."""
+    listing = disassemble(Compiler().compile_program(parse("def f(a) { a; } f(1);")))
+    assert "DEFINE_FUNCTION" in listing
+    assert "Disassembly of f:" in listing
+    assert f"{0:5d} {'LOAD_NAME':<16}{0:4d} (a)" in listing
+
+def test_repl_vm_backend(tmp_path, capsys):
+    """Tests that repl.py can run a script through the VM."""
+    script = tmp_path / "script.gb"
+    script.write_text("def double(n) { n * 2; } double(21);")
+    main(["--backend", "vm", str(script)])
+    assert "42" in capsys.readouterr().out
+    assert REPL(backend="vm").run_program("print(1); 2;") == 2